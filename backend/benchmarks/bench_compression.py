@@ -0,0 +1,77 @@
+"""
+Bytes on the wire for a synthetic workloads snapshot: raw JSON, GZip (REST responses)
+and permessage-deflate (WebSocket frames), plus the delta-mode patch for a tick where 1% of
+the workloads changed.
+
+Usage, from the backend directory:
+    python -m benchmarks.bench_compression [--workloads 10000]
+"""
+import argparse
+import copy
+import gzip
+import time
+import zlib
+
+from json_patch import make_patch
+from serialization import dumps
+from benchmarks.synthetic import make_workloads_snapshot
+
+
+def deflate_stream():
+    # permessage-deflate with context takeover keeps one raw deflate stream for the whole connection
+    return zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -zlib.MAX_WBITS)
+
+
+def deflate_frame(compressor, payload: bytes) -> int:
+    """
+    Returns the size of a message compressed like a permessage-deflate frame (RFC 7692):
+    flushed with Z_SYNC_FLUSH, without the trailing empty block.
+    """
+    data = compressor.compress(payload) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    return len(data) - 4
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workloads", type=int, default=10000)
+    parser.add_argument("--gzip-level", type=int, default=6, help="GZipMiddleware compression level")
+    args = parser.parse_args()
+
+    snapshot = make_workloads_snapshot(args.workloads)
+    next_snapshot = copy.deepcopy(snapshot)
+    for workload in next_snapshot["items"][::100]:
+        workload["status"]["conditions"][1]["status"] = "True"
+        workload["metadata"]["resourceVersion"] = str(int(workload["metadata"]["resourceVersion"]) + 1)
+
+    payload, serialize_ms = timed(lambda: dumps(snapshot))
+    next_payload = dumps(next_snapshot)
+    gzipped, gzip_ms = timed(lambda: gzip.compress(payload, compresslevel=args.gzip_level))
+    compressor = deflate_stream()
+    first_frame, deflate_ms = timed(lambda: deflate_frame(compressor, payload))
+    second_frame, next_deflate_ms = timed(lambda: deflate_frame(compressor, next_payload))
+    patch, patch_ms = timed(lambda: dumps(make_patch(snapshot, next_snapshot)))
+    patch_frame = deflate_frame(deflate_stream(), patch)
+
+    rows = [
+        ("raw JSON snapshot", len(payload), serialize_ms),
+        (f"gzip level {args.gzip_level} (REST)", len(gzipped), gzip_ms),
+        ("permessage-deflate, first tick", first_frame, deflate_ms),
+        ("permessage-deflate, next tick", second_frame, next_deflate_ms),
+        ("delta mode patch, 1% changed", len(patch), patch_ms),
+        ("delta mode patch + deflate", patch_frame, None),
+    ]
+    print(f"Synthetic snapshot: {args.workloads} workloads")
+    print(f"{'encoding':36} {'bytes':>12} {'ratio':>8} {'ms':>9}")
+    for name, size, elapsed in rows:
+        elapsed_text = f"{elapsed:9.1f}" if elapsed is not None else f"{'':>9}"
+        print(f"{name:36} {size:12,d} {size / len(payload):8.3f} {elapsed_text}")
+
+
+if __name__ == "__main__":
+    main()
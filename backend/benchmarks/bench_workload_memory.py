@@ -0,0 +1,71 @@
+"""
+Memory held by the workloads store, comparing the raw Workload objects (managedFields dropped, as
+stored before) with the compact WorkloadRecord the workloads informer now stores, and the time to
+build each and to turn the records back into the dicts the list views serve.
+
+The objects are parsed from JSON bytes as the informers do, so strings are not shared between
+objects unless the records intern them.
+
+Usage, from the backend directory:
+    python -m benchmarks.bench_workload_memory [--workloads 40000]
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+import orjson
+
+from benchmarks.synthetic import make_workload
+from transforms import slim_metadata
+from workload_record import compact_workload
+
+
+def measure(transform, body: bytes):
+    """
+    Returns (milliseconds, retained bytes) of parsing `body` and transforming every object, where retained
+    is the memory still held once the parsed objects are released, i.e. the size of what the store holds.
+    """
+    objs = orjson.loads(body)
+    start = time.perf_counter()
+    results = [transform(obj) for obj in objs]
+    elapsed = (time.perf_counter() - start) * 1000
+    del objs, results
+
+    tracemalloc.start()
+    objs = orjson.loads(body)
+    results = [transform(obj) for obj in objs]
+    del objs
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return elapsed, retained, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workloads", type=int, default=40000)
+    parser.add_argument("--namespaces", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    workloads = [
+        make_workload(index, f"team-{index % args.namespaces}", f"user-queue-{index % 3}", rng)
+        for index in range(args.workloads)
+    ]
+    body = orjson.dumps(workloads)
+    del workloads
+
+    print(f"{args.workloads} workloads, {len(body) / 1024:,.0f} KiB of JSON")
+    print(f"{'stored as':28} {'build ms':>9} {'retained KiB':>13} {'bytes/workload':>15}")
+    for name, transform in (("raw objects (slim_metadata)", slim_metadata), ("WorkloadRecord", compact_workload)):
+        elapsed, retained, results = measure(transform, body)
+        print(f"{name:28} {elapsed:9.1f} {retained / 1024:13,.0f} {retained / args.workloads:15,.0f}")
+
+    start = time.perf_counter()
+    for record in results:
+        record.to_dict()
+    print(f"WorkloadRecord.to_dict of every record: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
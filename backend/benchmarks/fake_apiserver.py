@@ -0,0 +1,209 @@
+"""
+A local stand-in for the Kubernetes API server serving a synthetic cluster, for offline load tests.
+
+It answers the LIST (with limit/continue pagination) and WATCH requests the informers send for
+the Kueue CRDs, pods, nodes and events, and the GET of a single object. WATCH streams stay open until their timeoutSeconds and
+carry MODIFIED events for workloads changed by an optional churn thread.
+"""
+import itertools
+import queue
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import orjson
+
+__all__ = ["FakeApiServer"]
+
+KUEUE_PREFIX = "/apis/kueue.x-k8s.io/v1beta1/"
+CORE_PREFIX = "/api/v1/"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_Server"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path.startswith(KUEUE_PREFIX):
+            resource = url.path[len(KUEUE_PREFIX):]
+        elif url.path.startswith(CORE_PREFIX):
+            resource = url.path[len(CORE_PREFIX):]
+        else:
+            resource = None
+        parts = resource.split("/") if resource else []
+        if len(parts) == 4 and parts[0] == "namespaces":
+            # namespaces/<namespace>/<resource>/<name>
+            self._get(parts[2], f"{parts[1]}/{parts[3]}")
+            return
+        if len(parts) == 2:
+            # <resource>/<name> of a cluster-scoped object
+            self._get(parts[0], f"/{parts[1]}")
+            return
+        if resource not in self.server.api.objects:
+            self._send_json(404, {"kind": "Status", "status": "Failure", "reason": "NotFound", "code": 404})
+            return
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if query.get("watch") in ("true", "1"):
+            self._watch(resource, float(query.get("timeoutSeconds", 300)))
+        else:
+            self._list(resource, int(query.get("limit", 0)), int(query.get("continue") or 0))
+
+    def _send_json(self, status: int, body: dict):
+        data = orjson.dumps(body)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _get(self, resource: str, key: str):
+        api = self.server.api
+        with api.lock:
+            obj = api.objects.get(resource, {}).get(key)
+        if obj is None:
+            self._send_json(404, {"kind": "Status", "status": "Failure", "reason": "NotFound", "code": 404})
+            return
+        self._send_json(200, obj)
+
+    def _list(self, resource: str, limit: int, offset: int):
+        api = self.server.api
+        with api.lock:
+            items = list(api.objects[resource].values())
+            resource_version = str(api.resource_version)
+        page = items[offset:offset + limit] if limit else items[offset:]
+        metadata = {"resourceVersion": resource_version}
+        if limit and offset + limit < len(items):
+            # Continue tokens are plain offsets: the synthetic cluster only changes in place
+            metadata["continue"] = str(offset + limit)
+        self._send_json(200, {"kind": "List", "apiVersion": "v1", "metadata": metadata, "items": page})
+
+    def _watch(self, resource: str, timeout: float):
+        api = self.server.api
+        events = api.subscribe(resource)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        deadline = time.monotonic() + timeout
+        try:
+            while not api.stopped.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    event = events.get(timeout=min(remaining, 0.5))
+                except queue.Empty:
+                    continue
+                line = orjson.dumps(event) + b"\n"
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            api.unsubscribe(resource, events)
+            self.close_connection = True
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    api: "FakeApiServer"
+
+
+class FakeApiServer:
+    """
+    Serves `cluster`, a `{resource: [objects]}` dict such as `synthetic.make_cluster()` returns.
+    With `churn_per_second`, that many workloads per second get a status change pushed to the watchers.
+    """
+
+    def __init__(self, cluster: dict, churn_per_second: float = 0.0, host: str = "127.0.0.1", port: int = 0,
+                 seed: int = 0):
+        self.objects = {
+            resource: {_key(obj): obj for obj in objs} for resource, objs in cluster.items()
+        }
+        self.resource_version = 1000000
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.churn_per_second = churn_per_second
+        self._watchers = {resource: [] for resource in self.objects}
+        self._rng = random.Random(seed)
+        self._server = _Server((host, port), _Handler)
+        self._server.api = self
+        self._threads = []
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._threads.append(threading.Thread(target=self._server.serve_forever, name="fake-apiserver", daemon=True))
+        if self.churn_per_second > 0:
+            self._threads.append(threading.Thread(target=self._churn, name="fake-apiserver-churn", daemon=True))
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def write_kubeconfig(self, path: str):
+        """
+        Writes a kubeconfig pointing at this server, for the backend's out-of-cluster configuration.
+        """
+        with open(path, "w") as f:
+            f.write(
+                "apiVersion: v1\n"
+                "kind: Config\n"
+                f"clusters:\n- name: fake\n  cluster:\n    server: {self.url}\n"
+                "users:\n- name: fake\n  user:\n    token: fake\n"
+                "contexts:\n- name: fake\n  context:\n    cluster: fake\n    user: fake\n"
+                "current-context: fake\n"
+            )
+
+    def subscribe(self, resource: str) -> queue.Queue:
+        events = queue.Queue()
+        with self.lock:
+            self._watchers[resource].append(events)
+        return events
+
+    def unsubscribe(self, resource: str, events: queue.Queue):
+        with self.lock:
+            self._watchers[resource].remove(events)
+
+    def modify(self, resource: str, obj: dict):
+        """
+        Stores a changed object with a new resourceVersion and sends a MODIFIED event to the watchers.
+        """
+        with self.lock:
+            self.resource_version += 1
+            obj["metadata"]["resourceVersion"] = str(self.resource_version)
+            self.objects[resource][_key(obj)] = obj
+            for events in self._watchers[resource]:
+                events.put({"type": "MODIFIED", "object": obj})
+
+    def _churn(self):
+        workloads = list(self.objects.get("workloads", {}).values())
+        if not workloads:
+            return
+        for tick in itertools.count():
+            if self.stopped.wait(1 / self.churn_per_second):
+                return
+            workload = self._rng.choice(workloads)
+            condition = workload["status"]["conditions"][-1]
+            condition["status"] = "False" if condition["status"] == "True" else "True"
+            condition["lastTransitionTime"] = f"2024-10-02T00:00:{tick % 60:02d}Z"
+            self.modify("workloads", workload)
+
+
+def _key(obj: dict) -> str:
+    metadata = obj["metadata"]
+    return f"{metadata.get('namespace', '')}/{metadata['name']}"
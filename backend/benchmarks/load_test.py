@@ -0,0 +1,278 @@
+"""
+End-to-end load test of the backend against a synthetic cluster, runnable offline.
+
+Starts benchmarks/fake_apiserver.py with a generated cluster, runs the backend with uvicorn in a
+subprocess pointed at it through a kubeconfig (or, with `--data-source fixture`, on the cluster
+written to a fixture file), then drives it with scripted scenarios:
+
+    rest   concurrent clients polling REST routes (default /kueue/status)
+    ws     many WebSocket subscribers spread over the overview and detail views
+    mixed  both at the same time
+
+and reports latency percentiles, throughput, and the backend's CPU usage and RSS (read from /proc).
+
+Usage, from the backend directory:
+    python -m benchmarks.load_test [--scenario mixed] [--workloads 10000] [--nodes 3000]
+                                   [--clients 20] [--subscribers 200] [--duration 30] [--churn 50]
+                                   [--data-source informer]
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+import websockets
+
+from benchmarks.fake_apiserver import FakeApiServer
+from benchmarks.synthetic import make_cluster
+from serialization import dumps
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+
+
+def percentile(values, fraction: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def format_latencies(name: str, latencies, elapsed: float, errors: int, received_bytes: int) -> str:
+    return (f"{name:<40} n={len(latencies):<7} {len(latencies) / elapsed:8.1f}/s  "
+            f"p50={percentile(latencies, 0.5) * 1000:8.1f}ms  p99={percentile(latencies, 0.99) * 1000:8.1f}ms  "
+            f"errors={errors:<4} {received_bytes / elapsed / 1e6:7.2f} MB/s")
+
+
+class ProcessSampler:
+    """
+    Samples the CPU time and RSS of a process from /proc while a scenario runs.
+    """
+
+    def __init__(self, pid: int, interval: float = 0.5):
+        self.pid = pid
+        self.interval = interval
+        self.peak_rss = 0
+        self._task = None
+
+    def cpu_seconds(self) -> float:
+        with open(f"/proc/{self.pid}/stat") as f:
+            # utime and stime are fields 14 and 15, counted after the parenthesized command name
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+
+    def rss(self) -> int:
+        with open(f"/proc/{self.pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+        return 0
+
+    async def _sample(self):
+        while True:
+            self.peak_rss = max(self.peak_rss, self.rss())
+            await asyncio.sleep(self.interval)
+
+    def __enter__(self):
+        self.start_cpu, self.start_time = self.cpu_seconds(), time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._sample())
+        return self
+
+    def __exit__(self, *exc):
+        self._task.cancel()
+        self.cpu = self.cpu_seconds() - self.start_cpu
+        self.elapsed = time.monotonic() - self.start_time
+
+    def report(self) -> str:
+        return (f"backend CPU {self.cpu:.1f}s over {self.elapsed:.1f}s ({self.cpu / self.elapsed * 100:.0f}% of a core), "
+                f"RSS {self.rss() / 1e6:.0f} MB now, {self.peak_rss / 1e6:.0f} MB peak")
+
+
+async def rest_clients(base_url: str, paths, clients: int, duration: float):
+    """
+    Runs `clients` concurrent loops requesting `paths` in turn for `duration` seconds.
+    """
+    latencies = {path: [] for path in paths}
+    errors = {path: 0 for path in paths}
+    received = {path: 0 for path in paths}
+    deadline = time.monotonic() + duration
+
+    async def client_loop(client_index: int, client: httpx.AsyncClient):
+        request = client_index
+        while time.monotonic() < deadline:
+            path = paths[request % len(paths)]
+            request += 1
+            start = time.perf_counter()
+            try:
+                response = await client.get(path, headers={"Accept-Encoding": "gzip"})
+                response.raise_for_status()
+                latencies[path].append(time.perf_counter() - start)
+                received[path] += int(response.headers.get("content-length") or len(response.content))
+            except httpx.HTTPError:
+                errors[path] += 1
+
+    limits = httpx.Limits(max_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        await asyncio.gather(*(client_loop(index, client) for index in range(clients)))
+    return [format_latencies(f"GET {path}", latencies[path], duration, errors[path], received[path])
+            for path in paths]
+
+
+async def ws_subscribers(base_url: str, endpoints, subscribers: int, duration: float, delta: bool):
+    """
+    Opens `subscribers` WebSockets spread over `endpoints`, and measures the time to the first message
+    and the messages received until `duration` seconds have passed.
+    """
+    first_message, messages, received, errors = [], [], [0], [0]
+    ws_url = base_url.replace("http://", "ws://")
+    deadline = time.monotonic() + duration
+
+    async def subscriber(index: int):
+        endpoint = endpoints[index % len(endpoints)]
+        url = f"{ws_url}{endpoint}{'?mode=delta' if delta else ''}"
+        start = time.perf_counter()
+        try:
+            async with websockets.connect(url, max_size=None, open_timeout=60) as websocket:
+                last = None
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        message = await asyncio.wait_for(websocket.recv(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                    now = time.perf_counter()
+                    if last is None:
+                        first_message.append(now - start)
+                    else:
+                        messages.append(now - last)
+                    last = now
+                    received[0] += len(message)
+        except (OSError, websockets.WebSocketException):
+            errors[0] += 1
+
+    await asyncio.gather(*(subscriber(index) for index in range(subscribers)))
+    mode = "delta" if delta else "full"
+    return [
+        format_latencies(f"WS first message ({mode})", first_message, duration, errors[0], 0),
+        format_latencies(f"WS update interval ({mode})", messages, duration, 0, received[0]),
+    ]
+
+
+def ws_endpoints(cluster: dict):
+    """
+    A mix of overview and detail subscriptions over the synthetic cluster's objects.
+    """
+    endpoints = ["/ws/workloads/dashboard", "/ws/cohorts", "/ws/cluster-queues", "/ws/resource-flavors"]
+    for index, cluster_queue in enumerate(cluster["clusterqueues"][:10]):
+        endpoints.append(f"/ws/cluster-queue/{cluster_queue['metadata']['name']}")
+        endpoints.append(f"/ws/cohort/{cluster_queue['spec']['cohort']}")
+    for flavor in cluster["resourceflavors"][:5]:
+        endpoints.append(f"/ws/resource-flavor/{flavor['metadata']['name']}")
+    for local_queue in cluster["localqueues"][:10]:
+        metadata = local_queue["metadata"]
+        endpoints.append(f"/ws/local-queue/{metadata['namespace']}/{metadata['name']}/workloads")
+    for workload in cluster["workloads"][:10]:
+        metadata = workload["metadata"]
+        endpoints.append(f"/ws/workload/{metadata['namespace']}/{metadata['name']}")
+    return endpoints
+
+
+def start_backend(kubeconfig: str, port: int, data_source: str, fixture_path: str) -> subprocess.Popen:
+    env = {**os.environ, "KUBECONFIG": kubeconfig, "KUBERNETES_SERVICE_HOST": "",
+           "K8S_DATA_SOURCE": data_source, "K8S_FIXTURE_PATH": fixture_path}
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning",
+         "--ws", "websockets", "--ws-per-message-deflate", "true"],
+        cwd=BACKEND_DIR, env=env,
+    )
+
+
+async def wait_until_ready(base_url: str, backend: subprocess.Popen, timeout: float = 300):
+    """
+    Waits until the backend answers /kueue/status, i.e. the informers finished their initial LIST.
+    """
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        while time.monotonic() < deadline:
+            if backend.poll() is not None:
+                raise RuntimeError(f"Backend exited with code {backend.returncode}")
+            try:
+                if (await client.get("/kueue/status")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.5)
+    raise RuntimeError("Backend did not become ready")
+
+
+async def run(args, cluster: dict, base_url: str, pid: int):
+    print(f"Scenario {args.scenario}: {args.clients} REST clients, {args.subscribers} WebSocket subscribers, "
+          f"{args.duration:.0f}s, {args.churn:g} workload changes/s")
+    tasks = []
+    if args.scenario in ("rest", "mixed"):
+        tasks.append(rest_clients(base_url, args.path, args.clients, args.duration))
+    if args.scenario in ("ws", "mixed"):
+        tasks.append(ws_subscribers(base_url, ws_endpoints(cluster), args.subscribers, args.duration, args.delta))
+    with ProcessSampler(pid) as sampler:
+        results = await asyncio.gather(*tasks)
+    for lines in results:
+        for line in lines:
+            print(line)
+    print(sampler.report())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=("rest", "ws", "mixed"), default="mixed")
+    parser.add_argument("--workloads", type=int, default=10000)
+    parser.add_argument("--cluster-queues", type=int, default=50)
+    parser.add_argument("--cohorts", type=int, default=10)
+    parser.add_argument("--flavors", type=int, default=12)
+    parser.add_argument("--nodes", type=int, default=3000)
+    parser.add_argument("--pods-per-workload", type=int, default=3, choices=range(4))
+    parser.add_argument("--clients", type=int, default=20, help="concurrent REST clients")
+    parser.add_argument("--path", action="append", help="REST path to poll, repeatable (default /kueue/status)")
+    parser.add_argument("--subscribers", type=int, default=200, help="concurrent WebSocket subscribers")
+    parser.add_argument("--delta", action="store_true", help="subscribe with ?mode=delta")
+    parser.add_argument("--duration", type=float, default=30, help="seconds per scenario")
+    parser.add_argument("--churn", type=float, default=50, help="workload status changes per second")
+    parser.add_argument("--port", type=int, default=8765, help="port of the backend under test")
+    parser.add_argument("--data-source", choices=("informer", "live", "fixture"), default="informer",
+                        help="K8S_DATA_SOURCE of the backend under test")
+    args = parser.parse_args()
+    args.path = args.path or ["/kueue/status"]
+
+    start = time.perf_counter()
+    cluster = make_cluster(workloads=args.workloads, cluster_queues=args.cluster_queues, cohorts=args.cohorts,
+                           flavors=args.flavors, nodes=args.nodes, pods_per_workload=args.pods_per_workload)
+    print("Synthetic cluster: " + ", ".join(f"{len(objs)} {resource}" for resource, objs in cluster.items())
+          + f" ({time.perf_counter() - start:.1f}s)")
+
+    apiserver = FakeApiServer(cluster, churn_per_second=args.churn).start()
+    with tempfile.NamedTemporaryFile("w", suffix=".kubeconfig") as kubeconfig, \
+            tempfile.NamedTemporaryFile("wb", suffix=".json") as fixture:
+        apiserver.write_kubeconfig(kubeconfig.name)
+        if args.data_source == "fixture":
+            fixture.write(dumps(cluster))
+            fixture.flush()
+        backend = start_backend(kubeconfig.name, args.port, args.data_source, fixture.name)
+        base_url = f"http://127.0.0.1:{args.port}"
+        try:
+            start = time.perf_counter()
+            asyncio.run(wait_until_ready(base_url, backend))
+            print(f"Backend ready after {time.perf_counter() - start:.1f}s")
+            asyncio.run(run(args, cluster, base_url, backend.pid))
+        finally:
+            backend.terminate()
+            backend.wait()
+            apiserver.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,373 @@
+"""
+Synthetic Kueue objects shaped like the API server's, for offline benchmarks.
+"""
+import random
+
+__all__ = [
+    "make_workload",
+    "make_pod",
+    "make_workloads_snapshot",
+    "make_raw_pod",
+    "make_resource_flavor",
+    "make_node",
+    "make_cluster_queue",
+    "make_local_queue",
+    "make_event",
+    "make_cluster",
+]
+
+CONDITION_REASONS = ["Admitted", "QuotaReserved", "Pending", "Preempted", "Finished"]
+
+
+def make_workload(index: int, namespace: str, queue_name: str, rng: random.Random) -> dict:
+    job_uid = f"{index:08d}-job0-0000-0000-{index:012d}"
+    admitted = rng.random() < 0.7
+    return {
+        "apiVersion": "kueue.x-k8s.io/v1beta1",
+        "kind": "Workload",
+        "metadata": {
+            "name": f"job-sample-{index}-{index % 97:05x}",
+            "namespace": namespace,
+            "uid": f"{index:08d}-wl00-0000-0000-{index:012d}",
+            "resourceVersion": str(100000 + index),
+            "creationTimestamp": "2024-10-01T12:00:00Z",
+            "generation": 1,
+            "labels": {
+                "kueue.x-k8s.io/job-uid": job_uid,
+                "kueue.x-k8s.io/queue-name": queue_name,
+            },
+            "ownerReferences": [{
+                "apiVersion": "batch/v1",
+                "kind": "Job",
+                "name": f"sample-{index}",
+                "uid": job_uid,
+                "controller": True,
+                "blockOwnerDeletion": True,
+            }],
+        },
+        "spec": {
+            "queueName": queue_name,
+            "priority": rng.choice([0, 100, 1000]),
+            "priorityClassSource": "",
+            "active": True,
+            "podSets": [{
+                "name": "main",
+                "count": rng.randint(1, 4),
+                "template": {
+                    "spec": {
+                        "restartPolicy": "Never",
+                        "containers": [{
+                            "name": "dummy-job",
+                            "image": "gcr.io/k8s-staging-perf-tests/sleep:v0.1.0",
+                            "args": ["30s"],
+                            "resources": {"requests": {"cpu": "1", "memory": "200Mi"}},
+                        }],
+                    },
+                },
+            }],
+        },
+        "status": {
+            "conditions": [
+                {
+                    "type": "QuotaReserved",
+                    "status": "True" if admitted else "False",
+                    "reason": "QuotaReserved" if admitted else "Pending",
+                    "message": f"Quota reserved in ClusterQueue cluster-queue-{index % 8}" if admitted
+                    else "couldn't assign flavors to pod set main: insufficient unused quota for cpu in flavor default-flavor",
+                    "lastTransitionTime": "2024-10-01T12:00:01Z",
+                },
+                {
+                    "type": "Admitted",
+                    "status": "True" if admitted else "False",
+                    "reason": rng.choice(CONDITION_REASONS),
+                    "message": "The workload is admitted" if admitted else "Waiting for quota",
+                    "lastTransitionTime": "2024-10-01T12:00:01Z",
+                },
+            ],
+            "admission": {
+                "clusterQueue": f"cluster-queue-{index % 8}",
+                "podSetAssignments": [{
+                    "name": "main",
+                    "flavors": {"cpu": "default-flavor", "memory": "default-flavor"},
+                    "resourceUsage": {"cpu": "3", "memory": "600Mi"},
+                    "count": 3,
+                }],
+            } if admitted else None,
+        },
+    }
+
+
+def make_pod(name: str, rng: random.Random) -> dict:
+    phase = rng.choice(["Running", "Pending", "Succeeded"])
+    return {
+        "name": name,
+        "status": {
+            "phase": phase,
+            "conditions": [
+                {"type": "PodScheduled", "status": "True" if phase != "Pending" else "False",
+                 "lastTransitionTime": "2024-10-01T12:00:02Z"},
+                {"type": "Ready", "status": "True" if phase == "Running" else "False",
+                 "lastTransitionTime": "2024-10-01T12:00:05Z"},
+            ],
+            "containerStatuses": [{
+                "name": "dummy-job",
+                "ready": phase == "Running",
+                "state": {"running": {"startedAt": "2024-10-01T12:00:05Z"}} if phase == "Running"
+                else {"waiting": {"reason": "ContainerCreating"}},
+            }],
+        },
+    }
+
+
+def make_workloads_snapshot(count: int, namespaces: int = 20, queues_per_namespace: int = 3, seed: int = 0) -> dict:
+    """
+    Returns a `get_workloads()`-shaped payload with `count` workloads and their pods.
+    """
+    rng = random.Random(seed)
+    items = []
+    workloads_by_uid = {}
+    for index in range(count):
+        namespace = f"team-{index % namespaces}"
+        queue_name = f"user-queue-{index % queues_per_namespace}"
+        workload = make_workload(index, namespace, queue_name, rng)
+        workload["pods"] = [
+            make_pod(f"sample-{index}-{pod:05x}", rng)
+            for pod in range(workload["spec"]["podSets"][0]["count"])
+        ]
+        workload["preemption"] = {"preempted": False, "reason": "None"}
+        items.append(workload)
+        workloads_by_uid[workload["metadata"]["uid"]] = workload["metadata"]["name"]
+    return {"items": items, "workloads_by_uid": workloads_by_uid}
+
+
+def make_raw_pod(index: int, rng: random.Random) -> dict:
+    """
+    Returns a pod as listed by the API server, with managedFields, spec and full status.
+    """
+    name = f"sample-{index}-{index % 31:05x}"
+    job_uid = f"{index // 3:08d}-job0-0000-0000-{index // 3:012d}"
+    phase = rng.choice(["Running", "Pending", "Succeeded"])
+    return {
+        "metadata": {
+            "name": name,
+            "generateName": f"sample-{index}-",
+            "namespace": f"team-{index % 20}",
+            "uid": f"{index:08d}-pod0-0000-0000-{index:012d}",
+            "resourceVersion": str(200000 + index),
+            "creationTimestamp": "2024-10-01T12:00:02Z",
+            "labels": {
+                "batch.kubernetes.io/controller-uid": job_uid,
+                "batch.kubernetes.io/job-name": f"sample-{index // 3}",
+                "controller-uid": job_uid,
+                "job-name": f"sample-{index // 3}",
+            },
+            "annotations": {"batch.kubernetes.io/job-tracking": ""},
+            "ownerReferences": [{"apiVersion": "batch/v1", "kind": "Job", "name": f"sample-{index // 3}",
+                                 "uid": job_uid, "controller": True, "blockOwnerDeletion": True}],
+            "managedFields": [
+                {
+                    "manager": manager,
+                    "operation": "Update",
+                    "apiVersion": "v1",
+                    "time": "2024-10-01T12:00:05Z",
+                    "fieldsType": "FieldsV1",
+                    "fieldsV1": {
+                        "f:metadata": {"f:labels": {f"f:{label}": {} for label in ("controller-uid", "job-name")}},
+                        "f:status": {"f:conditions": {f'k:{{"type":"{kind}"}}': {".": {}, "f:status": {}, "f:type": {}}
+                                                      for kind in ("PodScheduled", "Ready", "Initialized")}},
+                    },
+                }
+                for manager in ("kube-controller-manager", "kubelet")
+            ],
+        },
+        "spec": {
+            "containers": [{
+                "name": "dummy-job",
+                "image": "gcr.io/k8s-staging-perf-tests/sleep:v0.1.0",
+                "args": ["30s"],
+                "resources": {"requests": {"cpu": "1", "memory": "200Mi"}},
+                "terminationMessagePath": "/dev/termination-log",
+                "terminationMessagePolicy": "File",
+                "imagePullPolicy": "IfNotPresent",
+                "volumeMounts": [{"name": "kube-api-access", "readOnly": True,
+                                  "mountPath": "/var/run/secrets/kubernetes.io/serviceaccount"}],
+            }],
+            "restartPolicy": "Never",
+            "nodeName": f"worker-{index % 300}",
+            "schedulerName": "default-scheduler",
+            "serviceAccountName": "default",
+            "tolerations": [
+                {"key": "node.kubernetes.io/not-ready", "operator": "Exists", "effect": "NoExecute", "tolerationSeconds": 300},
+                {"key": "node.kubernetes.io/unreachable", "operator": "Exists", "effect": "NoExecute", "tolerationSeconds": 300},
+            ],
+            "volumes": [{"name": "kube-api-access", "projected": {"defaultMode": 420, "sources": [
+                {"serviceAccountToken": {"expirationSeconds": 3607, "path": "token"}},
+                {"configMap": {"name": "kube-root-ca.crt", "items": [{"key": "ca.crt", "path": "ca.crt"}]}},
+            ]}}],
+        },
+        "status": {
+            "phase": phase,
+            "hostIP": f"10.0.{index % 250}.{index % 200}",
+            "podIP": f"10.128.{index % 250}.{index % 200}",
+            "podIPs": [{"ip": f"10.128.{index % 250}.{index % 200}"}],
+            "qosClass": "Burstable",
+            "startTime": "2024-10-01T12:00:02Z",
+            "conditions": [
+                {"type": kind, "status": "True", "lastProbeTime": None, "lastTransitionTime": "2024-10-01T12:00:05Z"}
+                for kind in ("Initialized", "Ready", "ContainersReady", "PodScheduled")
+            ],
+            "containerStatuses": [{
+                "name": "dummy-job",
+                "ready": phase == "Running",
+                "restartCount": 0,
+                "started": phase == "Running",
+                "image": "gcr.io/k8s-staging-perf-tests/sleep:v0.1.0",
+                "imageID": "gcr.io/k8s-staging-perf-tests/sleep@sha256:" + "0" * 64,
+                "containerID": f"cri-o://{index:064x}",
+                "lastState": {},
+                "state": {"running": {"startedAt": "2024-10-01T12:00:05Z"}},
+            }],
+        },
+    }
+
+
+def make_resource_flavor(index: int) -> dict:
+    spec = {"nodeLabels": {"pool": f"pool-{index}"}}
+    if index % 4 == 3:
+        # Every fourth flavor targets tainted nodes, e.g. a GPU pool
+        spec["nodeTaints"] = [{"key": "dedicated", "value": f"pool-{index}", "effect": "NoSchedule"}]
+    return {
+        "apiVersion": "kueue.x-k8s.io/v1beta1",
+        "kind": "ResourceFlavor",
+        "metadata": {"name": f"flavor-{index}", "uid": f"{index:08d}-rf00-0000-0000-{index:012d}",
+                     "resourceVersion": str(10000 + index), "creationTimestamp": "2024-10-01T12:00:00Z"},
+        "spec": spec,
+    }
+
+
+def make_node(index: int, flavors: int) -> dict:
+    pool = index % flavors
+    node = {
+        "metadata": {
+            "name": f"worker-{index}",
+            "uid": f"{index:08d}-node-0000-0000-{index:012d}",
+            "resourceVersion": str(20000 + index),
+            "labels": {
+                "kubernetes.io/hostname": f"worker-{index}",
+                "kubernetes.io/os": "linux",
+                "node-role.kubernetes.io/worker": "",
+                "pool": f"pool-{pool}",
+                "topology.kubernetes.io/zone": f"zone-{index % 3}",
+            },
+        },
+        "spec": {"podCIDR": f"10.128.{index % 250}.0/24"},
+        "status": {
+            "capacity": {"cpu": "32", "memory": "128Gi", "pods": "250"},
+            "allocatable": {"cpu": "31500m", "memory": "120Gi", "pods": "250"},
+            "images": [{"names": [f"registry.example.com/image-{image}:latest"], "sizeBytes": 100000000}
+                       for image in range(20)],
+        },
+    }
+    if pool % 4 == 3:
+        node["spec"]["taints"] = [{"key": "dedicated", "value": f"pool-{pool}", "effect": "NoSchedule"}]
+    return node
+
+
+def make_cluster_queue(index: int, cohorts: int, flavors: int, rng: random.Random) -> dict:
+    flavor_names = [f"flavor-{(index + offset) % flavors}" for offset in range(min(2, flavors))]
+    return {
+        "apiVersion": "kueue.x-k8s.io/v1beta1",
+        "kind": "ClusterQueue",
+        "metadata": {"name": f"cluster-queue-{index}", "uid": f"{index:08d}-cq00-0000-0000-{index:012d}",
+                     "resourceVersion": str(30000 + index), "creationTimestamp": "2024-10-01T12:00:00Z"},
+        "spec": {
+            "cohort": f"cohort-{index % cohorts}",
+            "namespaceSelector": {},
+            "queueingStrategy": "BestEffortFIFO",
+            "resourceGroups": [{
+                "coveredResources": ["cpu", "memory"],
+                "flavors": [
+                    {"name": flavor, "resources": [
+                        {"name": "cpu", "nominalQuota": str(rng.choice([8, 16, 64])), "borrowingLimit": "8"},
+                        {"name": "memory", "nominalQuota": f"{rng.choice([32, 64, 256])}Gi"},
+                    ]}
+                    for flavor in flavor_names
+                ],
+            }],
+        },
+        "status": {
+            "pendingWorkloads": rng.randint(0, 50),
+            "reservingWorkloads": rng.randint(0, 20),
+            "admittedWorkloads": rng.randint(0, 20),
+            "flavorsUsage": [
+                {"name": flavor, "resources": [
+                    {"name": "cpu", "total": f"{rng.randint(0, 8000)}m", "borrowed": "0"},
+                    {"name": "memory", "total": f"{rng.randint(0, 32)}Gi", "borrowed": "0"},
+                ]}
+                for flavor in flavor_names
+            ],
+        },
+    }
+
+
+def make_local_queue(namespace: str, name: str, cluster_queue: str, rng: random.Random) -> dict:
+    return {
+        "apiVersion": "kueue.x-k8s.io/v1beta1",
+        "kind": "LocalQueue",
+        "metadata": {"name": name, "namespace": namespace, "uid": f"lq-{namespace}-{name}",
+                     "resourceVersion": "40000", "creationTimestamp": "2024-10-01T12:00:00Z"},
+        "spec": {"clusterQueue": cluster_queue},
+        "status": {"pendingWorkloads": rng.randint(0, 10), "reservingWorkloads": rng.randint(0, 5),
+                   "admittedWorkloads": rng.randint(0, 5)},
+    }
+
+
+def make_event(index: int, workload: dict) -> dict:
+    metadata = workload["metadata"]
+    return {
+        "metadata": {"name": f"{metadata['name']}.{index:016x}", "namespace": metadata["namespace"],
+                     "uid": f"{index:08d}-ev00-0000-0000-{index:012d}", "resourceVersion": str(500000 + index)},
+        "involvedObject": {"kind": "Workload", "namespace": metadata["namespace"], "name": metadata["name"],
+                           "uid": metadata["uid"], "apiVersion": "kueue.x-k8s.io/v1beta1"},
+        "reason": "QuotaReserved",
+        "message": "Quota reserved in ClusterQueue",
+        "source": {"component": "kueue-admission"},
+        "firstTimestamp": "2024-10-01T12:00:01Z",
+        "lastTimestamp": "2024-10-01T12:00:01Z",
+        "count": 1,
+        "type": "Normal",
+    }
+
+
+def make_cluster(workloads: int = 10000, cluster_queues: int = 50, cohorts: int = 10, flavors: int = 12,
+                 namespaces: int = 20, queues_per_namespace: int = 3, nodes: int = 3000,
+                 pods_per_workload: int = 3, seed: int = 0) -> dict:
+    """
+    Returns the raw objects of a whole synthetic cluster, as listed by the API server, by informer resource:
+    cohorts of ClusterQueues sharing ResourceFlavors, LocalQueues pointing at them, workloads with their
+    pods (up to 3 per workload) and events, and nodes split into one pool per flavor.
+    """
+    rng = random.Random(seed)
+    local_queues = []
+    for namespace_index in range(namespaces):
+        for queue_index in range(queues_per_namespace):
+            cluster_queue = f"cluster-queue-{(namespace_index * queues_per_namespace + queue_index) % cluster_queues}"
+            local_queues.append(make_local_queue(f"team-{namespace_index}", f"user-queue-{queue_index}",
+                                                 cluster_queue, rng))
+    workload_objects = []
+    for index in range(workloads):
+        local_queue = local_queues[index % len(local_queues)]
+        workload = make_workload(index, local_queue["metadata"]["namespace"], local_queue["metadata"]["name"], rng)
+        if workload["status"]["admission"]:
+            workload["status"]["admission"]["clusterQueue"] = local_queue["spec"]["clusterQueue"]
+        workload_objects.append(workload)
+    return {
+        "clusterqueues": [make_cluster_queue(index, cohorts, flavors, rng) for index in range(cluster_queues)],
+        "localqueues": local_queues,
+        "workloads": workload_objects,
+        "resourceflavors": [make_resource_flavor(index) for index in range(flavors)],
+        # make_raw_pod assigns pods 3w..3w+2 to the job of workload w
+        "pods": [make_raw_pod(3 * index + pod, rng) for index in range(workloads) for pod in range(pods_per_workload)],
+        "nodes": [make_node(index, flavors) for index in range(nodes)],
+        "events": [make_event(index, workload) for index, workload in enumerate(workload_objects)],
+    }
@@ -0,0 +1,255 @@
+import argparse
+import logging
+import os
+
+import orjson
+from kubernetes import client, config
+
+from event_feed import EventFeed
+from informer import (InformerCache, Store, configure_store, get_workload, list_objects, resource_getters,
+                      resource_listers)
+from snapshot import SnapshotFile
+from topology import CohortTopology
+from transforms import TRANSFORMS, slim_metadata
+from workload_record import record_default
+
+__all__ = [
+    "LiveSource",
+    "LiveStore",
+    "FixtureSource",
+    "InformerCache",
+    "create_data_source",
+    "create_api_clients",
+    "record_fixture",
+    "RESOURCES",
+]
+
+# Which data source the getters read from: "informer" (LIST+WATCH caches), "live" (a LIST per read)
+# or "fixture" (objects recorded in the K8S_FIXTURE_PATH JSON file, no cluster needed)
+DATA_SOURCE = os.getenv("K8S_DATA_SOURCE", "informer")
+FIXTURE_PATH = os.getenv("K8S_FIXTURE_PATH", "")
+# File the informer caches persist their objects to and are seeded from at startup, for fast restarts
+# (empty disables it), how often it is rewritten, and how old it may be to still be loaded
+SNAPSHOT_PATH = os.getenv("K8S_SNAPSHOT_PATH", "")
+SNAPSHOT_INTERVAL_SECONDS = float(os.getenv("K8S_SNAPSHOT_INTERVAL_SECONDS", "60"))
+SNAPSHOT_MAX_AGE_SECONDS = float(os.getenv("K8S_SNAPSHOT_MAX_AGE_SECONDS", "3600"))
+# Events change too often to be worth persisting
+SNAPSHOT_RESOURCES = os.getenv("K8S_SNAPSHOT_RESOURCES", "clusterqueues,localqueues,workloads,resourceflavors,pods,nodes")
+# Connections kept open to the API server; each running informer holds one for its WATCH
+CLIENT_POOL_MAXSIZE = int(os.getenv("K8S_CLIENT_POOL_MAXSIZE", "32"))
+CLIENT_RETRIES = int(os.getenv("K8S_CLIENT_RETRIES", "3"))
+
+RESOURCES = ("clusterqueues", "localqueues", "workloads", "resourceflavors", "pods", "nodes", "events")
+
+
+def create_api_clients():
+    """
+    Loads the in-cluster configuration, or the kubeconfig outside a cluster, and returns the
+    CustomObjectsApi and CoreV1Api sharing one pooled, keep-alive HTTP connection pool.
+    """
+    configuration = client.Configuration()
+    try:
+        config.load_incluster_config(client_configuration=configuration)
+    except config.ConfigException:
+        config.load_kube_config(client_configuration=configuration)
+    configuration.connection_pool_maxsize = CLIENT_POOL_MAXSIZE
+    configuration.retries = CLIENT_RETRIES
+    # TCP keepalive detects dead connections behind idle WATCH streams and load balancers
+    configuration.keep_alive = True
+    api_client = client.ApiClient(configuration)
+    return client.CustomObjectsApi(api_client), client.CoreV1Api(api_client)
+
+
+class LiveStore:
+    """
+    Read-only Store of a resource for LiveSource: `get` GETs the single object, the other reads
+    LIST the whole collection, once for the lifetime of the LiveStore.
+    """
+
+    def __init__(self, resource: str, list_func, get_func):
+        self.resource = resource
+        self._list_func = list_func
+        self._get_func = get_func
+        self._transform = TRANSFORMS.get(resource, slim_metadata)
+        self._store = None
+
+    def get(self, key: str):
+        namespace, _, name = key.rpartition("/")
+        obj = self._get_func(namespace, name)
+        return self._transform(obj) if obj is not None else None
+
+    def list(self, namespace: str = None):
+        return self._listed().list(namespace)
+
+    def by_index(self, name: str, value):
+        return self._listed().by_index(name, value)
+
+    def by_all_indexed(self, requirements):
+        return self._listed().by_all_indexed(requirements)
+
+    def add_aggregator(self, aggregator):
+        self._listed().add_aggregator(aggregator)
+
+    def __len__(self):
+        return len(self._listed())
+
+    def _listed(self) -> Store:
+        if self._store is None:
+            items, _ = list_objects(self.resource, self._list_func, self._transform)
+            self._store = configure_store(self.resource, Store())
+            self._store.replace(items)
+        return self._store
+
+
+class LiveSource:
+    """
+    Data source reading from the API server on every read, without caching: single objects are
+    GET, everything else is LISTed. The getter cache still coalesces identical reads.
+    Useful to compare against the informer caches.
+    """
+
+    # Sampling the queue history would LIST the queues and flavors every few seconds
+    samples_history = False
+    in_memory = False
+
+    def __init__(self, custom_api: client.CustomObjectsApi, core_api: client.CoreV1Api):
+        self._custom_api = custom_api
+        self._listers = resource_listers(custom_api, core_api)
+        self._getters = resource_getters(custom_api, core_api)
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def object_counts(self) -> dict:
+        return {}
+
+    def store(self, resource: str) -> LiveStore:
+        return LiveStore(resource, self._listers[resource], self._getters[resource])
+
+    def topology(self) -> CohortTopology:
+        topology = CohortTopology()
+        self.store("clusterqueues").add_aggregator(topology)
+        return topology
+
+    def event_feed(self):
+        # Nothing is watched: event subscribers fall back to polling
+        return None
+
+    def generation(self, resource: str):
+        # Changes are not tracked: conditional responses fall back to hashing the content
+        return None
+
+    def stale_resources(self) -> list:
+        return []
+
+    def fetch_workload(self, namespace: str, name: str):
+        return get_workload(self._custom_api, namespace, name)
+
+
+class FixtureSource:
+    """
+    Data source serving objects recorded in a JSON file mapping each resource to its objects,
+    as written by `record_fixture` (`python -m data_source record <path>`). Starts instantly and needs
+    no cluster, for tests and benchmarks.
+    """
+
+    samples_history = True
+    in_memory = True
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            recorded = orjson.loads(f.read())
+        self._stores = {}
+        for resource in RESOURCES:
+            transform = TRANSFORMS.get(resource, slim_metadata)
+            store = configure_store(resource, Store())
+            store.replace([transform(obj) for obj in recorded.get(resource, [])])
+            self._stores[resource] = store
+        self._topology = CohortTopology()
+        self._stores["clusterqueues"].add_aggregator(self._topology)
+        self._event_feed = EventFeed()
+        self._stores["events"].add_aggregator(self._event_feed)
+        logging.info(f"Loaded fixture {path}: {self.object_counts()}")
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def object_counts(self) -> dict:
+        return {resource: len(store) for resource, store in self._stores.items()}
+
+    def store(self, resource: str) -> Store:
+        return self._stores[resource]
+
+    def topology(self) -> CohortTopology:
+        return self._topology
+
+    def event_feed(self) -> EventFeed:
+        return self._event_feed
+
+    def generation(self, resource: str) -> int:
+        return self._stores[resource].generation
+
+    def stale_resources(self) -> list:
+        return []
+
+    def fetch_workload(self, namespace: str, name: str):
+        # Only the compact records of the recorded workloads are kept
+        workload = self._stores["workloads"].get(f"{namespace}/{name}")
+        return workload.to_dict() if workload is not None else None
+
+
+def create_data_source(kind: str = DATA_SOURCE, fixture_path: str = FIXTURE_PATH):
+    """
+    Creates the data source selected with K8S_DATA_SOURCE. Raises ValueError on an unknown kind.
+    """
+    if kind == "fixture":
+        return FixtureSource(fixture_path)
+    if kind not in ("informer", "live"):
+        raise ValueError(f"Unknown data source {kind}, expected one of informer, live, fixture")
+    custom_api, core_api = create_api_clients()
+    if kind == "live":
+        return LiveSource(custom_api, core_api)
+    snapshot = None
+    if SNAPSHOT_PATH:
+        resources = [resource for resource in SNAPSHOT_RESOURCES.split(",") if resource]
+        unknown = set(resources) - set(RESOURCES)
+        if unknown:
+            raise ValueError(f"Unknown snapshot resources {', '.join(sorted(unknown))}")
+        snapshot = SnapshotFile(SNAPSHOT_PATH, resources, SNAPSHOT_MAX_AGE_SECONDS)
+    return InformerCache(custom_api, core_api, snapshot=snapshot, snapshot_interval=SNAPSHOT_INTERVAL_SECONDS)
+
+
+def record_fixture(source, path: str):
+    """
+    Writes the objects of every resource of a data source to a fixture file for `FixtureSource`.
+    """
+    with open(path, "wb") as f:
+        f.write(orjson.dumps({resource: source.store(resource).list() for resource in RESOURCES},
+                             default=record_default))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Records the objects of the cluster of the current kubeconfig to a fixture file for FixtureSource.")
+    parser.add_argument("command", choices=("record",))
+    parser.add_argument("path", help="fixture file to write")
+    parser.add_argument("--data-source", choices=("live", "informer"), default="live",
+                        help="read the cluster with one LIST per resource (live) or through the informers")
+    args = parser.parse_args()
+
+    source = create_data_source(args.data_source)
+    try:
+        record_fixture(source, args.path)
+    finally:
+        source.stop()
+    print(f"Recorded {args.path}")
+
+
+if __name__ == "__main__":
+    main()
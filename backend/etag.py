@@ -0,0 +1,86 @@
+import asyncio
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional, Sequence
+
+__all__ = ["ETagCache", "generation_etag", "content_etag", "etag_matches"]
+
+# Differs between processes, so ETags made from the change counters of another replica or of a
+# previous run never match
+_EPOCH = os.urandom(4).hex()
+
+
+# ETags are weak: GZipMiddleware sends the same one for the gzip and identity encodings of a body, which
+# RFC 9110 only allows for weak validators
+
+def generation_etag(generations: Sequence[int]) -> str:
+    """
+    Weak ETag of a response computed from stores with the given change counters.
+    """
+    return f'W/"{_EPOCH}-{"-".join(str(generation) for generation in generations)}"'
+
+
+def content_etag(content: bytes) -> str:
+    """
+    Weak ETag hashing the response body, for data sources that do not count changes.
+    """
+    return f'W/"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header lists `etag` (or is `*`), with the weak comparison of RFC 9110.
+    """
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    opaque_tag = etag.removeprefix("W/")
+    return "*" in candidates or any(candidate.removeprefix("W/") == opaque_tag for candidate in candidates)
+
+
+class ETagCache:
+    """
+    Latest serialized body of each URL with its ETag, for the event loop. A body is reused as long
+    as the ETag computed for a request is unchanged, and concurrent requests for a missing one share
+    a single computation. The bodies held take at most `max_bytes`, least recently used evicted first.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()  # url -> (etag, body), least recently used first
+        self._in_flight = {}  # (url, etag) -> Task computing the body
+
+    async def get_or_compute(self, url: str, etag: str, compute: Callable[[], Awaitable[bytes]]) -> bytes:
+        entry = self._entries.get(url)
+        if entry is not None and entry[0] == etag:
+            self._entries.move_to_end(url)
+            return entry[1]
+        key = (url, etag)
+        task = self._in_flight.get(key)
+        if task is None:
+            task = self._in_flight[key] = asyncio.ensure_future(compute())
+            task.add_done_callback(lambda done: self._store(url, etag, done))
+        # Shielded: a client going away must not cancel the computation the others wait for
+        return await asyncio.shield(task)
+
+    def _store(self, url: str, etag: str, task: asyncio.Future):
+        del self._in_flight[(url, etag)]
+        if task.cancelled() or task.exception() is not None:
+            return
+        body = task.result()
+        previous = self._entries.pop(url, None)
+        if previous is not None:
+            self.size -= len(previous[1])
+        if len(body) > self.max_bytes:
+            return
+        self._entries[url] = (etag, body)
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
@@ -0,0 +1,88 @@
+import asyncio
+import threading
+
+__all__ = ["EventFeed", "involved_object_key", "EVENT_QUEUE_SIZE"]
+
+# Changes buffered per subscriber; past this the subscriber is asked to resync from the full list
+EVENT_QUEUE_SIZE = 1000
+
+
+def involved_object_key(event: dict):
+    """
+    Returns the `namespace/name` of the object an event is about, or None.
+    """
+    involved = event.get("involvedObject") or {}
+    name = involved.get("name")
+    if not name:
+        return None
+    namespace = involved.get("namespace") or event.get("metadata", {}).get("namespace", "")
+    return f"{namespace}/{name}"
+
+
+class EventFeed:
+    """
+    Pushes the changes of the events store to the asyncio subscribers of the objects they are about.
+    Plugged into the events Store with `Store.add_aggregator`, so it is called from the informer thread.
+
+    Subscribers receive `("upsert", event)` and `("delete", event)` items, and `("resync", None)` when
+    the store was re-listed or their queue overflowed, meaning they should re-read the full list.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}  # involved object key -> {asyncio.Queue: event loop}
+
+    def subscribe(self, key: str) -> asyncio.Queue:
+        """
+        Returns a queue receiving the changes of the events about `key`. Must be called from an event loop.
+        """
+        queue = asyncio.Queue(EVENT_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.setdefault(key, {})[queue] = asyncio.get_running_loop()
+        return queue
+
+    def unsubscribe(self, key: str, queue: asyncio.Queue):
+        with self._lock:
+            queues = self._subscribers.get(key)
+            if queues is not None:
+                queues.pop(queue, None)
+                if not queues:
+                    del self._subscribers[key]
+
+    def replace(self, objs):
+        # A re-list may have missed deletions: every subscriber re-reads its list
+        with self._lock:
+            targets = [(queue, loop) for queues in self._subscribers.values() for queue, loop in queues.items()]
+        for queue, loop in targets:
+            _schedule(loop, queue, ("resync", None))
+
+    def upsert(self, obj: dict):
+        self._notify("upsert", obj)
+
+    def delete(self, obj: dict):
+        self._notify("delete", obj)
+
+    def _notify(self, change: str, obj: dict):
+        key = involved_object_key(obj)
+        with self._lock:
+            targets = list(self._subscribers.get(key, {}).items())
+        for queue, loop in targets:
+            _schedule(loop, queue, (change, obj))
+
+
+def _schedule(loop, queue: asyncio.Queue, item):
+    try:
+        loop.call_soon_threadsafe(_deliver, queue, item)
+    except RuntimeError:
+        # The subscriber's event loop is closed (shutdown)
+        pass
+
+
+def _deliver(queue: asyncio.Queue, item):
+    try:
+        queue.put_nowait(item)
+    except asyncio.QueueFull:
+        # The subscriber fell behind: drop its backlog and have it re-read the full list
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(("resync", None))
@@ -0,0 +1,174 @@
+import array
+import logging
+import os
+import threading
+import time
+
+__all__ = ["History", "Ring", "parse_resolutions", "RESOLUTIONS", "MEMORY_BUDGET_BYTES"]
+
+# `step:buckets` pairs, finest first: by default 5s buckets over an hour, 1m over a day and 10m over a week
+RESOLUTIONS = os.getenv("HISTORY_RESOLUTIONS", "5:720,60:1440,600:1008")
+# Upper bound of the memory taken by the buckets; series past it are not recorded
+MEMORY_BUDGET_BYTES = int(os.getenv("HISTORY_MEMORY_BUDGET_BYTES", str(32 * 1024 * 1024)))
+
+NAN = float("nan")
+
+
+def parse_resolutions(value: str):
+    """
+    Parses `step:buckets,...` into `[(step, buckets)]` sorted finest first. Raises ValueError on invalid values.
+    """
+    resolutions = []
+    for pair in value.split(","):
+        step, _, buckets = pair.partition(":")
+        resolutions.append((int(step), int(buckets)))
+    if not resolutions or any(step <= 0 or buckets <= 0 for step, buckets in resolutions):
+        raise ValueError(f"Invalid history resolutions {value}")
+    return sorted(resolutions)
+
+
+class Ring:
+    """
+    The last `capacity` buckets of `step` seconds of a series in a preallocated array of doubles,
+    each holding the mean of the samples that fell in it, NaN for buckets without samples.
+    """
+
+    __slots__ = ("step", "values", "first_bucket", "last_bucket", "_sum", "_count")
+
+    def __init__(self, step: int, capacity: int):
+        self.step = step
+        self.values = array.array("d", [NAN]) * capacity
+        self.first_bucket = None
+        self.last_bucket = None
+        self._sum = 0.0
+        self._count = 0
+
+    def add(self, timestamp: float, value: float):
+        bucket = int(timestamp // self.step)
+        capacity = len(self.values)
+        if self.last_bucket is not None and bucket < self.last_bucket:
+            # The clock went back
+            return
+        if self.first_bucket is None:
+            self.first_bucket = bucket
+        if bucket != self.last_bucket:
+            if self.last_bucket is not None:
+                # Buckets skipped without samples hold values from a previous lap of the ring
+                for skipped in range(self.last_bucket + 1, min(bucket, self.last_bucket + capacity)):
+                    self.values[skipped % capacity] = NAN
+            self.last_bucket = bucket
+            self._sum = 0.0
+            self._count = 0
+        self._sum += value
+        self._count += 1
+        # The current bucket holds the running mean, so it can be read before it is complete
+        self.values[bucket % capacity] = self._sum / self._count
+
+    def range(self, start: float, end: float):
+        """
+        Returns the first bucket of `[start, end]` still held, and the values of the buckets from there.
+        """
+        capacity = len(self.values)
+        first = int(start // self.step)
+        if self.last_bucket is None:
+            return first, []
+        first = max(first, self.first_bucket, self.last_bucket - capacity + 1)
+        last = min(int(end // self.step), self.last_bucket)
+        if last < first:
+            return first, []
+        head, tail = first % capacity, last % capacity
+        if head <= tail:
+            values = self.values[head:tail + 1]
+        else:
+            values = self.values[head:] + self.values[:tail + 1]
+        return first, values.tolist()
+
+
+class History:
+    """
+    In-process time series of queue counters, by `(kind, name)` and metric, each kept at every
+    resolution in fixed-size rings so the memory used is bounded by `memory_budget` bytes.
+    Series that stopped being sampled (deleted queues, removed flavors) are dropped once they fell out
+    of the longest window.
+    """
+
+    def __init__(self, resolutions=None, memory_budget: int = MEMORY_BUDGET_BYTES):
+        self.resolutions = resolutions or parse_resolutions(RESOLUTIONS)
+        bytes_per_series = array.array("d").itemsize * sum(buckets for _, buckets in self.resolutions)
+        self.max_series = max(memory_budget // bytes_per_series, 1)
+        self.window = max(step * buckets for step, buckets in self.resolutions)
+        self._lock = threading.Lock()
+        self._series = {}  # (kind, name) -> {metric: [Ring per resolution]}
+        self._count = 0
+        self.skipped = 0
+
+    def record(self, timestamp: float, samples: dict):
+        """
+        Adds `{(kind, name): {metric: value}}` samples taken at `timestamp`.
+        """
+        with self._lock:
+            for key, metrics in samples.items():
+                series = self._series.setdefault(key, {})
+                for metric, value in metrics.items():
+                    rings = series.get(metric)
+                    if rings is None:
+                        if self._count >= self.max_series:
+                            if not self.skipped:
+                                logging.warning(f"History memory budget reached at {self._count} series, "
+                                                f"not recording new ones")
+                            self.skipped += 1
+                            continue
+                        rings = series[metric] = [Ring(step, buckets) for step, buckets in self.resolutions]
+                        self._count += 1
+                    for ring in rings:
+                        ring.add(timestamp, value)
+            for key, series in list(self._series.items()):
+                for metric, rings in list(series.items()):
+                    finest = rings[0]
+                    if (finest.last_bucket + 1) * finest.step < timestamp - self.window:
+                        del series[metric]
+                        self._count -= 1
+                if not series:
+                    del self._series[key]
+
+    def query(self, kind: str, name: str, start: float, end: float, step: int = None):
+        """
+        Returns `{"step", "start", "metrics": {metric: [values]}}` for the series of an object, where
+        value `i` is the mean over the bucket starting at `start + i * step` (NaN, serialized as null,
+        without samples), or None for an unknown object.
+        Without `step`, the finest resolution still holding `start` is used. Raises ValueError on an unknown step.
+        """
+        if step is None:
+            now = time.time()
+            # One bucket of slack so that a window as long as the ring's still uses it
+            step = next((step for step, buckets in self.resolutions if now - step * (buckets + 1) <= start),
+                        self.resolutions[-1][0])
+        steps = [resolution_step for resolution_step, _ in self.resolutions]
+        if step not in steps:
+            raise ValueError(f"Unknown step {step}, expected one of {', '.join(map(str, steps))}")
+        index = steps.index(step)
+        with self._lock:
+            series = self._series.get((kind, name))
+            if series is None:
+                return None
+            ranges = {metric: rings[index].range(start, end) for metric, rings in series.items()}
+        # Series sampled since later (a new flavor) are padded to the common start; those no longer sampled end earlier
+        first_bucket = min((first for first, values in ranges.values() if values), default=int(start // step))
+        return {
+            "step": step,
+            "start": first_bucket * step,
+            "metrics": {
+                metric: [None] * (first - first_bucket) + values if values else []
+                for metric, (first, values) in ranges.items()
+            },
+        }
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "objects": len(self._series),
+                "series": self._count,
+                "maxSeries": self.max_series,
+                "skipped": self.skipped,
+                "resolutions": [{"step": step, "buckets": buckets} for step, buckets in self.resolutions],
+            }
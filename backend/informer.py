@@ -0,0 +1,672 @@
+import functools
+import logging
+import socket
+import threading
+
+import orjson
+from kubernetes import client
+
+from event_feed import EventFeed, involved_object_key
+from metrics import APISERVER_REQUEST_DURATION
+from topology import CohortTopology
+from transforms import TRANSFORMS, slim_metadata
+from workload_record import WorkloadRecord
+
+__all__ = [
+    "Store",
+    "Informer",
+    "InformerCache",
+    "CacheNotSyncedError",
+    "object_key",
+    "label_index",
+    "labels_index",
+    "taints_index",
+    "taint_key",
+    "field_index",
+    "workload_queue_index",
+    "list_objects",
+    "get_workload",
+    "read_object",
+    "resource_getters",
+    "configure_store",
+    "resource_listers",
+    "involved_object_index",
+]
+
+# Page size used for the initial LIST so 40k objects are not fetched in a single response
+LIST_PAGE_SIZE = 500
+# Server-side timeout of a single WATCH request; the informer re-watches from the last resourceVersion
+WATCH_TIMEOUT_SECONDS = 300
+# Client-side timeouts: establishing a connection, and reading one LIST page
+CONNECT_TIMEOUT_SECONDS = 10
+LIST_TIMEOUT_SECONDS = 60
+# Delay before re-listing after an unexpected error
+ERROR_BACKOFF_SECONDS = 5
+# How long a getter waits for the first LIST of a resource to complete
+SYNC_TIMEOUT_SECONDS = 30
+# Server-side timeout of the first WATCH resumed from a snapshot's resourceVersion: once it ends without
+# a 410 Gone, every change since the snapshot was replayed and the store is no longer stale
+RESUME_WATCH_TIMEOUT_SECONDS = 5
+
+KUEUE_GROUP = "kueue.x-k8s.io"
+KUEUE_VERSION = "v1beta1"
+
+
+class CacheNotSyncedError(client.ApiException):
+    """
+    Raised when a resource is read before its informer finished the initial LIST.
+    Subclasses ApiException so that the getters' existing error handling applies.
+    """
+
+    def __init__(self, resource: str):
+        super().__init__(status=503, reason="Informer cache not synced")
+        self.body = f"Informer cache for {resource} is not synced yet"
+
+
+def object_key(obj: dict) -> str:
+    """
+    Returns the `namespace/name` key of an object, or `name` for cluster-scoped objects.
+    """
+    if isinstance(obj, WorkloadRecord):
+        return obj.key
+    metadata = obj.get("metadata", {})
+    namespace = metadata.get("namespace")
+    if namespace:
+        return f"{namespace}/{metadata['name']}"
+    return metadata["name"]
+
+
+def namespace_index(obj: dict):
+    if isinstance(obj, WorkloadRecord):
+        return [obj.namespace] if obj.namespace else []
+    namespace = obj.get("metadata", {}).get("namespace")
+    return [namespace] if namespace else []
+
+
+def field_index(*path: str):
+    """
+    Returns an index function keyed by the value at a path such as ("spec", "clusterQueue").
+    """
+    def index(obj: dict):
+        value = obj
+        for part in path:
+            value = value.get(part) if isinstance(value, dict) else None
+        return [value] if value is not None else []
+    return index
+
+
+def labels_index(obj: dict):
+    """
+    Indexes an object by each of its `key=value` labels.
+    """
+    labels = obj.get("metadata", {}).get("labels") or {}
+    return [f"{key}={value}" for key, value in labels.items()]
+
+
+def taint_key(taint: dict) -> str:
+    """
+    Returns the `key=value:effect` form of a taint, as used by the taints index.
+    """
+    return f"{taint.get('key')}={taint.get('value') or ''}:{taint.get('effect')}"
+
+
+def taints_index(obj: dict):
+    """
+    Indexes a node by each of its taints.
+    """
+    return [taint_key(taint) for taint in (obj.get("spec") or {}).get("taints") or []]
+
+
+def workload_queue_index(workload: WorkloadRecord):
+    """
+    Indexes a workload by `namespace/queueName`, the LocalQueue it is submitted to.
+    """
+    if workload.queue_name and workload.namespace:
+        return [f"{workload.namespace}/{workload.queue_name}"]
+    return []
+
+
+def involved_object_index(obj: dict):
+    """
+    Indexes an event by the `namespace/name` of the object it is about.
+    """
+    key = involved_object_key(obj)
+    return [key] if key else []
+
+
+def label_index(label: str):
+    """
+    Returns an index function keyed by the value of the given label.
+    """
+    def index(obj: dict):
+        value = (obj.get("metadata", {}).get("labels") or {}).get(label)
+        return [value] if value is not None else []
+    return index
+
+
+class Store:
+    """
+    Thread-safe in-memory store of raw objects keyed by `namespace/name`,
+    with secondary indexes maintained on every change.
+    An index function maps an object to the list of index values it is reachable by.
+    Aggregators (objects with `replace`, `upsert` and `delete`) are notified of every
+    change while the store lock is held, so derived models follow the store's order.
+    `generation` counts the changes, so readers can tell whether anything changed since they last looked.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._items = {}
+        self.generation = 0
+        self._indexers = {}
+        self._indices = {}
+        self._aggregators = []
+        self.add_indexer("namespace", namespace_index)
+
+    def add_indexer(self, name: str, index_func):
+        with self._lock:
+            self._indexers[name] = index_func
+            self._indices[name] = {}
+            for key, obj in self._items.items():
+                self._index(name, key, obj)
+
+    def add_aggregator(self, aggregator):
+        with self._lock:
+            self._aggregators.append(aggregator)
+            aggregator.replace(list(self._items.values()))
+
+    def replace(self, objs):
+        with self._lock:
+            self.generation += 1
+            self._items = {}
+            self._indices = {name: {} for name in self._indexers}
+            for obj in objs:
+                self._add(object_key(obj), obj)
+            for aggregator in self._aggregators:
+                aggregator.replace(list(self._items.values()))
+
+    def upsert(self, obj: dict):
+        key = object_key(obj)
+        with self._lock:
+            self.generation += 1
+            previous = self._items.get(key)
+            # Updates keep the object's position, in the store and in the index buckets it stays in,
+            # so listings have a stable order
+            self._items[key] = obj
+            for name, index_func in self._indexers.items():
+                index = self._indices[name]
+                old_values = index_func(previous) if previous is not None else []
+                new_values = index_func(obj)
+                for value in old_values:
+                    if value not in new_values:
+                        self._unindex_value(index, value, key)
+                for value in new_values:
+                    if value not in old_values:
+                        index.setdefault(value, {})[key] = None
+            for aggregator in self._aggregators:
+                aggregator.upsert(obj)
+
+    def delete(self, obj: dict):
+        with self._lock:
+            self.generation += 1
+            self._remove(object_key(obj))
+            for aggregator in self._aggregators:
+                aggregator.delete(obj)
+
+    def get(self, key: str):
+        with self._lock:
+            return self._items.get(key)
+
+    def list(self, namespace: str = None):
+        if namespace is None:
+            with self._lock:
+                return list(self._items.values())
+        return self.by_index("namespace", namespace)
+
+    def by_index(self, name: str, value):
+        with self._lock:
+            return [self._items[key] for key in self._indices[name].get(value, ())]
+
+    def by_all_indexed(self, requirements):
+        """
+        Returns the objects reachable by every `(index name, value)` pair of `requirements`,
+        intersecting the smallest key sets first. With no requirements, all objects are returned.
+        """
+        with self._lock:
+            key_sets = sorted((self._indices[name].get(value, {}) for name, value in requirements), key=len)
+            if not key_sets:
+                return list(self._items.values())
+            smallest, others = key_sets[0], key_sets[1:]
+            return [self._items[key] for key in smallest if all(key in other for other in others)]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._items)
+
+    def _index(self, name, key, obj):
+        index = self._indices[name]
+        for value in self._indexers[name](obj):
+            # Dicts rather than sets keep index lookups in insertion order
+            index.setdefault(value, {})[key] = None
+
+    def _add(self, key, obj):
+        self._items[key] = obj
+        for name in self._indexers:
+            self._index(name, key, obj)
+
+    def _remove(self, key):
+        self._unindex(key)
+        self._items.pop(key, None)
+
+    def _unindex(self, key):
+        obj = self._items.get(key)
+        if obj is None:
+            return
+        for name, index_func in self._indexers.items():
+            index = self._indices[name]
+            for value in index_func(obj):
+                self._unindex_value(index, value, key)
+
+    @staticmethod
+    def _unindex_value(index: dict, value, key):
+        keys = index.get(value)
+        if keys is not None:
+            keys.pop(key, None)
+            if not keys:
+                del index[value]
+
+
+class Informer:
+    """
+    Keeps a Store in sync with the API server: LIST once, then WATCH from the
+    returned resourceVersion, and LIST again when the watch expires (410 Gone).
+    An informer seeded from a snapshot serves its objects right away, marked stale,
+    and resumes the WATCH from the snapshot's resourceVersion instead of LISTing.
+    """
+
+    def __init__(self, resource: str, list_func, transform=slim_metadata):
+        self.resource = resource
+        self.store = Store()
+        # Last resourceVersion the store is known to be up to date with
+        self.resource_version = None
+        self.stale = False
+        self._list_func = list_func
+        self._transform = transform
+        self._synced = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._response = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=f"informer-{self.resource}", daemon=True
+                )
+                self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        response = self._response
+        if response is not None:
+            # Unblocks the watch thread waiting for the next event. Shutting the socket down rather than
+            # closing the response, which would wait for the watch thread to release the reader first
+            sock = getattr(response.connection, "sock", None)
+            if sock is not None:
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+    def has_synced(self) -> bool:
+        return self._synced.is_set()
+
+    def wait_for_sync(self, timeout: float = SYNC_TIMEOUT_SECONDS) -> bool:
+        self.start()
+        return self._synced.wait(timeout)
+
+    def seed(self, objects, resource_version: str):
+        """
+        Fills the store with stored objects read at `resource_version`, before the informer is started.
+        """
+        # The transform turns the serialized objects back into what the store holds, such as workload records
+        self.store.replace([self._transform(obj) for obj in objects])
+        self.resource_version = resource_version
+        self.stale = True
+        self._synced.set()
+
+    def _run(self):
+        resource_version = self.resource_version
+        while not self._stop.is_set():
+            try:
+                if resource_version is None:
+                    resource_version = self._list()
+                self._watch_from(resource_version)
+            except client.ApiException as e:
+                resource_version = None
+                if e.status == 410:
+                    logging.info(f"Watch for {self.resource} expired, re-listing")
+                    continue
+                logging.error(f"Error watching {self.resource}: {e.status} {e.reason}")
+                self._stop.wait(ERROR_BACKOFF_SECONDS)
+            except Exception as e:
+                resource_version = None
+                if self._stop.is_set():
+                    # The watch was interrupted by stop()
+                    break
+                logging.error(f"Unexpected error in {self.resource} informer: {e}")
+                self._stop.wait(ERROR_BACKOFF_SECONDS)
+
+    def _list(self) -> str:
+        items, resource_version = list_objects(self.resource, self._list_func, self._transform)
+        self.store.replace(items)
+        self.resource_version = resource_version
+        self.stale = False
+        self._synced.set()
+        logging.info(f"Informer for {self.resource} synced {len(items)} objects")
+        return resource_version
+
+    def _watch_from(self, resource_version: str):
+        """
+        Streams WATCH events as raw JSON lines parsed with orjson, without building
+        kubernetes-client model objects, until the watch times out or expires.
+        """
+        while not self._stop.is_set():
+            response = self._list_func(
+                watch=True,
+                resource_version=resource_version,
+                timeout_seconds=RESUME_WATCH_TIMEOUT_SECONDS if self.stale else WATCH_TIMEOUT_SECONDS,
+                allow_watch_bookmarks=True,
+                _preload_content=False,
+                # Give up on a connection that went silent past the server-side timeout
+                _request_timeout=(CONNECT_TIMEOUT_SECONDS, WATCH_TIMEOUT_SECONDS + 30),
+            )
+            self._response = response
+            try:
+                for line in _iter_lines(response):
+                    event = orjson.loads(line)
+                    event_type = event["type"]
+                    obj = event["object"]
+                    if event_type == "ERROR":
+                        # 410 Gone when the resourceVersion is too old: the caller re-lists
+                        raise client.ApiException(
+                            status=obj.get("code"), reason=f"{obj.get('reason')}: {obj.get('message')}"
+                        )
+                    resource_version = obj.get("metadata", {}).get("resourceVersion", resource_version)
+                    if event_type in ("ADDED", "MODIFIED"):
+                        self.store.upsert(self._transform(obj))
+                    elif event_type == "DELETED":
+                        self.store.delete(obj)
+                    # Set after the change is stored: a snapshot taken meanwhile replays it rather than missing it
+                    self.resource_version = resource_version
+            finally:
+                self._response = None
+                response.close()
+                response.release_conn()
+            if self.stale and not self._stop.is_set():
+                self.stale = False
+                logging.info(f"Informer for {self.resource} caught up with the API server since its snapshot")
+
+
+def _iter_lines(response):
+    """
+    Yields the non-empty newline-delimited chunks of a streamed response as bytes.
+    """
+    buffer = bytearray()
+    for chunk in response.stream(amt=None, decode_content=False):
+        buffer.extend(chunk)
+        start = 0
+        newline = buffer.find(b"\n", start)
+        while newline != -1:
+            if newline > start:
+                yield bytes(buffer[start:newline])
+            start = newline + 1
+            newline = buffer.find(b"\n", start)
+        del buffer[:start]
+    if buffer.strip():
+        yield bytes(buffer)
+
+
+def list_objects(resource: str, list_func, transform=slim_metadata):
+    """
+    LISTs every object of a resource page by page, parsing the raw bytes with orjson instead of
+    deserializing into kubernetes-client models. Returns the transformed objects and the resourceVersion.
+    """
+    items = []
+    continue_token = None
+    duration = APISERVER_REQUEST_DURATION.labels(resource, "list")
+    while True:
+        kwargs = {"limit": LIST_PAGE_SIZE, "_preload_content": False,
+                  "_request_timeout": (CONNECT_TIMEOUT_SECONDS, LIST_TIMEOUT_SECONDS)}
+        if continue_token:
+            kwargs["_continue"] = continue_token
+        with duration.time():
+            response = orjson.loads(list_func(**kwargs).data)
+        items.extend(transform(item) for item in response.get("items", []))
+        metadata = response.get("metadata", {})
+        continue_token = metadata.get("continue")
+        if not continue_token:
+            break
+    return items, metadata.get("resourceVersion")
+
+
+def read_object(resource: str, read_func, *args):
+    """
+    GETs a single object, parsing the raw bytes with orjson. Returns None when it does not exist.
+    """
+    with APISERVER_REQUEST_DURATION.labels(resource, "get").time():
+        try:
+            response = read_func(*args, _preload_content=False,
+                                 _request_timeout=(CONNECT_TIMEOUT_SECONDS, LIST_TIMEOUT_SECONDS))
+        except client.ApiException as e:
+            if e.status == 404:
+                return None
+            raise
+    return orjson.loads(response.data)
+
+
+def get_workload(api: client.CustomObjectsApi, namespace: str, name: str):
+    """
+    GETs the full Workload object, of which the stores only keep a compact record, with slimmed down
+    metadata. Returns None when it does not exist.
+    """
+    workload = read_object("workloads", api.get_namespaced_custom_object,
+                           KUEUE_GROUP, KUEUE_VERSION, namespace, "workloads", name)
+    return slim_metadata(workload) if workload is not None else None
+
+
+def _custom_objects_lister(api: client.CustomObjectsApi, plural: str):
+    return functools.partial(api.list_cluster_custom_object, KUEUE_GROUP, KUEUE_VERSION, plural)
+
+
+def resource_listers(custom_api: client.CustomObjectsApi, core_api: client.CoreV1Api) -> dict:
+    """
+    Returns the LIST functions of the resources the views need, by resource.
+    """
+    return {
+        "clusterqueues": _custom_objects_lister(custom_api, "clusterqueues"),
+        "localqueues": _custom_objects_lister(custom_api, "localqueues"),
+        "workloads": _custom_objects_lister(custom_api, "workloads"),
+        "resourceflavors": _custom_objects_lister(custom_api, "resourceflavors"),
+        "pods": core_api.list_pod_for_all_namespaces,
+        "nodes": core_api.list_node,
+        "events": core_api.list_event_for_all_namespaces,
+    }
+
+
+def resource_getters(custom_api: client.CustomObjectsApi, core_api: client.CoreV1Api) -> dict:
+    """
+    Returns the GET functions of the resources the views need, by resource, taking the namespace
+    (ignored for cluster-scoped resources) and the name.
+    """
+    def namespaced_custom(plural):
+        return lambda namespace, name: read_object(plural, custom_api.get_namespaced_custom_object,
+                                                   KUEUE_GROUP, KUEUE_VERSION, namespace, plural, name)
+
+    def cluster_custom(plural):
+        return lambda namespace, name: read_object(plural, custom_api.get_cluster_custom_object,
+                                                   KUEUE_GROUP, KUEUE_VERSION, plural, name)
+
+    return {
+        "clusterqueues": cluster_custom("clusterqueues"),
+        "localqueues": namespaced_custom("localqueues"),
+        "workloads": namespaced_custom("workloads"),
+        "resourceflavors": cluster_custom("resourceflavors"),
+        "pods": lambda namespace, name: read_object("pods", core_api.read_namespaced_pod, name, namespace),
+        "nodes": lambda namespace, name: read_object("nodes", core_api.read_node, name),
+        "events": lambda namespace, name: read_object("events", core_api.read_namespaced_event, name, namespace),
+    }
+
+
+# Secondary indexes of the stores, by resource, so the detail views don't scan every object of the cluster
+STORE_INDEXERS = {
+    # Pods are attached to workloads through the job's controller-uid label
+    "pods": {"controller-uid": label_index("controller-uid")},
+    "workloads": {"queue": workload_queue_index},
+    "localqueues": {"clusterQueue": field_index("spec", "clusterQueue")},
+    # Flavors are matched to nodes by intersecting these instead of scanning every node
+    "nodes": {"labels": labels_index, "taints": taints_index},
+    "events": {"involvedObject": involved_object_index},
+}
+
+
+def configure_store(resource: str, store: Store) -> Store:
+    """
+    Adds the secondary indexes of a resource to a store.
+    """
+    for name, index_func in STORE_INDEXERS.get(resource, {}).items():
+        store.add_indexer(name, index_func)
+    return store
+
+
+class InformerCache:
+    """
+    Data source backed by shared informers for the Kueue CRDs and the core resources the views need.
+    Informers are started lazily on first access, or all at once with `start()`.
+
+    With a SnapshotFile, the informers of the resources it holds are seeded from it, and the stores
+    of its resources are written back to it every `snapshot_interval` seconds when they changed, and on stop.
+    """
+
+    samples_history = True
+    # Reads are served from the stores, without API requests
+    in_memory = True
+
+    def __init__(self, custom_api: client.CustomObjectsApi, core_api: client.CoreV1Api,
+                 snapshot=None, snapshot_interval: float = 60):
+        self._custom_api = custom_api
+        self._informers = {
+            # Core objects are slimmed down to the fields the views use when they are stored
+            resource: Informer(resource, list_func, TRANSFORMS.get(resource, slim_metadata))
+            for resource, list_func in resource_listers(custom_api, core_api).items()
+        }
+        for resource, informer in self._informers.items():
+            configure_store(resource, informer.store)
+        # Cohort membership, flavor back-references and quota aggregates of the ClusterQueues
+        self._topology = CohortTopology()
+        self._informers["clusterqueues"].store.add_aggregator(self._topology)
+        # Event changes pushed from the events WATCH to the workload event streams
+        self._event_feed = EventFeed()
+        self._informers["events"].store.add_aggregator(self._event_feed)
+
+        self._snapshot = snapshot
+        self._snapshot_interval = snapshot_interval
+        self._snapshot_thread = None
+        self._saved_generations = None
+        self._snapshot_lock = threading.Lock()
+        self._stopped = threading.Event()
+        if snapshot is not None:
+            for resource, (resource_version, objects) in snapshot.load().items():
+                self._informers[resource].seed(objects, resource_version)
+                logging.info(f"Seeded {resource} with {len(objects)} objects from snapshot {snapshot.path}")
+
+    def start(self):
+        for informer in self._informers.values():
+            informer.start()
+        if self._snapshot is not None and self._snapshot_thread is None:
+            self._snapshot_thread = threading.Thread(target=self._persist, name="informer-snapshot", daemon=True)
+            self._snapshot_thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        for informer in self._informers.values():
+            informer.stop()
+        if self._snapshot is not None:
+            self.save_snapshot()
+
+    def stale_resources(self) -> list:
+        """
+        Resources served from a snapshot whose informer has not caught up with the API server yet.
+        """
+        return [resource for resource, informer in self._informers.items() if informer.stale]
+
+    def save_snapshot(self):
+        """
+        Writes the synced stores of the snapshot's resources to it, unless nothing changed since the last write.
+        """
+        with self._snapshot_lock:
+            informers = [self._informers[resource] for resource in self._snapshot.resources
+                         if self._informers[resource].has_synced()]
+            generations = [(informer.resource, informer.store.generation) for informer in informers]
+            if generations == self._saved_generations:
+                return
+            sections = {}
+            for informer in informers:
+                # The resourceVersion is read first: objects changed meanwhile are replayed by the resumed WATCH
+                resource_version = informer.resource_version
+                sections[informer.resource] = (resource_version, informer.store.list())
+            try:
+                self._snapshot.save(sections)
+                self._saved_generations = generations
+            except OSError as e:
+                logging.error(f"Error writing snapshot {self._snapshot.path}: {e}")
+
+    def _persist(self):
+        while not self._stopped.wait(self._snapshot_interval):
+            self.save_snapshot()
+
+    def object_counts(self) -> dict:
+        return {
+            resource: len(informer.store)
+            for resource, informer in self._informers.items()
+            if informer.has_synced()
+        }
+
+    def informer(self, resource: str) -> Informer:
+        return self._informers[resource]
+
+    def store(self, resource: str) -> Store:
+        """
+        Returns the synced store for a resource, waiting for the initial LIST if needed.
+        """
+        informer = self._informers[resource]
+        if not informer.wait_for_sync():
+            raise CacheNotSyncedError(resource)
+        return informer.store
+
+    def topology(self) -> CohortTopology:
+        """
+        Returns the cohort topology once the ClusterQueues are synced.
+        """
+        self.store("clusterqueues")
+        return self._topology
+
+    def event_feed(self) -> EventFeed:
+        """
+        Returns the feed of event changes once the events are synced.
+        """
+        self.store("events")
+        return self._event_feed
+
+    def generation(self, resource: str) -> int:
+        """
+        Returns the change counter of a resource's store once it is synced.
+        """
+        return self.store(resource).generation
+
+    def fetch_workload(self, namespace: str, name: str):
+        """
+        Returns the full Workload object from the API server, or None when it does not exist.
+        """
+        return get_workload(self._custom_api, namespace, name)
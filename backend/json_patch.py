@@ -0,0 +1,88 @@
+import operator
+
+import orjson
+
+__all__ = ["make_patch"]
+
+
+def _escape(token) -> str:
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def _same(old, new) -> bool:
+    # `==` with the scalar types compared too, so that 1, 1.0 and True are not taken for one another
+    if type(old) is not type(new) or old != new:
+        return False
+    if isinstance(old, dict):
+        return all(_same(value, new[key]) for key, value in old.items())
+    if isinstance(old, list):
+        return all(_same(a, b) for a, b in zip(old, new))
+    return True
+
+
+def make_patch(old, new, path: str = "") -> list:
+    """
+    Computes an RFC 6902 JSON Patch turning `old` into `new`.
+    Lists are diffed positionally after trimming their common prefix and suffix,
+    so a single insertion or removal does not rewrite every following element.
+    Values of different types are never equal, even when `==` says so (1, 1.0 and True).
+    """
+    if old is new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key, value in old.items():
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                ops.extend(make_patch(old[key], value, child))
+        return ops
+    if isinstance(old, list) and isinstance(new, list):
+        return _make_list_patch(old, new, path)
+    if _same(old, new):
+        return []
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def _common_ends(old: list, new: list, same) -> tuple:
+    # Length of the common prefix, and where the common suffix starts in each list
+    start = 0
+    common = min(len(old), len(new))
+    while start < common and same(old[start], new[start]):
+        start += 1
+    old_end, new_end = len(old), len(new)
+    while old_end > start and new_end > start and same(old[old_end - 1], new[new_end - 1]):
+        old_end -= 1
+        new_end -= 1
+    return start, old_end, new_end
+
+
+def _serialize_same(old: list, new: list) -> bool:
+    try:
+        return orjson.dumps(old) == orjson.dumps(new)
+    except TypeError:
+        return False
+
+
+def _make_list_patch(old: list, new: list, path: str) -> list:
+    start, old_end, new_end = _common_ends(old, new, operator.eq)
+    # Plain `==` is fast but takes 1, 1.0 and True for one another: the trimmed elements must also serialize
+    # the same, otherwise the lists are trimmed again comparing types, element by element
+    if not (_serialize_same(old[:start], new[:start]) and _serialize_same(old[old_end:], new[new_end:])):
+        start, old_end, new_end = _common_ends(old, new, _same)
+
+    ops = []
+    overlap = min(old_end, new_end) - start
+    for offset in range(overlap):
+        index = start + offset
+        ops.extend(make_patch(old[index], new[index], f"{path}/{index}"))
+    # Remove from the end so the indexes of the remaining elements stay valid
+    for index in range(old_end - 1, start + overlap - 1, -1):
+        ops.append({"op": "remove", "path": f"{path}/{index}"})
+    for index in range(start + overlap, new_end):
+        ops.append({"op": "add", "path": f"{path}/{index}", "value": new[index]})
+    return ops
@@ -0,0 +1,72 @@
+import os
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Tuple
+
+__all__ = [
+    "run_blocking",
+    "gather_sources",
+    "fetch_concurrently",
+    "shutdown_executor",
+]
+
+# The kubernetes client is synchronous: its calls run on a bounded pool so they never block the event loop
+MAX_WORKERS = int(os.getenv("K8S_CLIENT_MAX_WORKERS", "16"))
+CALL_TIMEOUT_SECONDS = float(os.getenv("K8S_CLIENT_TIMEOUT_SECONDS", "30"))
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="k8s-client")
+# Getters fanning out their own reads already run on `_executor`: they wait on a separate pool so that
+# they cannot take every worker of `_executor` while waiting for reads queued behind them
+_fanout_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="k8s-fanout")
+
+
+async def run_blocking(func: Callable, *args, timeout: float = CALL_TIMEOUT_SECONDS, **kwargs):
+    """
+    Runs a blocking k8s_client call on the shared executor and awaits its result.
+    Raises asyncio.TimeoutError after `timeout` seconds; the worker thread finishes the call
+    in the background, the pool size bounds how many such calls can pile up.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+    return await asyncio.wait_for(future, timeout)
+
+
+async def gather_sources(sources: Dict[str, Callable]) -> Dict[str, Any]:
+    """
+    Runs independent blocking getters concurrently, so the latency is the slowest source rather than the sum.
+    A failing source is reported as `{"error": ...}` under its name without failing the others.
+    """
+    results = await asyncio.gather(
+        *(run_blocking(fetch) for fetch in sources.values()),
+        return_exceptions=True,
+    )
+    gathered = {}
+    for name, result in zip(sources, results):
+        if isinstance(result, asyncio.TimeoutError):
+            result = {"error": f"Timed out fetching {name}"}
+        elif isinstance(result, Exception):
+            result = {"error": f"Error fetching {name}: {result}"}
+        gathered[name] = result
+    return gathered
+
+
+def fetch_concurrently(sources: Dict[str, Callable], errors: Tuple[type, ...] = (Exception,)) -> Dict[str, Any]:
+    """
+    Blocking counterpart of `gather_sources` for getters running on a worker thread: runs the independent
+    reads of `sources` concurrently and returns their results by name. A source raising one of `errors`
+    yields the exception instead of failing the others.
+    """
+    futures = {name: _fanout_executor.submit(fetch) for name, fetch in sources.items()}
+    results = {}
+    for name, future in futures.items():
+        try:
+            results[name] = future.result()
+        except errors as e:
+            results[name] = e
+    return results
+
+
+def shutdown_executor():
+    _executor.shutdown(wait=False, cancel_futures=True)
+    _fanout_executor.shutdown(wait=False, cancel_futures=True)
@@ -1,16 +1,41 @@
 import os
-from kubernetes import client, config
+import urllib3
+from collections import OrderedDict
+from kubernetes import client
+from kubernetes.utils import parse_quantity
 import json
 import time
-import datetime
 import logging
+import threading
+from data_source import create_data_source
+from informer import taint_key
+from k8s_async import fetch_concurrently
+from metrics import timed_getter
+from ttl_cache import TTLCache
+from query import WORKLOAD_STATES, paginate, parse_fields, parse_label_selector, project
 
 logging.basicConfig(level=logging.INFO)
 
-# Load Kubernetes configuration for in-cluster access
-config.load_incluster_config()
-k8s_api = client.CustomObjectsApi()
-core_api = client.CoreV1Api()
+_data_source = None
+_data_source_lock = threading.Lock()
+
+def data_source():
+    """
+    Returns the data source the getters read from (see data_source.py), created on first use so that
+    importing this module neither loads the Kubernetes configuration nor needs a cluster.
+    """
+    global _data_source
+    with _data_source_lock:
+        if _data_source is None:
+            _data_source = create_data_source()
+        return _data_source
+
+# Short-lived memoization of the getters below, so identical views requested at the same time
+# share one computation. A TTL of 0 disables it.
+getter_cache = TTLCache(
+    ttl=float(os.getenv("K8S_CACHE_TTL_SECONDS", "2")),
+    max_entries=int(os.getenv("K8S_CACHE_MAX_ENTRIES", "256")),
+)
 
 __all__ = [
     "get_queues",
@@ -19,6 +44,8 @@ __all__ = [
     "get_cluster_queues",
     "get_workload_by_name",
     "get_events_by_workload_name",
+    "list_workload_events",
+    "event_summary",
     "get_resource_flavors",
     "get_resource_flavor_details",
     "get_admitted_workloads",
@@ -28,20 +55,20 @@ __all__ = [
     "get_cohort_details",
     "get_pods_for_workload",
     "get_nodes_for_flavor",
-    "remove_managed_fields"
+    "queue_samples",
+    "remove_managed_fields",
+    "data_source",
+    "getter_cache"
 ]
 
+@getter_cache.memoize
+@timed_getter
 def get_local_queues():
     """
     Retrieves local queues within a specific namespace.
     """
     try:
-        # Assuming 'localqueues' is the plural name for the local queue custom resources
-        local_queues = k8s_api.list_cluster_custom_object(
-            group="kueue.x-k8s.io",
-            version="v1beta1",
-            plural="localqueues"
-        )
+        local_queues = data_source().store("localqueues").list()
         return [
             {
                 "namespace": item["metadata"]["namespace"],
@@ -49,22 +76,20 @@ def get_local_queues():
                 "spec": item["spec"],
                 "status": item["status"],
             }
-            for item in local_queues.get("items", [])
+            for item in local_queues
         ]
     except client.ApiException as e:
         print(f"Error fetching local queues: {e}")
         return []
 
+@getter_cache.memoize
+@timed_getter
 def get_cluster_queues():
     """
     Retrieves cluster queues and their flavors across the cluster.
     """
     try:
-        cluster_queues = k8s_api.list_cluster_custom_object(
-            group="kueue.x-k8s.io",
-            version="v1beta1",
-            plural="clusterqueues"
-        )
+        cluster_queues = data_source().store("clusterqueues").list()
         return [
             {
                 "name": queue["metadata"]["name"],
@@ -79,110 +104,155 @@ def get_cluster_queues():
                     for flavor in resource_group.get("flavors", [])
                 ]
             }
-            for queue in cluster_queues.get("items", [])
+            for queue in cluster_queues
         ]
     except client.ApiException as e:
         print(f"Error fetching cluster queues: {e}")
         return []
 
 
+@getter_cache.memoize
+@timed_getter
 def get_queues():
     try:
-        queues = k8s_api.list_cluster_custom_object(
-            group="kueue.x-k8s.io",
-            version="v1beta1",
-            plural="localqueues"
-        )
-        return remove_managed_fields(queues)
+        # Objects in the informer stores are already stripped of managedFields
+        return {"items": data_source().store("localqueues").list()}
     except client.ApiException as e:
         print(f"Error fetching queues: {e.status} {e.reason} - {e.body}")
         return {"error": e.body}
 
-def get_workloads():
-    """
-    Retrieves all workloads along with their attached pods based on job-uid.
+def _filter_workloads(workloads, queue_name: str = None, state: str = None, label_selector: str = None):
+    """
+    Applies the queue name, state (pending/admitted/finished) and label selector filters of workload listings
+    to the stored workload records. Raises ValueError on an invalid state or label selector.
+    """
+    if queue_name:
+        workloads = [w for w in workloads if w.queue_name == queue_name]
+    if state:
+        if state not in WORKLOAD_STATES:
+            raise ValueError(f"Invalid workload state {state}, expected one of {', '.join(WORKLOAD_STATES)}")
+        workloads = [w for w in workloads if w.state == state]
+    if label_selector:
+        matches = parse_label_selector(label_selector)
+        workloads = [w for w in workloads if matches(w.labels)]
+    return workloads
+
+
+@getter_cache.memoize
+@timed_getter
+def get_workloads(namespace: str = None, queue_name: str = None, state: str = None, label_selector: str = None,
+                  limit: int = None, continue_token: str = None, fields: str = None):
+    """
+    Retrieves workloads along with their attached pods based on job-uid.
+    Without arguments all workloads are returned; otherwise they are filtered by namespace,
+    queue name, state and label selector, paginated with `limit`/`continue_token`
+    (the next token is returned in `metadata.continue`) and projected on the
+    comma-separated dotted paths of `fields`.
+    Workloads only carry the fields of their stored WorkloadRecord (see `WorkloadRecord.to_dict`);
+    `get_workload_by_name` returns the full object.
+    Raises ValueError on invalid filters.
     """
     try:
-        # Retrieve all workloads from the entire cluster
-        workloads = k8s_api.list_cluster_custom_object(
-            group="kueue.x-k8s.io",
-            version="v1beta1",
-            plural="workloads"
-        )
-        workloads = remove_managed_fields(workloads)
+        store = data_source().store("workloads")
+        if namespace and queue_name:
+            workloads = _filter_workloads(store.by_index("queue", f"{namespace}/{queue_name}"), None, state, label_selector)
+        else:
+            workloads = _filter_workloads(store.list(namespace), queue_name, state, label_selector)
+        workloads, next_token = paginate(workloads, limit, continue_token)
+        paths = parse_fields(fields) if fields else None
+        # Pods are only looked up when the projection keeps them
+        attach_pods = paths is None or any(path[0] == "pods" for path in paths)
+        pods_store = data_source().store("pods") if attach_pods else None
 
         # Attach the corresponding pods to each workload
+        items = []
         workloads_by_uid = {}
-        for workload in workloads['items']:
-            namespace = workload['metadata']['namespace']
-            job_uid = workload['metadata']['labels'].get("kueue.x-k8s.io/job-uid")
-            
-            # Retrieve pods in the specific namespace of the workload
-            pods = remove_managed_fields(core_api.list_namespaced_pod(namespace=namespace))
-
-            # Map pods by their `controller-uid` label
-            workload_pods = []
-            for pod in pods.items:
-                controller_uid = pod.metadata.labels.get("controller-uid")
-                if controller_uid == job_uid:
-                    pod_entry = {
-                        "name": pod.metadata.name,
-                        "status": recursive_to_dict(pod.status) if pod.status else {}
-                    }
-                    workload_pods.append(pod_entry)
-
-            # Attach pods to the workload
-            workload['pods'] = workload_pods
-
-            # Add preemption details if available
-            preempted = workload.get('status', {}).get('preempted', False)
-            preemption_reason = workload.get('status', {}).get('preemptionReason', 'None')
-
-            workload['preemption'] = {
-                'preempted': preempted,
-                'reason': preemption_reason
+        for workload in workloads:
+            job_uid = workload.job_uid
+
+            # Look up the pods through the `controller-uid` index instead of scanning the namespace;
+            # their status is already slimmed down by the pods informer transform
+            workload_pods = [
+                {
+                    "name": pod['metadata']['name'],
+                    "status": pod.get('status', {})
+                }
+                for pod in pods_store.by_index("controller-uid", job_uid)
+            ] if job_uid and attach_pods else []
+
+            # The stored record holds the fields the views show, in the shape of the Workload object
+            item = {
+                **workload.to_dict(),
+                'pods': workload_pods,
+                'preemption': {
+                    'preempted': workload.preempted or False,
+                    'reason': workload.preemption_reason or 'None'
+                }
             }
+            items.append(project(item, paths) if paths else item)
 
             # Add to workloads_by_uid map
-            workload_name = workload['metadata']['name']
-            workload_uid = workload['metadata']['uid']
-            workloads_by_uid[workload_uid] = workload_name
+            workloads_by_uid[workload.uid] = workload.name
 
         # Return workloads and workloads_by_uid as part of the response
-        return {
-            "items": workloads['items'],
+        response = {
+            "items": items,
             "workloads_by_uid": workloads_by_uid
         }
+        if limit is not None or continue_token is not None:
+            response["metadata"] = {"continue": next_token}
+        return response
     except client.ApiException as e:
         print(f"Error fetching workloads: {e.status} {e.reason} - {e.body}")
         return {"error": e.body}
 
 
 
-def slim_down_pod_status(pod_status):
-    return {
-        "phase": pod_status.get("phase"),
-        "conditions": pod_status.get("conditions"),
-        "containerStatuses": [
-            {
-                "name": c["name"],
-                "state": c["state"],
-                "ready": c["ready"]
-            }
-            for c in pod_status.get("containerStatuses", [])
-        ]
-    }
+# Full Workload objects fetched for the detail view by `(namespace/name, resourceVersion)`, reused until
+# the stored record shows the workload changed
+FULL_WORKLOAD_CACHE_SIZE = int(os.getenv("K8S_FULL_WORKLOAD_CACHE_SIZE", "64"))
+_full_workloads = OrderedDict()
+_full_workloads_lock = threading.Lock()
+
+
+def _fetch_full_workload(record):
+    """
+    Returns the full object of a stored workload record, GET from the data source only when its
+    resourceVersion was not fetched yet, or None when it does not exist anymore.
+    """
+    key = (record.key, record.resource_version)
+    with _full_workloads_lock:
+        workload = _full_workloads.get(key)
+        if workload is not None:
+            _full_workloads.move_to_end(key)
+            return workload
+    workload = data_source().fetch_workload(record.namespace, record.name)
+    if workload is not None:
+        with _full_workloads_lock:
+            _full_workloads[key] = workload
+            while len(_full_workloads) > FULL_WORKLOAD_CACHE_SIZE:
+                _full_workloads.popitem(last=False)
+    return workload
+
 
+@getter_cache.memoize
+@timed_getter
 def get_workload_by_name(namespace: str, workload_name: str):
     try:
-        # Fetch the workload details
-        workload = k8s_api.get_namespaced_custom_object(
-            group="kueue.x-k8s.io",
-            version="v1beta1",
-            namespace=namespace,
-            plural="workloads",
-            name=workload_name
-        )
+        record = data_source().store("workloads").get(f"{namespace}/{workload_name}")
+        if record is None:
+            return None
+        # The store only keeps a compact record: the detail view gets the full object from the API server,
+        # or the record's fields while it cannot be reached
+        try:
+            workload = _fetch_full_workload(record)
+        except (client.ApiException, urllib3.exceptions.HTTPError) as e:
+            print(f"Error fetching the full workload {workload_name}, using the cached fields: {e}")
+            workload = record.to_dict()
+        if workload is None:
+            return None
+        # Copy the cached object instead of mutating it
+        workload = dict(workload)
 
         # Add preemption details if available
         preempted = workload.get('status', {}).get('preempted', False)
@@ -196,13 +266,7 @@ def get_workload_by_name(namespace: str, workload_name: str):
         local_queue_name = workload.get('spec', {}).get('queueName')
         if local_queue_name:
             # Fetch the local queue associated with the workload
-            local_queue = k8s_api.get_namespaced_custom_object(
-                group="kueue.x-k8s.io",
-                version="v1beta1",
-                namespace=namespace,
-                plural="localqueues",
-                name=local_queue_name
-            )
+            local_queue = data_source().store("localqueues").get(f"{namespace}/{local_queue_name}") or {}
             # Retrieve the targeted cluster queue name from the local queue's spec
             cluster_queue_name = local_queue.get('spec', {}).get('clusterQueue')
             workload['clusterQueueName'] = cluster_queue_name if cluster_queue_name else "Unknown"
@@ -213,25 +277,33 @@ def get_workload_by_name(namespace: str, workload_name: str):
         return None
 
 
+def event_summary(event: dict) -> dict:
+    """
+    The fields of an event shown on the workload page.
+    """
+    return {
+        "name": event["metadata"]["name"],
+        "reason": event.get("reason"),
+        "message": event.get("message"),
+        "timestamp": event.get("lastTimestamp"),
+        "type": event.get("type"),
+    }
+
+def list_workload_events(namespace: str, workload_name: str):
+    """
+    Lists the events about a workload from the involvedObject index, bypassing the getter cache.
+    """
+    events = data_source().store("events").by_index("involvedObject", f"{namespace}/{workload_name}")
+    return [event_summary(event) for event in events]
+
+@getter_cache.memoize
+@timed_getter
 def get_events_by_workload_name(namespace: str, workload_name: str):
     """
     Retrieves events related to the given workload.
     """
     try:
-        events = core_api.list_namespaced_event(
-            namespace=namespace,
-            field_selector=f"involvedObject.name={workload_name}"
-        )
-        return [
-            {
-                "name": event.metadata.name,
-                "reason": event.reason,
-                "message": event.message,
-                "timestamp": event.last_timestamp.isoformat() if event.last_timestamp else None,
-                "type": event.type,
-            }
-            for event in events.items
-        ]
+        return list_workload_events(namespace, workload_name)
     except client.ApiException as e:
         print(f"Error fetching events for workload {workload_name}: {e}")
         return []
@@ -249,106 +321,88 @@ def get_queue_status(namespace: str = "default"):
         "workloads": get_workloads(namespace)
     }
 
+@getter_cache.memoize
+@timed_getter
 def get_resource_flavors():
     """
     Retrieves all resource flavors.
     """
     try:
-        flavors = k8s_api.list_cluster_custom_object(
-            group="kueue.x-k8s.io",
-            version="v1beta1",
-            plural="resourceflavors"
-        )
+        flavors = data_source().store("resourceflavors").list()
         return [
             {
                 "name": item["metadata"]["name"],
                 "details": item.get("spec", {}),
             }
-            for item in flavors.get("items", [])
+            for item in flavors
         ]
     except client.ApiException as e:
         print(f"Error fetching resource flavors: {e}")
         return []
 
-from kubernetes import client, config
+def _fetch_sources(sources: dict) -> dict:
+    """
+    Runs the independent reads of a composite getter and returns their results by name, a read failing
+    with an ApiException yielding the exception. Reads of in-memory sources are run in turn; those of
+    sources going to the API server (live) run concurrently, so their round trips overlap.
+    """
+    if not data_source().in_memory:
+        return fetch_concurrently(sources, errors=(client.ApiException,))
+    results = {}
+    for name, fetch in sources.items():
+        try:
+            results[name] = fetch()
+        except client.ApiException as e:
+            results[name] = e
+    return results
 
-# Load Kubernetes configuration for in-cluster access
-config.load_incluster_config()
-k8s_api = client.CustomObjectsApi()
 
+@getter_cache.memoize
+@timed_getter
 def get_resource_flavor_details(flavor_name: str):
     """
     Retrieves details of a specific resource flavor, including queues using it.
     """
-    try:
-        # Fetch the specified resource flavor details
-        this_flavor = k8s_api.get_cluster_custom_object(
-            group="kueue.x-k8s.io",
-            version="v1beta1",
-            plural="resourceflavors",
-            name=flavor_name
-        )
-        
-        # List all cluster queues to find which ones use this flavor
-        cluster_queues = k8s_api.list_cluster_custom_object(
-            group="kueue.x-k8s.io",
-            version="v1beta1",
-            plural="clusterqueues"
-        )
-
-        queues_using_flavor = []
-
-        # Iterate through each cluster queue to see if it uses the specified flavor
-        for queue in cluster_queues.get("items", []):
-            queue_name = queue.get("metadata", {}).get("name", "Unnamed Queue")
-            resource_groups = queue.get("spec", {}).get("resourceGroups", [])
-            
-            for resource_group in resource_groups:
-                for flavor in resource_group.get("flavors", []):
-                    if flavor.get("name") == flavor_name:
-                        # Collect resource and quota information for this queue
-                        quota_info = [
-                            {
-                                "resource": resource.get("name", "Unknown Resource"),
-                                "nominalQuota": resource.get("nominalQuota", "N/A")
-                            }
-                            for resource in flavor.get("resources", [])
-                        ]
-                        queues_using_flavor.append({
-                            "queueName": queue_name,
-                            "quota": quota_info
-                        })
-                        break  # Stop searching once the flavor is found in this queue
-
-        matching_nodes = get_nodes_for_flavor(flavor_name)
+    results = _fetch_sources({
+        "flavor": lambda: data_source().store("resourceflavors").get(flavor_name),
+        # The cluster queues using the flavor, with their quotas, come precomputed from the topology
+        "usage": lambda: data_source().topology().flavor(flavor_name),
+        "nodes": lambda: get_nodes_for_flavor(flavor_name),
+    })
 
-        return {
-            "name": flavor_name,
-            "details": this_flavor.get("spec", {}),
-            "queues": queues_using_flavor,
-            "nodes": matching_nodes
-        }
-
-    except client.ApiException as e:
-        print(f"Error fetching resource flavor details for {flavor_name}: {e}")
+    this_flavor = results["flavor"]
+    if isinstance(this_flavor, client.ApiException):
+        print(f"Error fetching resource flavor details for {flavor_name}: {this_flavor}")
+        return None
+    if this_flavor is None:
         return None
 
+    usage = results["usage"]
+    if isinstance(usage, client.ApiException):
+        print(f"Error fetching queues using resource flavor {flavor_name}: {usage}")
+        usage = None
+    usage = usage or {"queues": [], "resources": []}
 
+    return {
+        "name": flavor_name,
+        "details": this_flavor.get("spec", {}),
+        "queues": usage["queues"],
+        "resources": usage["resources"],
+        "nodes": results["nodes"]
+    }
 
 
+@getter_cache.memoize
+@timed_getter
 def get_local_queue_details(namespace_param: str, queue_name: str):
     """
     Retrieves detailed information about a specific LocalQueue.
     """
     try:
         # Fetch the LocalQueue object in the specified namespace
-        local_queue = k8s_api.get_namespaced_custom_object(
-            group="kueue.x-k8s.io",
-            version="v1beta1",
-            namespace=namespace_param,
-            plural="localqueues",
-            name=queue_name
-        )
+        local_queue = data_source().store("localqueues").get(f"{namespace_param}/{queue_name}")
+        if local_queue is None:
+            return {"error": f"LocalQueue {queue_name} not found in namespace {namespace_param}"}
         return {
             "metadata": {
                 "name": local_queue["metadata"]["name"],
@@ -364,57 +418,58 @@ def get_local_queue_details(namespace_param: str, queue_name: str):
         return {"error": f"Could not retrieve details for LocalQueue {queue_name} in namespace {namespace_param}"}
 
 
-def get_admitted_workloads(namespace: str, queue_name: str):
+@getter_cache.memoize
+@timed_getter
+def get_admitted_workloads(namespace: str, queue_name: str, state: str = None, label_selector: str = None,
+                           limit: int = None, continue_token: str = None, fields: str = None):
     """
     Retrieves all workloads admitted into the specified LocalQueue.
+    Accepts the same filters, pagination and projection as `get_workloads`; when paginated
+    the result is `{"items": [...], "metadata": {"continue": ...}}` instead of a list.
+    Raises ValueError on invalid filters.
     """
     try:
-        # List all workloads in the namespace
-        workloads = k8s_api.list_custom_object(
-            group="kueue.x-k8s.io",
-            version="v1beta1",
-            namespace=namespace,
-            plural="workloads"
-        )
-
-        # Filter workloads that are admitted to the specified queue
+        # Look up the workloads submitted to the queue through the `namespace/queueName` index
+        workloads = data_source().store("workloads").by_index("queue", f"{namespace}/{queue_name}")
+        workloads = _filter_workloads(workloads, state=state, label_selector=label_selector)
+        workloads, next_token = paginate(workloads, limit, continue_token)
+        paths = parse_fields(fields) if fields else None
+
         admitted_workloads = [
             {
                 "metadata": {
-                    "name": workload["metadata"]["name"],
-                    "namespace": workload["metadata"]["namespace"],
+                    "name": workload.name,
+                    "namespace": workload.namespace,
                 },
-                "status": workload.get("status", {}),
+                "status": workload.status_dict(),
             }
-            for workload in workloads.get("items", [])
-            if workload.get("spec", {}).get("queueName") == queue_name
+            for workload in workloads
         ]
+        if paths:
+            admitted_workloads = [project(workload, paths) for workload in admitted_workloads]
 
+        if limit is not None or continue_token is not None:
+            return {"items": admitted_workloads, "metadata": {"continue": next_token}}
         return admitted_workloads
     except client.ApiException as e:
         print(f"Error fetching admitted workloads for LocalQueue {queue_name}: {e}")
         return {"error": f"Could not retrieve admitted workloads for LocalQueue {queue_name}"}
 
 
+@getter_cache.memoize
+@timed_getter
 def get_cluster_queue_details(cluster_queue_name: str):
     """
     Retrieves details of a specific cluster queue, including the local queues using it and their quotas.
     """
     try:
         # Fetch the specific cluster queue
-        cluster_queue = k8s_api.get_cluster_custom_object(
-            group="kueue.x-k8s.io",
-            version="v1beta1",
-            plural="clusterqueues",
-            name=cluster_queue_name
-        )
-
-        # Retrieve all local queues and filter based on clusterQueue name
-        local_queues = k8s_api.list_cluster_custom_object(
-            group="kueue.x-k8s.io",
-            version="v1beta1",
-            plural="localqueues"
-        )
+        cluster_queue = data_source().store("clusterqueues").get(cluster_queue_name)
+        if cluster_queue is None:
+            return None
+
+        # Retrieve the local queues pointing at this cluster queue from the clusterQueue index
+        local_queues = data_source().store("localqueues").by_index("clusterQueue", cluster_queue_name)
 
         # Gather names of local queues that use this cluster queue
         queues_using_cluster_queue = [
@@ -424,8 +479,7 @@ def get_cluster_queue_details(cluster_queue_name: str):
                 "reservation": queue.get("status", {}).get("flavorsReservation"),
                 "usage": queue.get("status", {}).get("flavorUsage")
             }
-            for queue in local_queues.get("items", [])
-            if queue.get("spec", {}).get("clusterQueue") == cluster_queue_name
+            for queue in local_queues
         ]
 
         # Attach the `queues` information to the returned data
@@ -441,60 +495,51 @@ def get_cluster_queue_details(cluster_queue_name: str):
 
 
 
+@getter_cache.memoize
+@timed_getter
 def get_cohorts():
     """
     Retrieves a list of unique cohorts from all cluster queues, including the cluster queues participating in each cohort.
     """
     try:
-        # Retrieve all cluster queues
-        cluster_queues = k8s_api.list_cluster_custom_object(
-            group="kueue.x-k8s.io",
-            version="v1beta1",
-            plural="clusterqueues"
-        )
-
-        # Organize cluster queues by cohort
-        cohorts = {}
-        for queue in cluster_queues.get("items", []):
-            cohort_name = queue.get("spec", {}).get("cohort")
-            if cohort_name:
-                if cohort_name not in cohorts:
-                    cohorts[cohort_name] = {"name": cohort_name, "clusterQueues": []}
-                cohorts[cohort_name]["clusterQueues"].append({"name": queue["metadata"]["name"]})
-
-        # Convert the dictionary to a list
-        return list(cohorts.values())
+        # Cohort membership is maintained by the topology as cluster queues change
+        return data_source().topology().cohorts()
 
     except client.ApiException as e:
         print(f"Error fetching cohorts: {e}")
         return []
 
 
+@getter_cache.memoize
+@timed_getter
 def get_cohort_details(cohort_name: str):
     """
     Retrieves details for a specific cohort, including all cluster queues in that cohort.
     """
     try:
-        cluster_queues = k8s_api.list_cluster_custom_object(
-            group="kueue.x-k8s.io",
-            version="v1beta1",
-            plural="clusterqueues"
-        )
-
-        # Filter cluster queues that are part of the specified cohort
-        cohort_cluster_queues = [
-            {
-                "name": queue["metadata"]["name"],
-                "spec": queue.get("spec", {}),
-                "status": queue.get("status", {})
-            }
-            for queue in cluster_queues.get("items", [])
-            if queue.get("spec", {}).get("cohort") == cohort_name
-        ]
+        cohort = data_source().topology().cohort(cohort_name)
+        if cohort is None:
+            return {"cohort": cohort_name, "clusterQueues": []}
+
+        # Look up the members of the cohort by name instead of filtering every cluster queue
+        cluster_queues = data_source().store("clusterqueues")
+        cohort_cluster_queues = []
+        for name in cohort["clusterQueues"]:
+            queue = cluster_queues.get(name)
+            if queue is not None:
+                cohort_cluster_queues.append({
+                    "name": name,
+                    "spec": queue.get("spec", {}),
+                    "status": queue.get("status", {})
+                })
 
         return {
             "cohort": cohort_name,
-            "clusterQueues": cohort_cluster_queues
+            "clusterQueues": cohort_cluster_queues,
+            # Quotas, usage and workload counts summed over the cohort's cluster queues
+            "pendingWorkloads": cohort["pendingWorkloads"],
+            "admittedWorkloads": cohort["admittedWorkloads"],
+            "resources": cohort["resources"]
         }
 
     except client.ApiException as e:
@@ -503,21 +548,20 @@ def get_cohort_details(cohort_name: str):
 
 
 
+@getter_cache.memoize
+@timed_getter
 def get_pods_for_workload(job_uid: str):
     """
     Retrieves pods with the label `controller: {job_uid}`.
     """
     try:
-        pods = core_api.list_namespaced_pod(
-            namespace=namespace,
-            label_selector=f"controller-uid={job_uid}"
-        )
+        pods = data_source().store("pods").by_index("controller-uid", job_uid)
         return [
             {
-                "name": pod.metadata.name,
-                "status": pod.status.phase
+                "name": pod["metadata"]["name"],
+                "status": pod.get("status", {}).get("phase")
             }
-            for pod in pods.items
+            for pod in pods
         ]
     except client.ApiException as e:
         print(f"Error fetching pods for job_uid {job_uid}: {e}")
@@ -526,54 +570,33 @@ def get_pods_for_workload(job_uid: str):
 
 
 
+@getter_cache.memoize
+@timed_getter
 def get_nodes_for_flavor(flavor_name: str):
     """
     Retrieves nodes that match the given ResourceFlavor.
     """
     try:
         # Fetch the specified ResourceFlavor
-        flavor = k8s_api.get_cluster_custom_object(
-            group="kueue.x-k8s.io",
-            version="v1beta1",
-            plural="resourceflavors",
-            name=flavor_name
-        )
+        flavor = data_source().store("resourceflavors").get(flavor_name)
+        if flavor is None:
+            return []
 
         # Extract the nodeLabels and nodeTaints criteria from the flavor spec
         node_labels = flavor.get("spec", {}).get("nodeLabels", {})
         node_taints = flavor.get("spec", {}).get("nodeTaints", [])
 
-        # List all nodes in the cluster
-        all_nodes = core_api.list_node()
-        
-        # Filter nodes based on labels and taints
-        matching_nodes = []
-        for node in all_nodes.items:
-            # Check if node has required labels
-            node_labels_match = all(
-                node.metadata.labels.get(key) == value
-                for key, value in node_labels.items()
-            )
-            
-            # Check if node has required taints
-            node_taints_match = True
-            if node_taints:
-                node_taints_match = all(
-                    any(
-                        node_taint.key == taint["key"] and
-                        node_taint.value == taint["value"] and
-                        node_taint.effect == taint["effect"]
-                        for node_taint in node.spec.taints or []
-                    )
-                    for taint in node_taints
-                )
-            
-            if node_labels_match and node_taints_match:
-                matching_nodes.append({
-                    "name": node.metadata.name,
-                    "labels": node.metadata.labels,
-                    "taints": [taint.to_dict() for taint in (node.spec.taints or [])]
-                })
+        # Nodes carrying every required label and taint, intersected from the node indexes
+        requirements = [("labels", f"{key}={value}") for key, value in node_labels.items()]
+        requirements += [("taints", taint_key(taint)) for taint in node_taints]
+        matching_nodes = [
+            {
+                "name": node["metadata"]["name"],
+                "labels": node["metadata"].get("labels", {}),
+                "taints": node.get("spec", {}).get("taints", []),
+            }
+            for node in data_source().store("nodes").by_all_indexed(requirements)
+        ]
 
         return matching_nodes
 
@@ -582,34 +605,62 @@ def get_nodes_for_flavor(flavor_name: str):
         return []
 
 
+def _usage_samples(metrics: dict, flavors_usage):
+    # `usage/<flavor>/<resource>` of the flavorsUsage (ClusterQueue) or flavorUsage (LocalQueue) status
+    for flavor in flavors_usage or []:
+        for resource in flavor.get("resources", []):
+            try:
+                metrics[f"usage/{flavor.get('name')}/{resource.get('name')}"] = float(parse_quantity(resource.get("total", 0)))
+            except ValueError:
+                pass
+
+@timed_getter
+def queue_samples():
+    """
+    Returns the current workload counts and usage of every ClusterQueue, LocalQueue, cohort and resource
+    flavor as `{(kind, name): {metric: value}}`, recorded in the queue history.
+    """
+    samples = {}
+    for queue in data_source().store("clusterqueues").list():
+        status = queue.get("status", {})
+        metrics = {field: status.get(field, 0) for field in ("pendingWorkloads", "admittedWorkloads", "reservingWorkloads")}
+        _usage_samples(metrics, status.get("flavorsUsage"))
+        samples[("cluster-queue", queue["metadata"]["name"])] = metrics
+    for queue in data_source().store("localqueues").list():
+        status = queue.get("status", {})
+        metrics = {field: status.get(field, 0) for field in ("pendingWorkloads", "admittedWorkloads", "reservingWorkloads")}
+        _usage_samples(metrics, status.get("flavorUsage"))
+        samples[("local-queue", f"{queue['metadata']['namespace']}/{queue['metadata']['name']}")] = metrics
+
+    # Cohort and flavor aggregates are maintained by the topology
+    topology = data_source().topology()
+    for cohort in topology.cohorts():
+        view = topology.cohort(cohort["name"]) or {}
+        metrics = {field: view.get(field, 0) for field in ("pendingWorkloads", "admittedWorkloads")}
+        for entry in view.get("resources", []):
+            metrics[f"usage/{entry['flavor']}/{entry['resource']}"] = entry["usage"]
+            metrics[f"borrowed/{entry['flavor']}/{entry['resource']}"] = entry["borrowed"]
+        samples[("cohort", cohort["name"])] = metrics
+    for flavor in data_source().store("resourceflavors").list():
+        name = flavor["metadata"]["name"]
+        view = topology.flavor(name) or {}
+        samples[("resource-flavor", name)] = {
+            f"usage/{entry['resource']}": entry["usage"] for entry in view.get("resources", [])
+        }
+    return samples
+
 def remove_managed_fields(obj):
     """
-    Recursively removes 'managedFields' from dictionaries and lists.
+    Recursively removes 'managedFields' from dictionaries and lists, in place and in a single pass.
+    Objects served from the informer stores are already stripped by `slim_metadata` when they are stored.
     """
     if isinstance(obj, dict):
         obj.pop("managedFields", None)  # Remove 'managedFields' if present
-        for key, value in obj.items():
-            obj[key] = remove_managed_fields(value)  # Recursively apply to nested items
+        for value in obj.values():
+            if isinstance(value, (dict, list)):
+                remove_managed_fields(value)  # Recursively apply to nested items
     elif isinstance(obj, list):
-        obj = [remove_managed_fields(item) for item in obj]  # Recursively apply to each item in list
+        for item in obj:
+            if isinstance(item, (dict, list)):
+                remove_managed_fields(item)  # Recursively apply to each item in list
     return obj
-
-
-def recursive_to_dict(obj):
-    """
-    Recursively converts Kubernetes API objects to dictionaries.
-    Also handles datetime serialization to ISO format.
-    """
-    if isinstance(obj, datetime.datetime):
-        return obj.isoformat()
-    elif hasattr(obj, "to_dict"):
-        obj_dict = obj.to_dict()
-        # Add debug log to see the structure
-        logging.debug(f"Converting object with to_dict: {type(obj)}")
-        return recursive_to_dict(obj_dict)
-    elif isinstance(obj, list):
-        return [recursive_to_dict(i) for i in obj]
-    elif isinstance(obj, dict):
-        return {k: recursive_to_dict(v) for k, v in obj.items()}
-    else:
-        return obj
@@ -1,12 +1,27 @@
 import os
 import asyncio
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+import time
+import orjson
+from fastapi import FastAPI, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, Response
+from kubernetes import client
 from pydantic import BaseModel
-from typing import Optional, Dict, Any, List, Callable
+from typing import Optional, Dict, Any, List, Callable, Mapping, NamedTuple, Sequence, Tuple
+from urllib.parse import parse_qsl, urlencode
 from k8s_client import *
+from json_patch import make_patch
+from etag import ETagCache, content_etag, etag_matches, generation_etag
+from history import History
+from k8s_async import run_blocking, gather_sources, shutdown_executor
+from query import WORKLOAD_STATES, parse_fields, parse_label_selector
+from serialization import FastJSONResponse, dumps, dumps_text
+from metrics import (BROADCAST_DURATION, COALESCED_MESSAGES, PAYLOAD_SIZE, SEND_FAILURES, WEBSOCKET_SUBSCRIBERS,
+                     ObjectCountCollector, monitor_event_loop_lag)
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
-app = FastAPI(title="Kueue Visualization API", version="1.0")
+app = FastAPI(title="Kueue Visualization API", version="1.0", default_response_class=FastJSONResponse)
 frontend_url = os.getenv("FRONTEND_URL", "http://localhost:3000")  # Default to localhost for local testing
 
 # Allow CORS for the frontend origin
@@ -16,194 +31,946 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Stale-Resources"],
 )
 
+# Compress REST responses above a size threshold; WebSocket frames use permessage-deflate, negotiated by uvicorn
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=int(os.getenv("GZIP_MINIMUM_SIZE", "1024")),
+    compresslevel=int(os.getenv("GZIP_COMPRESS_LEVEL", "6")),
+)
+
+# Object counts of the data source, read at scrape time
+REGISTRY.register(ObjectCountCollector(data_source))
+
+@app.on_event("startup")
+async def start_data_source():
+    """
+    Creates the data source off the event loop and starts it, so the informer caches are warm before the first request.
+    """
+    source = await run_blocking(data_source)
+    source.start()
+    app.state.lag_monitor = asyncio.create_task(monitor_event_loop_lag())
+    app.state.history_sampler = asyncio.create_task(sample_queue_history()) if source.samples_history else None
+
+@app.on_event("shutdown")
+async def stop_data_source():
+    app.state.lag_monitor.cancel()
+    if app.state.history_sampler is not None:
+        app.state.history_sampler.cancel()
+    data_source().stop()
+    shutdown_executor()
+
+@app.middleware("http")
+async def mark_stale_responses(request: Request, call_next):
+    """
+    Flags responses computed while some informer caches still serve a snapshot from before the restart.
+    """
+    response = await call_next(request)
+    stale = data_source().stale_resources()
+    if stale:
+        response.headers["X-Stale-Resources"] = ",".join(stale)
+        response.headers["Warning"] = '110 - "Response is Stale"'
+    return response
+
+@app.exception_handler(asyncio.TimeoutError)
+async def timeout_exception_handler(request: Request, exc: asyncio.TimeoutError):
+    return JSONResponse(status_code=504, content={"error": "Timed out fetching data from Kubernetes"})
+
 class KueueStatusResponse(BaseModel):
     queues: Optional[Dict[str, Any]] = None
     workloads: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
 
 class LocalQueue(BaseModel):
+    namespace: str
     name: str
-    status: str
-    # Add more fields as required
+    spec: Dict[str, Any]
+    status: Dict[str, Any]
 
 class ClusterQueue(BaseModel):
     name: str
-    flavor: str
-    # Add more fields as required
+    cohort: Optional[str] = None
+    resourceGroups: List[Dict[str, Any]]
+    admittedWorkloads: int
+    pendingWorkloads: int
+    reservingWorkloads: int
+    flavors: List[str]
+
+# Conditional REST responses: bodies carry an ETag made of the change counters of the stores they are
+# computed from, so polling clients sending If-None-Match get a 304 without anything being recomputed
+etag_cache = ETagCache(max_bytes=int(os.getenv("ETAG_CACHE_MAX_BYTES", str(64 * 1024 * 1024))))
+
+def store_generations(resources: Sequence[str]) -> Optional[List[int]]:
+    """
+    Returns the change counters of the stores of `resources`, or None when the data source does not count changes.
+    """
+    source = data_source()
+    try:
+        generations = [source.generation(resource) for resource in resources]
+    except client.ApiException:
+        # Not synced yet: the response reports the error and is hashed like a live one
+        return None
+    return None if None in generations else generations
+
+async def conditional_response(request: Request, resources: Sequence[str], fetch: Callable,
+                               query: Optional[Dict[str, Any]] = None) -> Response:
+    """
+    Serves the JSON of `await fetch()` with an ETag, or 304 Not Modified when the client's
+    If-None-Match holds it. The ETag is derived from the change counters of the `resources` stores, read
+    before fetching, so `fetch` must call the `uncached` getters for the body to be at least that recent.
+    Data sources without change counters (live) get an ETag hashing the body instead.
+    Bodies are cached by path and `query`, the parameters the body depends on, so unknown or
+    cache-busting parameters do not add entries.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    generations = await run_blocking(store_generations, resources)
+    if generations is not None:
+        etag = generation_etag(generations)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+        async def compute():
+            return dumps(await fetch())
+        content = await etag_cache.get_or_compute(f"{request.url.path}{query_suffix(query or {})}", etag, compute)
+    else:
+        content = dumps(await fetch())
+        etag = content_etag(content)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    # no-cache: clients may store the body but revalidate it on every use
+    return Response(content, media_type="application/json", headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+async def kueue_status():
+    results = await gather_sources({
+        "queues": get_queues.uncached,
+        "workloads": get_workloads.uncached,
+        "flavors": get_resource_flavors.uncached,
+    })
+
+    # Combine errors if resources are not found, still returning the sources that succeeded
+    errors = [str(result["error"]) for result in results.values() if isinstance(result, dict) and "error" in result]
+    if errors:
+        available = {name: result for name, result in results.items() if not (isinstance(result, dict) and "error" in result)}
+        return {**available, "error": " ".join(errors)}
+    return results
 
 @app.get("/kueue/status", response_model=KueueStatusResponse)
-async def get_kueue_status():
+async def get_kueue_status(request: Request):
     """
     Fetches the current status of Kueue queues and workloads.
     """
-    queues = get_queues()
-    workloads = get_workloads()
-    flavors = get_resource_flavors()
-
-    # Combine errors if resources are not found
-    if "error" in queues or "error" in workloads or "error" in flavors :
-        error_message = queues.get("error", "") + workloads.get("error", "") + flavors.get("error", "")
-        return {"error": error_message}
-
-    return {"queues": queues, "workloads": workloads, "flavors": flavors}
+    return await conditional_response(request, ("localqueues", "workloads", "pods", "resourceflavors"), kueue_status)
 
 
 @app.get("/local-queues", response_model=List[LocalQueue])
-async def get_local_queues_endpoint():
+async def get_local_queues_endpoint(request: Request):
     """
     Fetches details about local queues.
     """
-    return get_local_queues()  # Calls the function defined in k8s_client
+    return await conditional_response(request, ("localqueues",),
+                                      lambda: run_blocking(get_local_queues.uncached))
 
 @app.get("/cluster-queues", response_model=List[ClusterQueue])
-async def get_cluster_queues_endpoint():
+async def get_cluster_queues_endpoint(request: Request):
     """
     Fetches details about cluster queues and their flavors.
     """
-    return get_cluster_queues()  # Calls the function defined in k8s_client
+    return await conditional_response(request, ("clusterqueues",),
+                                      lambda: run_blocking(get_cluster_queues.uncached))
+
+
+# Query parameters of workload listings, mapped to the k8s_client keyword arguments
+WORKLOAD_QUERY_PARAMS = {
+    "namespace": "namespace",
+    "queue": "queue_name",
+    "state": "state",
+    "labelSelector": "label_selector",
+    "limit": "limit",
+    "continue": "continue_token",
+    "fields": "fields",
+}
+
+def workload_query(params: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Converts workload listing query parameters into k8s_client keyword arguments.
+    Raises ValueError on invalid values.
+    """
+    query = {arg: params[name] for name, arg in WORKLOAD_QUERY_PARAMS.items() if params.get(name)}
+    if "limit" in query:
+        query["limit"] = int(query["limit"])
+        if query["limit"] <= 0:
+            raise ValueError("limit must be a positive integer")
+    if "state" in query and query["state"] not in WORKLOAD_STATES:
+        raise ValueError(f"Invalid workload state {query['state']}, expected one of {', '.join(WORKLOAD_STATES)}")
+    if "label_selector" in query:
+        parse_label_selector(query["label_selector"])
+    if "fields" in query:
+        parse_fields(query["fields"])
+    return query
+
+def query_suffix(query: Dict[str, Any]) -> str:
+    """
+    Canonical query string appended to an endpoint key, so differently filtered subscriptions get their own publisher.
+    """
+    return f"?{urlencode(sorted(query.items()))}" if query else ""
+
+@app.get("/workloads")
+async def get_workloads_endpoint(request: Request,
+                                 namespace: Optional[str] = None,
+                                 queue: Optional[str] = None,
+                                 state: Optional[str] = None,
+                                 labelSelector: Optional[str] = None,
+                                 limit: Optional[int] = Query(None, gt=0),
+                                 continue_token: Optional[str] = Query(None, alias="continue"),
+                                 fields: Optional[str] = None):
+    """
+    Lists workloads with their pods, filtered by namespace, queue name, state (pending/admitted/finished)
+    and label selector, paginated with `limit`/`continue` and projected on the dotted paths of `fields`.
+    Workloads only carry the fields the views use; GET /kueue/workload/{namespace}/{name} returns the full object.
+    """
+    try:
+        query = workload_query({"namespace": namespace, "queue": queue, "state": state,
+                                "labelSelector": labelSelector, "limit": limit,
+                                "continue": continue_token, "fields": fields})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def fetch():
+        try:
+            return await run_blocking(get_workloads.uncached, **query)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return await conditional_response(request, ("workloads", "pods"), fetch, query)
 
 
 @app.get("/kueue/workload/{namespace}/{workload_name}")
-async def get_workload_detail(workload_name: str):
-    workload = get_workload_by_name(namespace, workload_name)
-    if workload is None:
-        raise HTTPException(status_code=404, detail="Workload not found")
-    return workload
+async def get_workload_detail(request: Request, namespace: str, workload_name: str):
+    async def fetch():
+        workload = await run_blocking(get_workload_by_name.uncached, namespace, workload_name)
+        if workload is None:
+            raise HTTPException(status_code=404, detail="Workload not found")
+        return workload
+    return await conditional_response(request, ("workloads", "localqueues"), fetch)
 
 
 @app.get("/kueue/workload/{namespace}/{workload_name}/events")
-async def get_workload_events(workload_name: str):
-    events = get_events_by_workload_name(namespace, workload_name)
-    return events
+async def get_workload_events(request: Request, namespace: str, workload_name: str):
+    return await conditional_response(request, ("events",),
+                                      lambda: run_blocking(get_events_by_workload_name.uncached, namespace, workload_name))
+
+@app.get("/cache/stats")
+async def get_cache_stats():
+    """
+    Hit/miss counters of the k8s_client getter cache, for tuning its TTL and size.
+    """
+    return getter_cache.stats()
+
+# Time series of the queue counters, sampled in process every HISTORY_SAMPLE_SECONDS
+HISTORY_SAMPLE_SECONDS = float(os.getenv("HISTORY_SAMPLE_SECONDS", "5"))
+queue_history = History()
+HISTORY_KINDS = ("cluster-queue", "local-queue", "cohort", "resource-flavor")
+
+async def sample_queue_history():
+    while True:
+        try:
+            queue_history.record(time.time(), await run_blocking(queue_samples))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Error sampling queue history: {e}")
+        await asyncio.sleep(HISTORY_SAMPLE_SECONDS)
+
+@app.get("/history")
+async def get_history_stats():
+    """
+    Number of series in the queue history, its memory budget and resolutions.
+    """
+    return queue_history.stats()
+
+@app.get("/history/{kind}/{name:path}")
+async def get_history(kind: str, name: str,
+                      start: Optional[float] = None,
+                      end: Optional[float] = None,
+                      step: Optional[int] = None):
+    """
+    Workload counts and usage of a cluster-queue, local-queue (`<namespace>/<name>`), cohort or
+    resource-flavor between the `start` and `end` Unix timestamps (by default the last hour), as one
+    value per `step` seconds; without `step`, the finest resolution still covering `start` is used.
+    """
+    if kind not in HISTORY_KINDS:
+        raise HTTPException(status_code=404, detail=f"Unknown kind {kind}, expected one of {', '.join(HISTORY_KINDS)}")
+    end = time.time() if end is None else end
+    start = end - 3600 if start is None else start
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    try:
+        history = queue_history.query(kind, name, start, end, step)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if history is None:
+        raise HTTPException(status_code=404, detail=f"No history for {kind} {name}")
+    return FastJSONResponse(history)
+
+@app.get("/metrics")
+async def get_metrics():
+    """
+    Prometheus metrics: getter and API server latencies, cache sizes, payload sizes and WebSocket activity.
+    """
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
 # Generic WebSocket setup
+# Publishing intervals by kind of view; clients can ask for another one with `?interval=`
+DEFAULT_INTERVAL_SECONDS = float(os.getenv("WS_DEFAULT_INTERVAL_SECONDS", "5"))
+DETAIL_INTERVAL_SECONDS = float(os.getenv("WS_DETAIL_INTERVAL_SECONDS", "1"))
+OVERVIEW_INTERVAL_SECONDS = float(os.getenv("WS_OVERVIEW_INTERVAL_SECONDS", "15"))
+# Intervals clients may get with `?interval=`: each one a view is published at takes a publisher of its
+# own, so requested intervals are rounded up to one of these rather than each starting another
+WS_INTERVALS = sorted(float(value) for value in os.getenv("WS_INTERVALS", "1,2,5,15,30,60").split(","))
+# A subscriber that does not accept a message within this delay is disconnected
+SEND_TIMEOUT_SECONDS = float(os.getenv("WS_SEND_TIMEOUT_SECONDS", "10"))
+# Topics a single /ws/stream connection may subscribe to
+STREAM_MAX_TOPICS = int(os.getenv("WS_STREAM_MAX_TOPICS", "100"))
+
+class Snapshot(NamedTuple):
+    version: int
+    data: Any
+    payload: str
+
+class Subscriber:
+    """
+    A connected WebSocket with a latest-wins outbox of one message, drained by its own sender task:
+    a message not sent yet when the next one is published is replaced, so a slow client skips
+    stale updates instead of queueing them up or holding back the other subscribers.
+    """
+    def __init__(self, websocket: WebSocket, delta: bool, ready: Optional[asyncio.Event] = None):
+        self.websocket = websocket
+        self.delta = delta
+        # Last version queued to a delta-mode subscriber (None until its first snapshot)
+        self.version: Optional[int] = None
+        self.pending: Optional[str] = None
+        self.sender: Optional[asyncio.Task] = None
+        # Subscribers of a /ws/stream connection share the event of the connection's single sender
+        self._ready = ready if ready is not None else asyncio.Event()
+
+    def offer(self, message: str) -> bool:
+        """
+        Queues a message, replacing the unsent one if any. Returns whether a message was dropped.
+        """
+        dropped = self.pending is not None
+        self.pending = message
+        self._ready.set()
+        return dropped
+
+    async def next_message(self) -> str:
+        await self._ready.wait()
+        self._ready.clear()
+        message, self.pending = self.pending, None
+        return message
+
 class ConnectionManager:
+    """
+    Tracks the WebSockets subscribed to each endpoint and runs one publisher task per endpoint:
+    the data is fetched once per interval and the same serialized payload is queued to every subscriber.
+
+    Subscribers connecting with `?mode=delta` get `{"type": "snapshot", "version", "data"}` first,
+    then `{"type": "patch", "version", "base", "patch"}` messages carrying an RFC 6902 JSON Patch
+    against version `base`, and nothing while the data is unchanged. A subscriber that missed a
+    version, because it was too slow to receive it, is sent a new snapshot flagged with `"resync": true`.
+    """
     def __init__(self):
-        self.active_connections: Dict[str, list[WebSocket]] = {}
+        self.active_connections: Dict[str, Dict[WebSocket, Subscriber]] = {}
+        self.publishers: Dict[str, asyncio.Task] = {}
+        self.snapshots: Dict[str, Snapshot] = {}
+        # Route template of each endpoint (`/ws/cohort/{cohort_name}`), used as metrics label
+        self.routes: Dict[str, str] = {}
 
-    async def connect(self, websocket: WebSocket, endpoint: str):
+    async def connect(self, websocket: WebSocket, endpoint: str, delta: bool = False):
         await websocket.accept()
+        route = websocket.scope.get("route")
+        subscriber = Subscriber(websocket, delta)
+        subscriber.sender = asyncio.create_task(self._send_loop(subscriber, endpoint))
+        self.add_subscriber(endpoint, subscriber, route.path if route is not None else endpoint)
+
+    def add_subscriber(self, endpoint: str, subscriber: Subscriber, route: str):
+        """
+        Registers a subscriber of an accepted WebSocket, delivered by its own sender task if it has one.
+        """
         if endpoint not in self.active_connections:
-            self.active_connections[endpoint] = []
-        self.active_connections[endpoint].append(websocket)
+            self.active_connections[endpoint] = {}
+            self.routes[endpoint] = route
+        self.active_connections[endpoint][subscriber.websocket] = subscriber
+        WEBSOCKET_SUBSCRIBERS.labels(self.routes[endpoint]).inc()
 
     def disconnect(self, websocket: WebSocket, endpoint: str):
-        if endpoint in self.active_connections:
-            self.active_connections[endpoint].remove(websocket)
+        connections = self.active_connections.get(endpoint)
+        if connections is None:
+            return
+        subscriber = connections.pop(websocket, None)
+        if subscriber is not None:
+            WEBSOCKET_SUBSCRIBERS.labels(self.routes[endpoint]).dec()
+            if subscriber.sender is not None and subscriber.sender is not asyncio.current_task():
+                subscriber.sender.cancel()
+        if not connections:
+            # Last subscriber left, nobody needs this endpoint's data anymore
+            del self.active_connections[endpoint]
+            self.routes.pop(endpoint, None)
+            self.stop_publisher(endpoint)
+
+    def start_publisher(self, endpoint: str, data_fetcher: Callable, interval: float):
+        if endpoint not in self.publishers:
+            self.publishers[endpoint] = asyncio.create_task(self._publish(endpoint, data_fetcher, interval))
+
+    def stop_publisher(self, endpoint: str):
+        task = self.publishers.pop(endpoint, None)
+        if task is not None:
+            task.cancel()
+        self.snapshots.pop(endpoint, None)
+
+    async def _publish(self, endpoint: str, data_fetcher: Callable, interval: float):
+        while True:
+            try:
+                if asyncio.iscoroutinefunction(data_fetcher):
+                    data = await data_fetcher()
+                else:
+                    data = await run_blocking(data_fetcher)
+                await self.broadcast(data, endpoint)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error publishing on {endpoint}: {e}")
+            await asyncio.sleep(interval)  # Polling interval
 
-    async def broadcast(self, message: dict, endpoint: str):
-        for connection in self.active_connections.get(endpoint, []):
+    async def _send_loop(self, subscriber: Subscriber, endpoint: str):
+        websocket = subscriber.websocket
+        while True:
+            message = await subscriber.next_message()
             try:
-                await connection.send_json(message)
+                await asyncio.wait_for(websocket.send_text(message), SEND_TIMEOUT_SECONDS)
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
-                print(f"Error sending message on {endpoint}: {e}")
-                self.disconnect(connection, endpoint)
+                print(f"Error sending message on {endpoint}: {e!r}")
+                SEND_FAILURES.labels(self.routes.get(endpoint, endpoint)).inc()
+                self.disconnect(websocket, endpoint)
+                try:
+                    await asyncio.wait_for(websocket.close(code=1011), 1)
+                except Exception:
+                    pass
+                return
+
+    async def send_latest(self, websocket: WebSocket, endpoint: str):
+        """
+        Queues the last published data to a new subscriber so it does not wait for the next tick.
+        """
+        snapshot = self.snapshots.get(endpoint)
+        subscriber = self.active_connections.get(endpoint, {}).get(websocket)
+        if snapshot is not None and subscriber is not None:
+            self._enqueue(subscriber, snapshot, None, endpoint)
+
+    @staticmethod
+    def _snapshot_message(snapshot: Snapshot, resync: bool) -> str:
+        # Embed the already serialized payload instead of serializing the data again
+        resync_field = ',"resync":true' if resync else ""
+        return f'{{"type":"snapshot","version":{snapshot.version}{resync_field},"data":{snapshot.payload}}}'
+
+    def _enqueue(self, subscriber: Subscriber, snapshot: Snapshot, patch_message: Optional[str], endpoint: str):
+        if not subscriber.delta:
+            message = snapshot.payload
+        elif subscriber.version == snapshot.version:
+            return
+        elif patch_message is not None and subscriber.version == snapshot.version - 1 and subscriber.pending is None:
+            message = patch_message
+        else:
+            # The subscriber is new, or the message it did not receive yet is being dropped
+            message = self._snapshot_message(snapshot, resync=subscriber.version is not None)
+        subscriber.version = snapshot.version
+        if subscriber.offer(message):
+            COALESCED_MESSAGES.labels(self.routes.get(endpoint, endpoint)).inc()
+
+    async def broadcast(self, message: Any, endpoint: str):
+        route = self.routes.get(endpoint, endpoint)
+        with BROADCAST_DURATION.labels(route).time():
+            previous = self.snapshots.get(endpoint)
+            # The patch is only worth computing when a subscriber streams deltas
+            with_patch = any(subscriber.delta for subscriber in self.active_connections.get(endpoint, {}).values())
+            # Serializing and diffing large payloads takes long enough to stall every other socket: off the loop
+            snapshot, patch_message = await run_blocking(self._serialize, message, previous, with_patch, route)
+            self.snapshots[endpoint] = snapshot
+
+            # Only queued here: each subscriber's sender task delivers at its own pace
+            for subscriber in list(self.active_connections.get(endpoint, {}).values()):
+                self._enqueue(subscriber, snapshot, patch_message, endpoint)
+
+    @staticmethod
+    def _serialize(message: Any, previous: Optional[Snapshot], with_patch: bool, route: str):
+        """
+        Returns the snapshot of `message` following `previous`, and the patch message between them
+        if `with_patch` and the data changed.
+        """
+        # Serialized once per tick, the same text is queued to every subscriber
+        payload_bytes = dumps(message)
+        PAYLOAD_SIZE.labels(route).observe(len(payload_bytes))
+        payload = payload_bytes.decode()
+        if previous is not None and previous.payload == payload:
+            return previous, None
+        snapshot = Snapshot(previous.version + 1 if previous else 1, message, payload)
+        patch_message = None
+        if previous is not None and with_patch:
+            patch_message = dumps_text({
+                "type": "patch",
+                "version": snapshot.version,
+                "base": previous.version,
+                "patch": make_patch(previous.data, message),
+            })
+        return snapshot, patch_message
 
 manager = ConnectionManager()
 
-async def websocket_handler(websocket: WebSocket, data_fetcher: Callable, endpoint: str, interval: int = 5):
+def parse_interval(value: Optional[str], default: float) -> float:
+    """
+    Returns the publishing interval asked for by a subscriber, rounded up to the view's default
+    or one of WS_INTERVALS, or the longest of them. Raises ValueError on an invalid value.
     """
-    Generic WebSocket handler to fetch data and broadcast updates.
+    if not value:
+        return default
+    interval = float(value)
+    if interval != interval:  # NaN
+        raise ValueError(f"Invalid interval {value}")
+    allowed = sorted({*WS_INTERVALS, default})
+    return next((candidate for candidate in allowed if candidate >= interval), allowed[-1])
+
+def interval_endpoint(endpoint: str, interval: float, default: float) -> str:
+    """
+    Endpoint key of a subscription: subscribers asking for another interval share a publisher of their own.
+    """
+    if interval == default:
+        return endpoint
+    return f"{endpoint}{'&' if '?' in endpoint else '?'}interval={interval:g}"
+
+async def websocket_handler(websocket: WebSocket, data_fetcher: Callable, endpoint: str,
+                            interval: float = DEFAULT_INTERVAL_SECONDS):
+    """
+    Generic WebSocket handler subscribing a client to the shared publisher of an endpoint.
+    Clients opt into delta streaming with the `mode=delta` query parameter, and can ask for
+    another publishing interval with `interval=<seconds>`.
     
     Parameters:
     - websocket: WebSocket instance
-    - data_fetcher: Callable function to fetch data
+    - data_fetcher: Callable function to fetch data, run on the k8s client executor unless it is a coroutine function
     - endpoint: Unique endpoint identifier for managing connections
-    - interval: Polling interval in seconds
+    - interval: Default polling interval in seconds
     """
-    await manager.connect(websocket, endpoint)
     try:
+        client_interval = parse_interval(websocket.query_params.get("interval"), interval)
+    except ValueError as e:
+        print(f"Rejecting {endpoint} subscription: {e}")
+        await websocket.close(code=1008)
+        return
+    endpoint = interval_endpoint(endpoint, client_interval, interval)
+
+    delta = websocket.query_params.get("mode") == "delta"
+    await manager.connect(websocket, endpoint, delta=delta)
+    manager.start_publisher(endpoint, data_fetcher, client_interval)
+    try:
+        await manager.send_latest(websocket, endpoint)
         while True:
-            # Fetch data periodically and broadcast it
-            data = data_fetcher()
-            await manager.broadcast(data, endpoint)
-            await asyncio.sleep(interval)  # Polling interval
+            # Updates are pushed by the publisher; just wait for the client to go away
+            await websocket.receive_text()
     except WebSocketDisconnect:
-        manager.disconnect(websocket, endpoint)
+        pass
     except Exception as e:
         print(f"Unhandled exception in WebSocket endpoint {endpoint}: {e}")
+    finally:
         manager.disconnect(websocket, endpoint)
 
 
+async def dashboard_snapshot():
+    return await gather_sources({
+        "queues": get_queues,
+        "clusterQueues": get_cluster_queues,
+        "workloads": get_workloads,
+        "flavors": get_resource_flavors,
+    })
+
 @app.websocket("/ws/workloads/dashboard")
 async def websocket_kueue(websocket: WebSocket):
-    await websocket_handler(websocket,
-                            lambda: {"queues": get_queues(),
-                                     "clusterQueues": get_cluster_queues(),
-                                     "workloads": get_workloads(),
-                                     "flavors": get_resource_flavors()},
-                            "/ws/workloads/dashboard")
+    await websocket_handler(websocket, dashboard_snapshot, "/ws/workloads/dashboard",
+                            interval=OVERVIEW_INTERVAL_SECONDS)
 
 @app.websocket("/ws/workloads")
 async def websocket_kueue(websocket: WebSocket):
-    await websocket_handler(websocket,  lambda: {"workloads": get_workloads()}, "/ws/workloads")
+    try:
+        query = workload_query(websocket.query_params)
+    except ValueError as e:
+        print(f"Rejecting /ws/workloads subscription: {e}")
+        await websocket.close(code=1008)
+        return
+    await websocket_handler(websocket,
+                            lambda: {"workloads": get_workloads(**query)},
+                            f"/ws/workloads{query_suffix(query)}",
+                            interval=OVERVIEW_INTERVAL_SECONDS)
 
 @app.websocket("/ws/local-queues")
 async def websocket_local_queues(websocket: WebSocket):
-    await websocket_handler(websocket, get_local_queues, "/ws/local-queues")
+    await websocket_handler(websocket, get_local_queues, "/ws/local-queues", interval=OVERVIEW_INTERVAL_SECONDS)
 
 @app.websocket("/ws/cluster-queues")
 async def websocket_cluster_queues(websocket: WebSocket):
-    await websocket_handler(websocket, get_cluster_queues, "/ws/cluster-queues")
+    await websocket_handler(websocket, get_cluster_queues, "/ws/cluster-queues", interval=OVERVIEW_INTERVAL_SECONDS)
 
 @app.websocket("/ws/cluster-queue/{cluster_queue_name}")
 async def websocket_resource_flavor_details(websocket: WebSocket, cluster_queue_name: str):
-    await websocket_handler(websocket, lambda: get_cluster_queue_details(cluster_queue_name), f"/ws/cluster-queue/{cluster_queue_name}")
+    await websocket_handler(websocket, lambda: get_cluster_queue_details(cluster_queue_name), f"/ws/cluster-queue/{cluster_queue_name}",
+                            interval=DETAIL_INTERVAL_SECONDS)
 
 
 
 # New WebSocket endpoint for individual workload updates
 @app.websocket("/ws/workload/{namespace}/{workload_name}")
 async def websocket_workload(websocket: WebSocket, namespace: str, workload_name: str):
-    await websocket_handler(websocket, lambda: get_workload_by_name(namespace, workload_name), f"/ws/workload/{namespace}/{workload_name}")
+    await websocket_handler(websocket, lambda: get_workload_by_name(namespace, workload_name), f"/ws/workload/{namespace}/{workload_name}",
+                            interval=DETAIL_INTERVAL_SECONDS)
 
 
-@app.websocket("/ws/workload/{namespace}/{workload_name}/events")
+EVENTS_ROUTE = "/ws/workload/{namespace}/{workload_name}/events"
+
+async def workload_event_messages(updates: asyncio.Queue, namespace: str, workload_name: str):
+    """
+    Yields the messages streaming the events about a workload from its EventFeed queue: the full list
+    first, then `{"type": "events", "upserted": [...], "deleted": [names]}` messages carrying only the
+    changed events. Changes arriving while the consumer sends a message are coalesced into the next one,
+    and the full list is yielded again when the events were re-listed or the queue overflowed.
+    """
+    message = await run_blocking(list_workload_events, namespace, workload_name)
+    while True:
+        yield message
+        batch = [await updates.get()]
+        while not updates.empty():
+            batch.append(updates.get_nowait())
+        if any(change == "resync" for change, _ in batch):
+            message = await run_blocking(list_workload_events, namespace, workload_name)
+            continue
+        # Last change per event name wins
+        changes = {event["metadata"]["name"]: (change, event) for change, event in batch}
+        message = {
+            "type": "events",
+            "upserted": [event_summary(event) for change, event in changes.values() if change == "upsert"],
+            "deleted": [name for name, (change, _) in changes.items() if change == "delete"],
+        }
+
+async def push_workload_events(websocket: WebSocket, send: Callable, feed, namespace: str, workload_name: str):
+    """
+    Sends the event messages of a workload with the coroutine function `send` until cancelled.
+    A failed send is counted and closes the WebSocket.
+    """
+    key = f"{namespace}/{workload_name}"
+    updates = feed.subscribe(key)
+    WEBSOCKET_SUBSCRIBERS.labels(EVENTS_ROUTE).inc()
+    try:
+        async for message in workload_event_messages(updates, namespace, workload_name):
+            await send(message)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        print(f"Error streaming events of {key}: {e!r}")
+        SEND_FAILURES.labels(EVENTS_ROUTE).inc()
+        try:
+            await asyncio.wait_for(websocket.close(code=1011), 1)
+        except Exception:
+            pass
+    finally:
+        feed.unsubscribe(key, updates)
+        WEBSOCKET_SUBSCRIBERS.labels(EVENTS_ROUTE).dec()
+
+async def workload_event_feed():
+    """
+    Returns the EventFeed of the data source, or None when events can only be polled.
+    """
+    try:
+        return await run_blocking(lambda: data_source().event_feed())
+    except client.ApiException as e:
+        print(f"Event feed unavailable, polling events: {e}")
+        return None
+
+@app.websocket(EVENTS_ROUTE)
 async def websocket_workload_events(websocket: WebSocket,  namespace: str, workload_name: str):
-    await manager.connect(websocket, f"/ws/workload/{namespace}/{workload_name}/events")
+    """
+    Streams the events about a workload as the events WATCH delivers them, see `workload_event_messages`.
+    """
+    feed = await workload_event_feed()
+    if feed is None:
+        # Data sources without a WATCH (live) are polled like the other endpoints
+        await websocket_handler(websocket,
+                                lambda: get_events_by_workload_name(namespace, workload_name),
+                                f"/ws/workload/{namespace}/{workload_name}/events",
+                                interval=DETAIL_INTERVAL_SECONDS)
+        return
+
+    async def send(message):
+        await asyncio.wait_for(websocket.send_text(dumps_text(message)), SEND_TIMEOUT_SECONDS)
+
+    await websocket.accept()
+    pusher = asyncio.create_task(push_workload_events(websocket, send, feed, namespace, workload_name))
     try:
         while True:
-            events = get_events_by_workload_name(namespace, workload_name)
-            await manager.broadcast(events, f"/ws/workload/{namespace}/{workload_name}/events")
-            await asyncio.sleep(5)  # Polling interval for new events
+            await websocket.receive_text()
     except WebSocketDisconnect:
-        manager.disconnect(websocket, f"/ws/workload/{namespace}/{workload_name}/events")
+        pass
     except Exception as e:
-        print(f"Unhandled exception in WebSocket events endpoint for {workload_name}: {e}")
-        manager.disconnect(websocket, f"/ws/workload/{namespace}/{workload_name}/events")
+        print(f"Unhandled exception in events stream of {namespace}/{workload_name}: {e}")
+    finally:
+        pusher.cancel()
 
 @app.websocket("/ws/resource-flavors")
 async def websocket_resource_flavors(websocket: WebSocket):
-    await websocket_handler(websocket, get_resource_flavors, "/ws/resource-flavors")
+    await websocket_handler(websocket, get_resource_flavors, "/ws/resource-flavors", interval=OVERVIEW_INTERVAL_SECONDS)
 
 @app.websocket("/ws/resource-flavor/{flavor_name}")
 async def websocket_resource_flavor_details(websocket: WebSocket, flavor_name: str):
-    await websocket_handler(websocket, lambda: get_resource_flavor_details(flavor_name), f"/ws/resource-flavor/{flavor_name}")
+    await websocket_handler(websocket, lambda: get_resource_flavor_details(flavor_name), f"/ws/resource-flavor/{flavor_name}",
+                            interval=DETAIL_INTERVAL_SECONDS)
 
 @app.websocket("/ws/local-queue/{namespace}/{queue_name}")
 async def websocket_local_queue_details(websocket: WebSocket, namespace: str, queue_name: str):
     await websocket_handler(websocket, 
                             lambda: get_local_queue_details(namespace, queue_name), 
-                            f"/ws/local-queue/{namespace}/{queue_name}")
+                            f"/ws/local-queue/{namespace}/{queue_name}",
+                            interval=DETAIL_INTERVAL_SECONDS)
 
 @app.websocket("/ws/local-queue/{namespace}/{queue_name}/workloads")
 async def websocket_local_queue_workloads(websocket: WebSocket,  namespace: str, queue_name: str):
-    await websocket_handler(websocket, lambda: get_admitted_workloads(namespace, queue_name), f"/ws/local-queue/{namespace}/{queue_name}/workloads")
+    try:
+        query = workload_query(websocket.query_params)
+    except ValueError as e:
+        print(f"Rejecting local queue workloads subscription: {e}")
+        await websocket.close(code=1008)
+        return
+    # The namespace and queue come from the path
+    query.pop("namespace", None)
+    query.pop("queue_name", None)
+    await websocket_handler(websocket,
+                            lambda: get_admitted_workloads(namespace, queue_name, **query),
+                            f"/ws/local-queue/{namespace}/{queue_name}/workloads{query_suffix(query)}",
+                            interval=DETAIL_INTERVAL_SECONDS)
 
 @app.websocket("/ws/cohorts")
 async def websocket_cohorts(websocket: WebSocket):
-    await websocket_handler(websocket, get_cohorts,"/ws/cohorts")
+    await websocket_handler(websocket, get_cohorts,"/ws/cohorts", interval=OVERVIEW_INTERVAL_SECONDS)
 
 
 @app.websocket("/ws/cohort/{cohort_name}")
 async def websocket_cohort_details(websocket: WebSocket, cohort_name: str):
-    await websocket_handler(websocket, lambda: get_cohort_details(cohort_name),f"/ws/cohort/{cohort_name}")
+    await websocket_handler(websocket, lambda: get_cohort_details(cohort_name),f"/ws/cohort/{cohort_name}",
+                            interval=DETAIL_INTERVAL_SECONDS)
 
 
 @app.websocket("/ws/workload/{job_uid}/pods")
 async def websocket_pods(websocket: WebSocket, job_uid: str):
-    await websocket_handler(websocket, lambda: get_pods_for_workload(job_uid), f"/ws/workload/{job_uid}/pods")
+    await websocket_handler(websocket, lambda: get_pods_for_workload(job_uid), f"/ws/workload/{job_uid}/pods",
+                            interval=DETAIL_INTERVAL_SECONDS)
+
+
+# Multiplexed subscriptions: one WebSocket, many topics
+class Topic(NamedTuple):
+    endpoint: str  # Path of the equivalent /ws route, the key of the publisher shared with its subscribers
+    route: str  # Route template, used as metrics label
+    fetcher: Callable
+    interval: float
+    events_of: Optional[Tuple[str, str]] = None  # (namespace, workload name) of an events topic
+
+def resolve_topic(topic: str) -> Topic:
+    """
+    Maps a /ws/stream topic to the publisher of the route it mirrors:
 
+        dashboard, local-queues, cluster-queues, resource-flavors, cohorts, workloads[?query]
+        cluster-queue:<name>, resource-flavor:<name>, cohort:<name>
+        local-queue:<namespace>/<name>, local-queue:<namespace>/<name>/workloads[?query]
+        workload:<namespace>/<name>, workload:<namespace>/<name>/events, pods:<job uid>
 
+    where `query` takes the parameters of GET /workloads. Raises ValueError on an unknown or invalid topic.
+    """
+    name, _, query_string = topic.partition("?")
+    kind, _, argument = name.partition(":")
+    parts = argument.split("/") if argument else []
+    if not all(parts):
+        raise ValueError(f"Invalid topic {topic}")
+    query = workload_query(dict(parse_qsl(query_string))) if query_string else {}
+    if query and not (kind == "workloads" or name.endswith("/workloads")):
+        raise ValueError(f"Topic {name} takes no query")
+
+    overviews = {
+        "dashboard": ("/ws/workloads/dashboard", dashboard_snapshot),
+        "local-queues": ("/ws/local-queues", get_local_queues),
+        "cluster-queues": ("/ws/cluster-queues", get_cluster_queues),
+        "resource-flavors": ("/ws/resource-flavors", get_resource_flavors),
+        "cohorts": ("/ws/cohorts", get_cohorts),
+    }
+    if kind in overviews and not parts:
+        endpoint, fetcher = overviews[kind]
+        return Topic(endpoint, endpoint, fetcher, OVERVIEW_INTERVAL_SECONDS)
+    if kind == "workloads" and not parts:
+        return Topic(f"/ws/workloads{query_suffix(query)}", "/ws/workloads",
+                     lambda: {"workloads": get_workloads(**query)}, OVERVIEW_INTERVAL_SECONDS)
+    if kind == "cluster-queue" and len(parts) == 1:
+        return Topic(f"/ws/cluster-queue/{parts[0]}", "/ws/cluster-queue/{cluster_queue_name}",
+                     lambda: get_cluster_queue_details(parts[0]), DETAIL_INTERVAL_SECONDS)
+    if kind == "resource-flavor" and len(parts) == 1:
+        return Topic(f"/ws/resource-flavor/{parts[0]}", "/ws/resource-flavor/{flavor_name}",
+                     lambda: get_resource_flavor_details(parts[0]), DETAIL_INTERVAL_SECONDS)
+    if kind == "cohort" and len(parts) == 1:
+        return Topic(f"/ws/cohort/{parts[0]}", "/ws/cohort/{cohort_name}",
+                     lambda: get_cohort_details(parts[0]), DETAIL_INTERVAL_SECONDS)
+    if kind == "local-queue" and len(parts) == 2:
+        namespace, queue_name = parts
+        return Topic(f"/ws/local-queue/{namespace}/{queue_name}", "/ws/local-queue/{namespace}/{queue_name}",
+                     lambda: get_local_queue_details(namespace, queue_name), DETAIL_INTERVAL_SECONDS)
+    if kind == "local-queue" and len(parts) == 3 and parts[2] == "workloads":
+        namespace, queue_name, _ = parts
+        # The namespace and queue come from the topic
+        query.pop("namespace", None)
+        query.pop("queue_name", None)
+        return Topic(f"/ws/local-queue/{namespace}/{queue_name}/workloads{query_suffix(query)}",
+                     "/ws/local-queue/{namespace}/{queue_name}/workloads",
+                     lambda: get_admitted_workloads(namespace, queue_name, **query), DETAIL_INTERVAL_SECONDS)
+    if kind == "workload" and len(parts) == 2:
+        namespace, workload_name = parts
+        return Topic(f"/ws/workload/{namespace}/{workload_name}", "/ws/workload/{namespace}/{workload_name}",
+                     lambda: get_workload_by_name(namespace, workload_name), DETAIL_INTERVAL_SECONDS)
+    if kind == "workload" and len(parts) == 3 and parts[2] == "events":
+        namespace, workload_name, _ = parts
+        return Topic(f"/ws/workload/{namespace}/{workload_name}/events", EVENTS_ROUTE,
+                     lambda: get_events_by_workload_name(namespace, workload_name), DETAIL_INTERVAL_SECONDS,
+                     events_of=(namespace, workload_name))
+    if kind == "pods" and len(parts) == 1:
+        return Topic(f"/ws/workload/{parts[0]}/pods", "/ws/workload/{job_uid}/pods",
+                     lambda: get_pods_for_workload(parts[0]), DETAIL_INTERVAL_SECONDS)
+    raise ValueError(f"Unknown topic {topic}")
+
+class StreamConnection:
+    """
+    A /ws/stream WebSocket and the topics it subscribed to. Each polled topic has a latest-wins
+    Subscriber registered with the publisher shared with the equivalent route, and a single sender
+    task drains them all; events topics are pushed from the EventFeed. Every message is the one the
+    equivalent route would send, tagged with its topic: `{"topic": ..., "data": ...}`.
+    """
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.ready = asyncio.Event()
+        self.subscribers: Dict[str, Subscriber] = {}  # topic -> subscriber
+        self.endpoints: Dict[str, str] = {}  # topic -> publisher endpoint
+        self.event_pushers: Dict[str, asyncio.Task] = {}  # events topic -> pusher task
+        self._send_lock = asyncio.Lock()
+
+    async def send(self, topic: Optional[str], message: str):
+        # The sender and the event pushers share the WebSocket
+        async with self._send_lock:
+            await asyncio.wait_for(self.websocket.send_text(f'{{"topic":{dumps_text(topic)},"data":{message}}}'),
+                                   SEND_TIMEOUT_SECONDS)
+
+    async def send_error(self, topic: Optional[str], error: str):
+        async with self._send_lock:
+            await asyncio.wait_for(self.websocket.send_text(dumps_text({"topic": topic, "error": error})),
+                                   SEND_TIMEOUT_SECONDS)
+
+    async def send_loop(self):
+        try:
+            while True:
+                await self.ready.wait()
+                self.ready.clear()
+                for topic, subscriber in list(self.subscribers.items()):
+                    if subscriber.pending is not None:
+                        message, subscriber.pending = subscriber.pending, None
+                        await self.send(topic, message)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Error sending message on /ws/stream: {e!r}")
+            SEND_FAILURES.labels("/ws/stream").inc()
+            try:
+                await asyncio.wait_for(self.websocket.close(code=1011), 1)
+            except Exception:
+                pass
+
+    async def subscribe(self, topic: str, delta: bool = False, interval: Optional[str] = None):
+        """
+        Subscribes to a topic, replacing an earlier subscription to it. Raises ValueError on an invalid request.
+        """
+        resolved = resolve_topic(topic)
+        self.unsubscribe(topic)
+        if len(self.endpoints) + len(self.event_pushers) >= STREAM_MAX_TOPICS:
+            raise ValueError(f"At most {STREAM_MAX_TOPICS} topics per connection")
+        client_interval = parse_interval(interval, resolved.interval)
+        if resolved.events_of is not None:
+            feed = await workload_event_feed()
+            if feed is not None:
+                async def send(message):
+                    await self.send(topic, dumps_text(message))
+                self.event_pushers[topic] = asyncio.create_task(
+                    push_workload_events(self.websocket, send, feed, *resolved.events_of))
+                return
+        endpoint = interval_endpoint(resolved.endpoint, client_interval, resolved.interval)
+        if endpoint in self.endpoints.values():
+            raise ValueError(f"Topic {topic} is already subscribed under another name")
+        subscriber = Subscriber(self.websocket, delta, ready=self.ready)
+        self.subscribers[topic] = subscriber
+        self.endpoints[topic] = endpoint
+        manager.add_subscriber(endpoint, subscriber, resolved.route)
+        manager.start_publisher(endpoint, resolved.fetcher, client_interval)
+        await manager.send_latest(self.websocket, endpoint)
+
+    def unsubscribe(self, topic: str):
+        endpoint = self.endpoints.pop(topic, None)
+        if endpoint is not None:
+            del self.subscribers[topic]
+            manager.disconnect(self.websocket, endpoint)
+        pusher = self.event_pushers.pop(topic, None)
+        if pusher is not None:
+            pusher.cancel()
+
+    def close(self):
+        for topic in list(self.endpoints) + list(self.event_pushers):
+            self.unsubscribe(topic)
+
+@app.websocket("/ws/stream")
+async def websocket_stream(websocket: WebSocket):
+    """
+    Multiplexes subscriptions to the /ws routes over a single WebSocket. The client sends
+    `{"action": "subscribe", "topic": ..., "mode": "delta", "interval": seconds}` (mode and interval
+    optional, as the query parameters of the routes) and `{"action": "unsubscribe", "topic": ...}`,
+    and receives `{"topic": ..., "data": ...}` updates, or `{"topic": ..., "error": ...}` when a
+    request is rejected. See `resolve_topic` for the topics.
+    """
+    await websocket.accept()
+    connection = StreamConnection(websocket)
+    sender = asyncio.create_task(connection.send_loop())
+    WEBSOCKET_SUBSCRIBERS.labels("/ws/stream").inc()
+    try:
+        while True:
+            text = await websocket.receive_text()
+            topic = None
+            try:
+                request = orjson.loads(text)
+                topic = request.get("topic")
+                if not isinstance(topic, str):
+                    raise ValueError("Missing topic")
+                if request.get("action") == "subscribe":
+                    interval = request.get("interval")
+                    await connection.subscribe(topic, delta=request.get("mode") == "delta",
+                                               interval=str(interval) if interval is not None else None)
+                elif request.get("action") == "unsubscribe":
+                    connection.unsubscribe(topic)
+                else:
+                    raise ValueError(f"Unknown action {request.get('action')}, expected subscribe or unsubscribe")
+            except (ValueError, AttributeError) as e:
+                # orjson.JSONDecodeError is a ValueError; AttributeError when the request is not an object
+                await connection.send_error(topic, str(e))
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        print(f"Unhandled exception in /ws/stream: {e}")
+    finally:
+        sender.cancel()
+        connection.close()
+        WEBSOCKET_SUBSCRIBERS.labels("/ws/stream").dec()
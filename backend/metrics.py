@@ -0,0 +1,109 @@
+import asyncio
+import functools
+
+from prometheus_client import Counter, Gauge, Histogram
+from prometheus_client.core import GaugeMetricFamily
+
+__all__ = [
+    "APISERVER_REQUEST_DURATION",
+    "GETTER_DURATION",
+    "PAYLOAD_SIZE",
+    "WEBSOCKET_SUBSCRIBERS",
+    "BROADCAST_DURATION",
+    "SEND_FAILURES",
+    "COALESCED_MESSAGES",
+    "EVENT_LOOP_LAG",
+    "ObjectCountCollector",
+    "timed_getter",
+    "monitor_event_loop_lag",
+]
+
+# Payloads range from a few hundred bytes (a single queue) to tens of MB (every workload of the cluster)
+PAYLOAD_SIZE_BUCKETS = (1e3, 1e4, 1e5, 1e6, 5e6, 1e7, 5e7, 1e8)
+
+APISERVER_REQUEST_DURATION = Histogram(
+    "kueue_viz_apiserver_request_duration_seconds",
+    "Duration of the requests sent to the API server, by resource and verb.",
+    ["resource", "verb"],
+)
+GETTER_DURATION = Histogram(
+    "kueue_viz_getter_duration_seconds",
+    "Time spent computing a k8s_client getter result, excluding getter cache hits.",
+    ["getter"],
+)
+PAYLOAD_SIZE = Histogram(
+    "kueue_viz_payload_size_bytes",
+    "Size of the serialized payloads published to WebSocket subscribers, by route.",
+    ["endpoint"],
+    buckets=PAYLOAD_SIZE_BUCKETS,
+)
+WEBSOCKET_SUBSCRIBERS = Gauge(
+    "kueue_viz_websocket_subscribers",
+    "Number of connected WebSocket subscribers, by route.",
+    ["endpoint"],
+)
+BROADCAST_DURATION = Histogram(
+    "kueue_viz_broadcast_duration_seconds",
+    "Time spent serializing, diffing and queueing one update to the subscribers of an endpoint, by route.",
+    ["endpoint"],
+)
+SEND_FAILURES = Counter(
+    "kueue_viz_websocket_send_failures_total",
+    "WebSocket sends that failed and dropped the subscriber, by route.",
+    ["endpoint"],
+)
+COALESCED_MESSAGES = Counter(
+    "kueue_viz_websocket_coalesced_messages_total",
+    "Messages replaced by a newer one before a slow subscriber received them, by route.",
+    ["endpoint"],
+)
+EVENT_LOOP_LAG = Histogram(
+    "kueue_viz_event_loop_lag_seconds",
+    "How late the event loop woke up a periodic probe; high values mean blocking work on the loop.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+
+
+class ObjectCountCollector:
+    """
+    Reports the number of objects held by the data source returned by `get_source`, at scrape time.
+    """
+
+    def __init__(self, get_source):
+        self._get_source = get_source
+
+    def describe(self):
+        # Without it the registry describes the collector by collecting it, creating the data source at import
+        return []
+
+    def collect(self):
+        objects = GaugeMetricFamily(
+            "kueue_viz_informer_objects", "Number of objects held by the data source, by resource.", labels=["resource"]
+        )
+        for resource, count in self._get_source().object_counts().items():
+            objects.add_metric([resource], count)
+        yield objects
+
+
+def timed_getter(func):
+    """
+    Decorator recording the duration of a getter in GETTER_DURATION, labelled by its name.
+    """
+    histogram = GETTER_DURATION.labels(func.__name__)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with histogram.time():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+async def monitor_event_loop_lag(interval: float = 1.0):
+    """
+    Sleeps for `interval` in a loop and records how much later than expected each wake-up happens.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(loop.time() - start - interval, 0))
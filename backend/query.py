@@ -0,0 +1,124 @@
+import base64
+import re
+
+from informer import object_key
+
+__all__ = [
+    "parse_label_selector",
+    "parse_fields",
+    "project",
+    "paginate",
+    "WORKLOAD_STATES",
+]
+
+WORKLOAD_STATES = ("pending", "admitted", "finished")
+
+_REQUIREMENT = re.compile(
+    r"^\s*(?P<not>!)?\s*(?P<key>[A-Za-z0-9_./-]+)\s*"
+    r"(?:(?P<op>==|=|!=)\s*(?P<value>[A-Za-z0-9_.-]*)"
+    r"|\s(?P<setop>in|notin)\s*\((?P<values>[^)]*)\))?\s*$"
+)
+
+
+def _split_requirements(selector: str):
+    # Commas separate requirements, except inside the parentheses of `in`/`notin` value sets
+    requirements, depth, current = [], 0, ""
+    for char in selector:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        if char == "," and depth == 0:
+            requirements.append(current)
+            current = ""
+        else:
+            current += char
+    requirements.append(current)
+    return [requirement for requirement in requirements if requirement.strip()]
+
+
+def parse_label_selector(selector: str):
+    """
+    Parses a Kubernetes label selector (`k=v`, `k!=v`, `k`, `!k`, `k in (a,b)`, `k notin (a,b)`)
+    into a predicate over a labels dict. Raises ValueError on invalid syntax.
+    """
+    checks = []
+    for requirement in _split_requirements(selector):
+        match = _REQUIREMENT.match(requirement)
+        if match is None or (match["not"] and (match["op"] or match["setop"])):
+            raise ValueError(f"Invalid label selector requirement: {requirement.strip()}")
+        key = match["key"]
+        if match["op"] in ("=", "=="):
+            checks.append(lambda labels, key=key, value=match["value"]: labels.get(key) == value)
+        elif match["op"] == "!=":
+            checks.append(lambda labels, key=key, value=match["value"]: labels.get(key) != value)
+        elif match["setop"]:
+            values = {value.strip() for value in match["values"].split(",") if value.strip()}
+            if match["setop"] == "in":
+                checks.append(lambda labels, key=key, values=values: labels.get(key) in values)
+            else:
+                checks.append(lambda labels, key=key, values=values: labels.get(key) not in values)
+        elif match["not"]:
+            checks.append(lambda labels, key=key: key not in labels)
+        else:
+            checks.append(lambda labels, key=key: key in labels)
+    return lambda labels: all(check(labels) for check in checks)
+
+
+def parse_fields(fields: str):
+    """
+    Parses a `fields=` projection such as `metadata.name,status.conditions` into path tuples.
+    """
+    paths = [tuple(part for part in field.strip().split(".")) for field in fields.split(",") if field.strip()]
+    for path in paths:
+        if not all(path):
+            raise ValueError(f"Invalid field path: {'.'.join(path)}")
+    return paths
+
+
+def project(obj: dict, paths) -> dict:
+    """
+    Returns a copy of `obj` holding only the given dotted paths; missing paths are skipped.
+    """
+    projected = {}
+    for path in paths:
+        value = obj
+        for part in path:
+            if not isinstance(value, dict) or part not in value:
+                break
+            value = value[part]
+        else:
+            target = projected
+            for part in path[:-1]:
+                target = target.setdefault(part, {})
+            target[path[-1]] = value
+    return projected
+
+
+def _encode_token(key: str) -> str:
+    return base64.urlsafe_b64encode(key.encode()).decode()
+
+
+def _decode_token(token: str) -> str:
+    try:
+        return base64.urlsafe_b64decode(token.encode()).decode()
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid continue token")
+
+
+def paginate(objs, limit: int = None, continue_token: str = None):
+    """
+    Returns a page of `objs` ordered by `namespace/name` and the continue token of the next page.
+    The token is the key of the last returned object, so pages stay consistent while objects
+    are added or removed, as with the API server's continue tokens.
+    """
+    if limit is None and continue_token is None:
+        return objs, None
+    keyed = sorted(((object_key(obj), obj) for obj in objs), key=lambda item: item[0])
+    if continue_token:
+        after = _decode_token(continue_token)
+        keyed = [item for item in keyed if item[0] > after]
+    if limit is None or len(keyed) <= limit:
+        return [obj for _, obj in keyed], None
+    page = keyed[:limit]
+    return [obj for _, obj in page], _encode_token(page[-1][0])
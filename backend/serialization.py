@@ -0,0 +1,36 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+__all__ = [
+    "dumps",
+    "dumps_text",
+    "FastJSONResponse",
+]
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serializes to compact UTF-8 JSON bytes with orjson, several times faster than the stdlib json module.
+    """
+    return orjson.dumps(obj, option=_OPTIONS)
+
+
+def dumps_text(obj: Any) -> str:
+    """
+    Same as `dumps` but returns text, as sent in WebSocket text frames.
+    """
+    return orjson.dumps(obj, option=_OPTIONS).decode()
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson. Endpoints returning large payloads return it directly,
+    which also skips FastAPI's jsonable_encoder pass over the content.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
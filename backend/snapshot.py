@@ -0,0 +1,90 @@
+import logging
+import mmap
+import os
+import struct
+import time
+
+import orjson
+
+from workload_record import record_default
+
+__all__ = ["SnapshotFile", "SNAPSHOT_MAGIC"]
+
+# File layout: magic, little-endian u32 header length, JSON header, then one JSON array of objects per
+# resource at the offset the header gives. Sections are parsed straight from a read-only memory map,
+# without copying the file, and only for the resources asked for.
+SNAPSHOT_MAGIC = b"KVIZSNP1"
+_HEADER_LENGTH = struct.Struct("<I")
+
+
+class SnapshotFile:
+    """
+    Last known objects of some resources, with the resourceVersion they were read at, persisted to
+    `path` so a restarted backend can serve them before its informers caught up with the API server.
+    """
+
+    def __init__(self, path: str, resources, max_age_seconds: float):
+        self.path = path
+        self.resources = tuple(resources)
+        self.max_age_seconds = max_age_seconds
+
+    def load(self) -> dict:
+        """
+        Returns `{resource: (resource_version, objects)}` from the file, or `{}` when it is missing,
+        unreadable or older than `max_age_seconds`.
+        """
+        try:
+            with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    return self._parse(view)
+                finally:
+                    view.release()
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, KeyError, struct.error) as e:
+            logging.warning(f"Ignoring unreadable snapshot {self.path}: {e}")
+            return {}
+
+    def _parse(self, view: memoryview) -> dict:
+        if bytes(view[:len(SNAPSHOT_MAGIC)]) != SNAPSHOT_MAGIC:
+            raise ValueError("not a snapshot file")
+        header_start = len(SNAPSHOT_MAGIC) + _HEADER_LENGTH.size
+        (header_length,) = _HEADER_LENGTH.unpack(view[len(SNAPSHOT_MAGIC):header_start])
+        header = orjson.loads(view[header_start:header_start + header_length])
+        age = time.time() - header["createdAt"]
+        if age > self.max_age_seconds:
+            logging.info(f"Ignoring snapshot {self.path}, {age:.0f}s old")
+            return {}
+        sections = {}
+        for resource in self.resources:
+            section = header["sections"].get(resource)
+            if section is None:
+                continue
+            start = header_start + header_length + section["offset"]
+            objects = orjson.loads(view[start:start + section["length"]])
+            sections[resource] = (section["resourceVersion"], objects)
+        return sections
+
+    def save(self, sections: dict):
+        """
+        Writes `{resource: (resource_version, objects)}`, replacing the previous file atomically.
+        """
+        header = {"createdAt": time.time(), "sections": {}}
+        bodies = []
+        offset = 0
+        for resource, (resource_version, objects) in sections.items():
+            body = orjson.dumps(objects, default=record_default)
+            header["sections"][resource] = {"resourceVersion": resource_version, "offset": offset,
+                                            "length": len(body), "count": len(objects)}
+            bodies.append(body)
+            offset += len(body)
+        header_bytes = orjson.dumps(header)
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "wb") as f:
+            f.write(SNAPSHOT_MAGIC)
+            f.write(_HEADER_LENGTH.pack(len(header_bytes)))
+            f.write(header_bytes)
+            for body in bodies:
+                f.write(body)
+        os.replace(temporary_path, self.path)
@@ -0,0 +1,27 @@
+import os
+import sys
+
+import orjson
+import pytest
+
+# The backend modules are imported by their flat names, as main.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def use_fixture(tmp_path, monkeypatch):
+    """
+    Returns a function serving `{resource: [objects]}` to the k8s_client getters from a FixtureSource.
+    """
+    import k8s_client
+    from data_source import FixtureSource
+
+    def use(objects: dict):
+        path = tmp_path / "fixture.json"
+        path.write_bytes(orjson.dumps(objects))
+        source = FixtureSource(str(path))
+        monkeypatch.setattr(k8s_client, "_data_source", source)
+        k8s_client.getter_cache.clear()
+        return source
+    yield use
+    k8s_client.getter_cache.clear()
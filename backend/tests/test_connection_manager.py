@@ -0,0 +1,178 @@
+import asyncio
+
+import orjson
+import pytest
+
+from main import ConnectionManager, Subscriber, interval_endpoint, parse_interval
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, message):
+        self.sent.append(message)
+
+
+def subscribe(manager, endpoint, delta):
+    subscriber = Subscriber(FakeWebSocket(), delta)
+    manager.add_subscriber(endpoint, subscriber, endpoint)
+    return subscriber
+
+
+def receive(subscriber):
+    message, subscriber.pending = subscriber.pending, None
+    return orjson.loads(message) if message is not None else None
+
+
+def test_full_subscribers_get_every_changed_payload():
+    async def run():
+        manager = ConnectionManager()
+        subscriber = subscribe(manager, "/ws/test", delta=False)
+        await manager.broadcast({"count": 1}, "/ws/test")
+        assert receive(subscriber) == {"count": 1}
+        await manager.broadcast({"count": 1}, "/ws/test")
+        # The snapshot is unchanged, but full subscribers keep getting the payload every tick
+        assert receive(subscriber) == {"count": 1}
+        assert manager.snapshots["/ws/test"].version == 1
+    asyncio.run(run())
+
+
+def test_delta_subscribers_get_a_snapshot_then_patches():
+    async def run():
+        manager = ConnectionManager()
+        subscriber = subscribe(manager, "/ws/test", delta=True)
+        await manager.broadcast({"items": [1, 2]}, "/ws/test")
+        assert receive(subscriber) == {"type": "snapshot", "version": 1, "data": {"items": [1, 2]}}
+        await manager.broadcast({"items": [1, 2]}, "/ws/test")
+        assert receive(subscriber) is None
+        await manager.broadcast({"items": [1, 2, 3]}, "/ws/test")
+        assert receive(subscriber) == {
+            "type": "patch", "version": 2, "base": 1,
+            "patch": [{"op": "add", "path": "/items/2", "value": 3}],
+        }
+    asyncio.run(run())
+
+
+def test_delta_subscriber_that_missed_a_version_is_resynced():
+    async def run():
+        manager = ConnectionManager()
+        subscriber = subscribe(manager, "/ws/test", delta=True)
+        await manager.broadcast({"count": 1}, "/ws/test")
+        receive(subscriber)
+        await manager.broadcast({"count": 2}, "/ws/test")
+        # The patch to version 2 is still unsent when version 3 is published
+        await manager.broadcast({"count": 3}, "/ws/test")
+        assert receive(subscriber) == {"type": "snapshot", "version": 3, "resync": True, "data": {"count": 3}}
+    asyncio.run(run())
+
+
+def test_new_subscriber_gets_the_latest_snapshot():
+    async def run():
+        manager = ConnectionManager()
+        subscribe(manager, "/ws/test", delta=False)
+        await manager.broadcast({"count": 1}, "/ws/test")
+        await manager.broadcast({"count": 2}, "/ws/test")
+        late = subscribe(manager, "/ws/test", delta=True)
+        await manager.send_latest(late.websocket, "/ws/test")
+        assert receive(late) == {"type": "snapshot", "version": 2, "data": {"count": 2}}
+    asyncio.run(run())
+
+
+def test_patches_are_only_computed_for_delta_subscribers():
+    snapshot, _ = ConnectionManager._serialize({"count": 2}, None, False, "/ws/test")
+    _, patch_message = ConnectionManager._serialize({"count": 3}, snapshot, False, "/ws/test")
+    assert patch_message is None
+    _, patch_message = ConnectionManager._serialize({"count": 3}, snapshot, True, "/ws/test")
+    assert orjson.loads(patch_message)["patch"] == [{"op": "replace", "path": "/count", "value": 3}]
+
+
+def test_last_subscriber_leaving_stops_the_publisher():
+    async def run():
+        manager = ConnectionManager()
+        subscriber = subscribe(manager, "/ws/test", delta=False)
+
+        async def fetch():
+            return {"count": 1}
+        manager.start_publisher("/ws/test", fetch, 60)
+        await asyncio.sleep(0.05)
+        assert receive(subscriber) == {"count": 1}
+        manager.disconnect(subscriber.websocket, "/ws/test")
+        assert manager.publishers == {} and manager.snapshots == {} and manager.active_connections == {}
+    asyncio.run(run())
+
+
+def test_slow_subscriber_only_gets_the_latest_message():
+    async def run():
+        manager = ConnectionManager()
+        slow, fast = subscribe(manager, "/ws/test", delta=False), subscribe(manager, "/ws/test", delta=False)
+        for count in range(3):
+            await manager.broadcast({"count": count}, "/ws/test")
+            receive(fast)
+        assert receive(slow) == {"count": 2}
+    asyncio.run(run())
+
+
+def test_send_loop_delivers_at_the_subscriber_pace():
+    async def run():
+        manager = ConnectionManager()
+        release = asyncio.Event()
+
+        class SlowWebSocket(FakeWebSocket):
+            async def send_text(self, message):
+                await release.wait()
+                self.sent.append(message)
+
+        subscriber = Subscriber(SlowWebSocket(), False)
+        manager.add_subscriber("/ws/test", subscriber, "/ws/test")
+        subscriber.sender = asyncio.create_task(manager._send_loop(subscriber, "/ws/test"))
+        await manager.broadcast({"count": 0}, "/ws/test")
+        await asyncio.sleep(0)
+        # The first message is being sent: the next ones replace each other in the outbox
+        for count in range(1, 4):
+            await manager.broadcast({"count": count}, "/ws/test")
+        release.set()
+        await asyncio.sleep(0.01)
+        assert [orjson.loads(message) for message in subscriber.websocket.sent] == [{"count": 0}, {"count": 3}]
+        manager.disconnect(subscriber.websocket, "/ws/test")
+    asyncio.run(run())
+
+
+def test_failed_send_disconnects_the_subscriber():
+    async def run():
+        manager = ConnectionManager()
+
+        class BrokenWebSocket(FakeWebSocket):
+            async def send_text(self, message):
+                raise ConnectionResetError()
+
+            async def close(self, code):
+                self.closed = code
+
+        subscriber = Subscriber(BrokenWebSocket(), False)
+        manager.add_subscriber("/ws/test", subscriber, "/ws/test")
+        subscriber.sender = asyncio.create_task(manager._send_loop(subscriber, "/ws/test"))
+        await manager.broadcast({"count": 0}, "/ws/test")
+        await asyncio.wait_for(subscriber.sender, 1)
+        assert manager.active_connections == {}
+        assert subscriber.websocket.closed == 1011
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, 5), ("", 5), ("0.1", 1), ("1", 1), ("3", 5), ("5", 5), ("7", 15), ("3600", 60),
+])
+def test_parse_interval_rounds_up_to_a_known_interval(value, expected):
+    assert parse_interval(value, 5) == expected
+
+
+@pytest.mark.parametrize("value", ["nan", "soon"])
+def test_parse_interval_rejects_invalid_values(value):
+    with pytest.raises(ValueError):
+        parse_interval(value, 5)
+
+
+def test_subscribers_asking_for_another_interval_get_their_own_endpoint():
+    assert interval_endpoint("/ws/cohorts", 5, 5) == "/ws/cohorts"
+    assert interval_endpoint("/ws/cohorts", 15, 5) == "/ws/cohorts?interval=15"
+    assert interval_endpoint("/ws/workloads?state=pending", 2, 5) == "/ws/workloads?state=pending&interval=2"
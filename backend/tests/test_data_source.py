@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+
+import orjson
+import pytest
+
+from data_source import RESOURCES, FixtureSource, create_data_source, record_fixture
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_importing_main_needs_no_kubernetes_configuration(tmp_path):
+    env = {**os.environ, "HOME": str(tmp_path), "KUBECONFIG": str(tmp_path / "missing"), "K8S_DATA_SOURCE": "informer"}
+    env.pop("KUBERNETES_SERVICE_HOST", None)
+    result = subprocess.run(
+        [sys.executable, "-c", "import main, k8s_client; print(k8s_client._data_source is None)"],
+        cwd=BACKEND, env=env, capture_output=True, text=True, timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "True"
+
+
+def test_unknown_data_source():
+    with pytest.raises(ValueError):
+        create_data_source("nope")
+
+
+def test_fixture_round_trip(tmp_path):
+    path = tmp_path / "fixture.json"
+    path.write_bytes(orjson.dumps({
+        "workloads": [{"metadata": {"namespace": "ns", "name": "w", "uid": "u", "resourceVersion": "1",
+                                    "managedFields": [{"manager": "kueue"}]},
+                       "spec": {"queueName": "lq"}, "status": {}}],
+        "nodes": [{"metadata": {"name": "n", "labels": {"pool": "a"}}, "spec": {}}],
+    }))
+    source = FixtureSource(str(path))
+    assert source.object_counts()["workloads"] == 1
+    assert source.fetch_workload("ns", "w")["spec"]["queueName"] == "lq"
+    assert "managedFields" not in source.fetch_workload("ns", "w")["metadata"]
+    assert source.fetch_workload("ns", "missing") is None
+
+    recorded = tmp_path / "recorded.json"
+    record_fixture(source, str(recorded))
+    assert set(orjson.loads(recorded.read_bytes())) == set(RESOURCES)
+    assert FixtureSource(str(recorded)).object_counts() == source.object_counts()
@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+from starlette.requests import Request
+
+import main
+from etag import ETagCache, content_etag, etag_matches, generation_etag
+
+
+def test_etags_are_weak_and_stable():
+    assert generation_etag([1, 2]) == generation_etag([1, 2])
+    assert generation_etag([1, 2]) != generation_etag([1, 3])
+    assert generation_etag([1, 2]).startswith('W/"')
+    assert content_etag(b"body") == content_etag(b"body") != content_etag(b"other")
+
+
+@pytest.mark.parametrize("if_none_match, expected", [
+    (None, False),
+    ("", False),
+    ('W/"abc"', True),
+    ('"abc"', True),
+    ('"other", W/"abc"', True),
+    ("*", True),
+    ('W/"abcd"', False),
+])
+def test_etag_matches_with_weak_comparison(if_none_match, expected):
+    assert etag_matches(if_none_match, 'W/"abc"') is expected
+
+
+def compute_counting(calls, body):
+    async def compute():
+        calls.append(body)
+        await asyncio.sleep(0.01)
+        return body
+    return compute
+
+
+def test_cache_reuses_the_body_while_the_etag_is_unchanged():
+    async def run():
+        cache, calls = ETagCache(max_bytes=100), []
+        assert await cache.get_or_compute("/a", "1", compute_counting(calls, b"one")) == b"one"
+        assert await cache.get_or_compute("/a", "1", compute_counting(calls, b"ignored")) == b"one"
+        assert await cache.get_or_compute("/a", "2", compute_counting(calls, b"two")) == b"two"
+        assert calls == [b"one", b"two"]
+        assert cache.size == 3
+    asyncio.run(run())
+
+
+def test_concurrent_requests_share_one_computation():
+    async def run():
+        cache, calls = ETagCache(max_bytes=100), []
+        bodies = await asyncio.gather(*(cache.get_or_compute("/a", "1", compute_counting(calls, b"one"))
+                                        for _ in range(5)))
+        assert bodies == [b"one"] * 5
+        assert calls == [b"one"]
+    asyncio.run(run())
+
+
+def test_failures_are_not_cached():
+    async def run():
+        cache = ETagCache(max_bytes=100)
+
+        async def fail():
+            raise RuntimeError("boom")
+        with pytest.raises(RuntimeError):
+            await cache.get_or_compute("/a", "1", fail)
+        assert await cache.get_or_compute("/a", "1", compute_counting([], b"one")) == b"one"
+    asyncio.run(run())
+
+
+def test_cache_is_bounded_by_bytes():
+    async def run():
+        cache = ETagCache(max_bytes=10)
+        for url in ("/a", "/b", "/c"):
+            await cache.get_or_compute(url, "1", compute_counting([], b"1234"))
+        assert list(cache._entries) == ["/b", "/c"]
+        assert cache.size == 8
+        # A body larger than the whole cache is served but not kept, and drops the stale entry of its URL
+        assert await cache.get_or_compute("/b", "2", compute_counting([], b"x" * 11)) == b"x" * 11
+        assert list(cache._entries) == ["/c"]
+        assert cache.size == 4
+    asyncio.run(run())
+
+
+def request(path, query_string=b"", headers=()):
+    return Request({"type": "http", "method": "GET", "path": path, "query_string": query_string,
+                    "headers": [(name.encode(), value.encode()) for name, value in headers]})
+
+
+def test_conditional_response(use_fixture, monkeypatch):
+    use_fixture({"localqueues": []})
+    monkeypatch.setattr(main, "etag_cache", ETagCache(max_bytes=1000))
+
+    async def run():
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            return {"items": []}
+
+        response = await main.conditional_response(request("/local-queues"), ("localqueues",), fetch)
+        assert response.status_code == 200 and response.body == b'{"items":[]}'
+        etag = response.headers["etag"]
+        assert response.headers["cache-control"] == "no-cache"
+
+        unchanged = await main.conditional_response(request("/local-queues", headers=[("if-none-match", etag)]),
+                                                    ("localqueues",), fetch)
+        assert unchanged.status_code == 304 and unchanged.headers["etag"] == etag
+
+        # Parameters the body does not depend on share its cache entry
+        await main.conditional_response(request("/local-queues", b"cacheBust=1"), ("localqueues",), fetch)
+        assert calls == [1]
+        assert list(main.etag_cache._entries) == ["/local-queues"]
+    asyncio.run(run())
+
+
+def test_cache_key_holds_the_canonical_query():
+    assert main.query_suffix({}) == ""
+    assert main.query_suffix({"state": "pending", "limit": 10}) == main.query_suffix({"limit": 10, "state": "pending"})
+    assert main.query_suffix(main.workload_query({"queue": "lq", "unknown": "x", "state": ""})) == "?queue_name=lq"
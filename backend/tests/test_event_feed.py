@@ -0,0 +1,93 @@
+import asyncio
+import threading
+
+import event_feed
+from event_feed import EventFeed, involved_object_key
+from main import workload_event_messages
+
+
+def event(name, workload="w", namespace="ns", reason="Admitted"):
+    return {"metadata": {"namespace": namespace, "name": name}, "reason": reason, "message": reason,
+            "type": "Normal", "lastTimestamp": "2024-01-01T00:00:00Z",
+            "involvedObject": {"kind": "Workload", "namespace": namespace, "name": workload}}
+
+
+async def drain(queue):
+    # Let the callbacks scheduled from other threads run
+    await asyncio.sleep(0.01)
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+
+def test_involved_object_key():
+    assert involved_object_key(event("e")) == "ns/w"
+    assert involved_object_key({"metadata": {"namespace": "ns"}, "involvedObject": {"name": "n"}}) == "ns/n"
+    assert involved_object_key({"metadata": {}}) is None
+
+
+def test_changes_reach_the_subscribers_of_their_object():
+    async def run():
+        feed = EventFeed()
+        mine, other = feed.subscribe("ns/w"), feed.subscribe("ns/other")
+        # The informer thread notifies the feed
+        thread = threading.Thread(target=lambda: (feed.upsert(event("e1")), feed.delete(event("e2"))))
+        thread.start()
+        thread.join()
+        assert await drain(mine) == [("upsert", event("e1")), ("delete", event("e2"))]
+        assert await drain(other) == []
+
+        feed.unsubscribe("ns/w", mine)
+        feed.upsert(event("e3"))
+        assert await drain(mine) == []
+        assert feed._subscribers == {"ns/other": {other: asyncio.get_running_loop()}}
+    asyncio.run(run())
+
+
+def test_relist_resyncs_every_subscriber():
+    async def run():
+        feed = EventFeed()
+        first, second = feed.subscribe("ns/w"), feed.subscribe("ns/other")
+        feed.replace([])
+        assert await drain(first) == [("resync", None)]
+        assert await drain(second) == [("resync", None)]
+    asyncio.run(run())
+
+
+def test_overflowing_subscriber_is_resynced(monkeypatch):
+    monkeypatch.setattr(event_feed, "EVENT_QUEUE_SIZE", 2)
+
+    async def run():
+        feed = EventFeed()
+        queue = feed.subscribe("ns/w")
+        for index in range(3):
+            feed.upsert(event(f"e{index}"))
+        assert await drain(queue) == [("resync", None)]
+    asyncio.run(run())
+
+
+def test_workload_event_messages(use_fixture):
+    use_fixture({"events": [event("e1"), event("e2"), event("x", workload="other")]})
+
+    async def run():
+        updates = asyncio.Queue()
+        messages = workload_event_messages(updates, "ns", "w")
+        assert [item["name"] for item in await anext(messages)] == ["e1", "e2"]
+
+        # Changes queued while the previous message was being sent are coalesced, the last one per event winning
+        updates.put_nowait(("upsert", event("e3")))
+        updates.put_nowait(("upsert", event("e1", reason="Evicted")))
+        updates.put_nowait(("delete", event("e3")))
+        updates.put_nowait(("delete", event("e2")))
+        message = await anext(messages)
+        assert message["type"] == "events"
+        assert [(item["name"], item["reason"]) for item in message["upserted"]] == [("e1", "Evicted")]
+        assert message["deleted"] == ["e3", "e2"]
+
+        # A resync yields the full list again
+        updates.put_nowait(("upsert", event("e4")))
+        updates.put_nowait(("resync", None))
+        assert [item["name"] for item in await anext(messages)] == ["e1", "e2"]
+        await messages.aclose()
+    asyncio.run(run())
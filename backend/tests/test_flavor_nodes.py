@@ -0,0 +1,59 @@
+from k8s_client import get_nodes_for_flavor
+
+
+def node(name, labels, taints=()):
+    return {"metadata": {"name": name, "labels": labels}, "spec": {"taints": list(taints)},
+            "status": {"images": [{"names": ["image"]}]}}
+
+
+def flavor(name, node_labels=None, node_taints=None):
+    return {"metadata": {"name": name}, "spec": {"nodeLabels": node_labels or {}, "nodeTaints": node_taints or []}}
+
+
+GPU_TAINT = {"key": "gpu", "value": "true", "effect": "NoSchedule"}
+
+NODES = [
+    node("a1", {"pool": "a", "zone": "1"}),
+    node("a2", {"pool": "a", "zone": "2"}),
+    node("b1", {"pool": "b", "zone": "1"}),
+    node("gpu1", {"pool": "gpu", "zone": "1"}, [GPU_TAINT]),
+    node("gpu2", {"pool": "gpu", "zone": "1"}, [{**GPU_TAINT, "effect": "NoExecute"}]),
+]
+
+
+def names(nodes):
+    return sorted(item["name"] for item in nodes)
+
+
+def test_nodes_matching_every_label(use_fixture):
+    use_fixture({"nodes": NODES, "resourceflavors": [flavor("a", {"pool": "a"}), flavor("a1", {"pool": "a", "zone": "1"})]})
+    assert names(get_nodes_for_flavor.uncached("a")) == ["a1", "a2"]
+    assert names(get_nodes_for_flavor.uncached("a1")) == ["a1"]
+
+
+def test_nodes_matching_taints_with_their_value_and_effect(use_fixture):
+    use_fixture({"nodes": NODES, "resourceflavors": [flavor("gpu", {"pool": "gpu"}, [GPU_TAINT])]})
+    nodes = get_nodes_for_flavor.uncached("gpu")
+    assert names(nodes) == ["gpu1"]
+    # Nodes are reported with their labels and taints only
+    assert nodes[0] == {"name": "gpu1", "labels": {"pool": "gpu", "zone": "1"}, "taints": [GPU_TAINT]}
+
+
+def test_flavor_without_requirements_matches_every_node(use_fixture):
+    use_fixture({"nodes": NODES, "resourceflavors": [flavor("any")]})
+    assert names(get_nodes_for_flavor.uncached("any")) == ["a1", "a2", "b1", "gpu1", "gpu2"]
+
+
+def test_unknown_flavor_or_label_matches_nothing(use_fixture):
+    use_fixture({"nodes": NODES, "resourceflavors": [flavor("c", {"pool": "c"})]})
+    assert get_nodes_for_flavor.uncached("c") == []
+    assert get_nodes_for_flavor.uncached("missing") == []
+
+
+def test_node_changes_update_the_matches(use_fixture):
+    source = use_fixture({"nodes": NODES, "resourceflavors": [flavor("a", {"pool": "a"})]})
+    nodes = source.store("nodes")
+    nodes.upsert(node("a2", {"pool": "b"}))
+    nodes.upsert(node("a3", {"pool": "a"}))
+    nodes.delete(node("a1", {}))
+    assert names(get_nodes_for_flavor.uncached("a")) == ["a3"]
@@ -0,0 +1,93 @@
+import math
+
+import pytest
+
+from history import History, Ring, parse_resolutions
+
+
+def test_ring_keeps_the_mean_of_each_bucket():
+    ring = Ring(step=10, capacity=4)
+    ring.add(100, 1)
+    ring.add(105, 3)
+    ring.add(110, 5)
+    assert ring.range(100, 119) == (10, [2.0, 5.0])
+
+
+def test_ring_wraps_around_and_keeps_the_last_buckets():
+    ring = Ring(step=10, capacity=4)
+    for bucket in range(10):
+        ring.add(bucket * 10, bucket)
+    assert ring.range(0, 99) == (6, [6.0, 7.0, 8.0, 9.0])
+    assert ring.range(70, 85) == (7, [7.0, 8.0])
+
+
+def test_ring_skipped_buckets_are_nan_after_wraparound():
+    ring = Ring(step=10, capacity=4)
+    for bucket in range(4):
+        ring.add(bucket * 10, bucket)
+    # Buckets 4 and 5 get no samples; their slots still hold buckets 0 and 1 from the previous lap
+    ring.add(60, 6)
+    first, values = ring.range(0, 69)
+    assert first == 3
+    assert values[0] == 3.0
+    assert math.isnan(values[1]) and math.isnan(values[2])
+    assert values[3] == 6.0
+
+
+def test_ring_gap_longer_than_capacity():
+    ring = Ring(step=10, capacity=4)
+    ring.add(0, 1)
+    ring.add(1000, 2)
+    first, values = ring.range(0, 1000)
+    assert first == 97
+    assert all(math.isnan(value) for value in values[:3])
+    assert values[3] == 2.0
+
+
+def test_ring_ignores_the_clock_going_back():
+    ring = Ring(step=10, capacity=4)
+    ring.add(50, 1)
+    ring.add(30, 100)
+    assert ring.range(0, 60) == (5, [1.0])
+
+
+def test_empty_ring():
+    assert Ring(step=10, capacity=4).range(100, 200) == (10, [])
+
+
+def test_parse_resolutions():
+    assert parse_resolutions("60:10,5:720") == [(5, 720), (60, 10)]
+    for value in ("", "5", "0:10", "5:-1"):
+        with pytest.raises(ValueError):
+            parse_resolutions(value)
+
+
+def test_history_pads_series_sampled_later():
+    history = History(resolutions=[(10, 10)])
+    history.record(100, {("flavor", "f"): {"pending": 1}})
+    history.record(110, {("flavor", "f"): {"pending": 2, "admitted": 5}})
+    assert history.query("flavor", "f", 100, 119, step=10) == {
+        "step": 10,
+        "start": 100,
+        "metrics": {"pending": [1.0, 2.0], "admitted": [None, 5.0]},
+    }
+    assert history.query("flavor", "missing", 100, 119, step=10) is None
+    with pytest.raises(ValueError):
+        history.query("flavor", "f", 100, 119, step=7)
+
+
+def test_history_drops_series_no_longer_sampled():
+    history = History(resolutions=[(10, 10)])
+    history.record(100, {("flavor", "old"): {"pending": 1}})
+    history.record(300, {("flavor", "new"): {"pending": 1}})
+    assert history.query("flavor", "old", 0, 300, step=10) is None
+    assert history.stats()["series"] == 1
+
+
+def test_history_respects_the_memory_budget():
+    # A series is one ring of 10 doubles, so 80 bytes hold a single one
+    history = History(resolutions=[(10, 10)], memory_budget=80)
+    history.record(100, {("flavor", "a"): {"pending": 1}, ("flavor", "b"): {"pending": 1}})
+    stats = history.stats()
+    assert stats["series"] == 1
+    assert stats["skipped"] == 1
@@ -0,0 +1,41 @@
+from informer import Store, label_index
+
+
+def obj(name, team, rv="1"):
+    return {"metadata": {"namespace": "ns", "name": name, "resourceVersion": rv, "labels": {"team": team}}}
+
+
+def names(objs):
+    return [item["metadata"]["name"] for item in objs]
+
+
+def make_store():
+    store = Store()
+    store.add_indexer("team", label_index("team"))
+    store.replace([obj("a", "x"), obj("b", "x"), obj("c", "y")])
+    return store
+
+
+def test_updates_keep_the_position_in_the_store_and_indexes():
+    store = make_store()
+    store.upsert(obj("a", "x", rv="2"))
+    assert names(store.list()) == ["a", "b", "c"]
+    assert names(store.by_index("team", "x")) == ["a", "b"]
+    assert store.get("ns/a")["metadata"]["resourceVersion"] == "2"
+
+
+def test_updates_move_objects_between_index_values():
+    store = make_store()
+    generation = store.generation
+    store.upsert(obj("a", "y", rv="2"))
+    assert names(store.by_index("team", "x")) == ["b"]
+    assert names(store.by_index("team", "y")) == ["c", "a"]
+    assert store.generation == generation + 1
+
+
+def test_delete_removes_from_indexes():
+    store = make_store()
+    store.delete(obj("b", "x"))
+    assert names(store.list()) == ["a", "c"]
+    assert names(store.by_index("team", "x")) == ["a"]
+    assert store.get("ns/b") is None
@@ -0,0 +1,99 @@
+import copy
+
+import pytest
+
+from json_patch import make_patch
+
+
+def _parent(document, path):
+    tokens = [token.replace("~1", "/").replace("~0", "~") for token in path.split("/")[1:]]
+    parent = document
+    for token in tokens[:-1]:
+        parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+    return parent, tokens[-1]
+
+
+def apply_patch(document, patch):
+    document = copy.deepcopy(document)
+    for op in patch:
+        if op["path"] == "":
+            assert op["op"] == "replace"
+            document = copy.deepcopy(op["value"])
+            continue
+        parent, token = _parent(document, op["path"])
+        if isinstance(parent, list):
+            index = int(token)
+            if op["op"] == "add":
+                parent.insert(index, copy.deepcopy(op["value"]))
+            elif op["op"] == "remove":
+                del parent[index]
+            else:
+                parent[index] = copy.deepcopy(op["value"])
+        elif op["op"] == "remove":
+            del parent[token]
+        else:
+            parent[token] = copy.deepcopy(op["value"])
+    return document
+
+
+CASES = [
+    ({"a": 1}, {"a": 1}),
+    ({"a": 1}, {"a": 2}),
+    ({"a": 1, "b": 2}, {"b": 2, "c": 3}),
+    ({"a/b": {"c~d": 1}}, {"a/b": {"c~d": 2}}),
+    ([1, 2, 3], [1, 2, 3, 4]),
+    ([1, 2, 3], [0, 1, 2, 3]),
+    ([1, 2, 3, 4], [1, 4]),
+    ([1, 2, 3], [3, 2, 1]),
+    ([], [{"name": "a"}]),
+    ([{"name": "a", "count": 1}, {"name": "b", "count": 2}], [{"name": "a", "count": 1}, {"name": "b", "count": 5}]),
+    ({"items": [1, 2]}, {"items": None}),
+    ({"value": 1}, {"value": 1.0}),
+    ({"value": True}, {"value": 1}),
+    ([1, 2, 3], [1, 2.0, 3]),
+    ([1, True], [1, 1]),
+    ([{"count": 1}, {"count": 2}], [{"count": 1.0}, {"count": 2}]),
+    ([[0], [1]], [[0], [True]]),
+    ([1], {"a": 1}),
+]
+
+
+@pytest.mark.parametrize("old, new", CASES)
+def test_patch_turns_old_into_new(old, new):
+    assert apply_patch(old, make_patch(old, new)) == new
+
+
+@pytest.mark.parametrize("old, new", [([1, 2, 3], [1, 2.0, 3]), ([{"ready": 1}], [{"ready": True}])])
+def test_values_of_another_type_are_replaced(old, new):
+    patch = make_patch(old, new)
+    assert patch
+    assert all(type(a) is type(b) for a, b in zip(_leaves(apply_patch(old, patch)), _leaves(new)))
+
+
+def _leaves(document):
+    if isinstance(document, dict):
+        return [leaf for value in document.values() for leaf in _leaves(value)]
+    if isinstance(document, list):
+        return [leaf for value in document for leaf in _leaves(value)]
+    return [document]
+
+
+def test_unchanged_documents_give_an_empty_patch():
+    document = {"items": [{"metadata": {"name": "w"}}]}
+    assert make_patch(document, copy.deepcopy(document)) == []
+
+
+def test_single_insertion_does_not_rewrite_following_elements():
+    old = [{"name": str(index)} for index in range(100)]
+    new = old[:10] + [{"name": "new"}] + old[10:]
+    assert make_patch(old, new) == [{"op": "add", "path": "/10", "value": {"name": "new"}}]
+
+
+def test_changes_inside_list_elements_are_nested():
+    old = [{"name": "a", "status": {"pending": 1}}]
+    new = [{"name": "a", "status": {"pending": 2}}]
+    assert make_patch(old, new) == [{"op": "replace", "path": "/0/status/pending", "value": 2}]
+
+
+def test_keys_are_escaped():
+    assert make_patch({"a/b~c": 1}, {}) == [{"op": "remove", "path": "/a~1b~0c"}]
@@ -0,0 +1,77 @@
+import pytest
+
+from query import paginate, parse_fields, parse_label_selector, project
+
+
+def obj(namespace, name, **fields):
+    return {"metadata": {"namespace": namespace, "name": name}, **fields}
+
+
+@pytest.mark.parametrize("selector, labels, expected", [
+    ("team=a", {"team": "a"}, True),
+    ("team==a", {"team": "b"}, False),
+    ("team!=a", {}, True),
+    ("team", {"team": ""}, True),
+    ("!team", {"team": "a"}, False),
+    ("!team", {}, True),
+    ("team in (a, b)", {"team": "b"}, True),
+    ("team in (a,b)", {}, False),
+    ("team notin (a,b)", {}, True),
+    ("team notin (a,b)", {"team": "a"}, False),
+    ("team in (a,b),tier=gold", {"team": "a", "tier": "gold"}, True),
+    ("team in (a,b),tier=gold", {"team": "a", "tier": "silver"}, False),
+    ("", {"team": "a"}, True),
+])
+def test_parse_label_selector(selector, labels, expected):
+    assert parse_label_selector(selector)(labels) is expected
+
+
+@pytest.mark.parametrize("selector", ["bad sel", "!team=a", "team in a", "team=(a)", "=a"])
+def test_parse_label_selector_rejects_invalid_syntax(selector):
+    with pytest.raises(ValueError):
+        parse_label_selector(selector)
+
+
+def test_parse_fields():
+    assert parse_fields("metadata.name, status.conditions,") == [("metadata", "name"), ("status", "conditions")]
+    with pytest.raises(ValueError):
+        parse_fields("metadata..name")
+
+
+def test_project_keeps_only_existing_paths():
+    workload = {"metadata": {"name": "w", "uid": "u"}, "spec": {"podSets": [{"count": 1}]}, "status": None}
+    projected = project(workload, [("metadata", "name"), ("spec", "podSets"), ("status", "conditions"), ("missing",)])
+    assert projected == {"metadata": {"name": "w"}, "spec": {"podSets": [{"count": 1}]}}
+    # The original is left untouched
+    assert workload["metadata"] == {"name": "w", "uid": "u"}
+
+
+def test_paginate_without_limit_keeps_order():
+    objs = [obj("b", "x"), obj("a", "y")]
+    assert paginate(objs) == (objs, None)
+
+
+def test_paginate_walks_pages_in_key_order():
+    objs = [obj("ns", f"w{index}") for index in (3, 1, 4, 0, 2)]
+    names, token = [], None
+    while True:
+        page, token = paginate(objs, 2, token)
+        names.append([item["metadata"]["name"] for item in page])
+        if token is None:
+            break
+    assert names == [["w0", "w1"], ["w2", "w3"], ["w4"]]
+
+
+def test_paginate_token_survives_changes_between_pages():
+    objs = [obj("ns", f"w{index}") for index in range(4)]
+    page, token = paginate(objs, 2)
+    # w1, the last object returned, is deleted and an object sorting before the token is added
+    objs = [obj("ns", "a"), objs[0], objs[2], objs[3]]
+    page, token = paginate(objs, 2, token)
+    assert [item["metadata"]["name"] for item in page] == ["w2", "w3"]
+    assert token is None
+
+
+def test_paginate_rejects_invalid_token():
+    with pytest.raises(ValueError):
+        paginate([obj("ns", "w")], 1, "not base64!")
@@ -0,0 +1,62 @@
+import os
+import time
+
+from snapshot import SnapshotFile
+from workload_record import compact_workload
+
+
+def workload(name):
+    return {
+        "metadata": {"namespace": "ns", "name": name, "uid": f"uid-{name}", "resourceVersion": "7",
+                     "labels": {"kueue.x-k8s.io/queue-name": "lq"}},
+        "spec": {"queueName": "lq", "priority": 10},
+        "status": {"conditions": [{"type": "QuotaReserved", "status": "True"}]},
+    }
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "snapshot")
+    records = [compact_workload(workload("a")), compact_workload(workload("b"))]
+    queues = [{"metadata": {"name": "cq"}, "spec": {"cohort": "c"}}]
+    SnapshotFile(path, ["workloads", "clusterqueues"], 60).save({
+        "workloads": ("12", records),
+        "clusterqueues": ("13", queues),
+    })
+    assert not os.path.exists(f"{path}.tmp")
+
+    sections = SnapshotFile(path, ["workloads", "clusterqueues", "localqueues"], 60).load()
+    assert set(sections) == {"workloads", "clusterqueues"}
+    assert sections["clusterqueues"] == ("13", queues)
+    resource_version, objects = sections["workloads"]
+    assert resource_version == "12"
+    assert objects == [record.to_dict() for record in records]
+    assert [compact_workload(obj).to_dict() for obj in objects] == objects
+
+
+def test_only_requested_resources_are_loaded(tmp_path):
+    path = str(tmp_path / "snapshot")
+    SnapshotFile(path, ["a", "b"], 60).save({"a": ("1", [{"x": 1}]), "b": ("2", [])})
+    assert SnapshotFile(path, ["b"], 60).load() == {"b": ("2", [])}
+
+
+def test_missing_file(tmp_path):
+    assert SnapshotFile(str(tmp_path / "missing"), ["a"], 60).load() == {}
+
+
+def test_old_snapshot_is_ignored(tmp_path, monkeypatch):
+    path = str(tmp_path / "snapshot")
+    SnapshotFile(path, ["a"], 60).save({"a": ("1", [])})
+    real_time = time.time
+    monkeypatch.setattr(time, "time", lambda: real_time() + 120)
+    assert SnapshotFile(path, ["a"], 60).load() == {}
+
+
+def test_corrupt_snapshot_is_ignored(tmp_path):
+    path = tmp_path / "snapshot"
+    SnapshotFile(str(path), ["a"], 60).save({"a": ("1", [{"x": 1}])})
+    path.write_bytes(path.read_bytes()[:-3])
+    assert SnapshotFile(str(path), ["a"], 60).load() == {}
+    path.write_bytes(b"garbage")
+    assert SnapshotFile(str(path), ["a"], 60).load() == {}
+    path.write_bytes(b"")
+    assert SnapshotFile(str(path), ["a"], 60).load() == {}
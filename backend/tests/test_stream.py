@@ -0,0 +1,123 @@
+import asyncio
+
+import orjson
+import pytest
+
+import main
+from main import EVENTS_ROUTE, StreamConnection, resolve_topic
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, message):
+        self.sent.append(orjson.loads(message))
+
+
+@pytest.mark.parametrize("topic, endpoint, route", [
+    ("dashboard", "/ws/workloads/dashboard", "/ws/workloads/dashboard"),
+    ("cohorts", "/ws/cohorts", "/ws/cohorts"),
+    ("workloads", "/ws/workloads", "/ws/workloads"),
+    ("workloads?state=pending&limit=10", "/ws/workloads?limit=10&state=pending", "/ws/workloads"),
+    ("cluster-queue:cq", "/ws/cluster-queue/cq", "/ws/cluster-queue/{cluster_queue_name}"),
+    ("local-queue:ns/lq", "/ws/local-queue/ns/lq", "/ws/local-queue/{namespace}/{queue_name}"),
+    ("local-queue:ns/lq/workloads?state=admitted", "/ws/local-queue/ns/lq/workloads?state=admitted",
+     "/ws/local-queue/{namespace}/{queue_name}/workloads"),
+    ("workload:ns/w", "/ws/workload/ns/w", "/ws/workload/{namespace}/{workload_name}"),
+    ("workload:ns/w/events", "/ws/workload/ns/w/events", EVENTS_ROUTE),
+    ("pods:uid", "/ws/workload/uid/pods", "/ws/workload/{job_uid}/pods"),
+])
+def test_resolve_topic(topic, endpoint, route):
+    resolved = resolve_topic(topic)
+    assert (resolved.endpoint, resolved.route) == (endpoint, route)
+    assert resolved.events_of == (("ns", "w") if route == EVENTS_ROUTE else None)
+
+
+@pytest.mark.parametrize("topic", [
+    "nope", "cohort:", "cohort:a/b", "local-queue:ns", "local-queue:ns//workloads", "workload:ns/w/pods",
+    "cohorts?state=pending", "workloads?state=unknown", "dashboard:x",
+])
+def test_resolve_topic_rejects_invalid_topics(topic):
+    with pytest.raises(ValueError):
+        resolve_topic(topic)
+
+
+QUEUE = {"metadata": {"name": "cq", "resourceVersion": "1"},
+         "spec": {"cohort": "c", "resourceGroups": [{"flavors": [{"name": "f", "resources": []}]}]},
+         "status": {"pendingWorkloads": 1, "admittedWorkloads": 0}}
+
+
+def test_stream_connection_tags_messages_and_shares_publishers(use_fixture):
+    use_fixture({"clusterqueues": [QUEUE]})
+
+    async def run():
+        first, second = StreamConnection(FakeWebSocket()), StreamConnection(FakeWebSocket())
+        senders = [asyncio.create_task(connection.send_loop()) for connection in (first, second)]
+        try:
+            await first.subscribe("cohorts")
+            await first.subscribe("cohort:c", delta=True)
+            await second.subscribe("cohorts")
+            assert set(main.manager.publishers) == {"/ws/cohorts", "/ws/cohort/c"}
+            await asyncio.sleep(0.2)
+
+            messages = {message["topic"]: message["data"] for message in first.websocket.sent}
+            assert messages["cohorts"] == [{"name": "c", "clusterQueues": [{"name": "cq"}]}]
+            assert messages["cohort:c"]["type"] == "snapshot"
+            assert messages["cohort:c"]["data"]["pendingWorkloads"] == 1
+            assert second.websocket.sent == [{"topic": "cohorts", "data": messages["cohorts"]}]
+
+            with pytest.raises(ValueError):
+                await first.subscribe("cohorts?interval=5")
+            with pytest.raises(ValueError):
+                await first.subscribe("cohort:c", interval="nan")
+        finally:
+            for sender in senders:
+                sender.cancel()
+            first.close()
+        # The publisher of a topic stops with its last subscriber
+        assert set(main.manager.publishers) == {"/ws/cohorts"}
+        second.close()
+        assert main.manager.publishers == {}
+    asyncio.run(run())
+
+
+def test_stream_connection_topic_limit(use_fixture, monkeypatch):
+    use_fixture({"clusterqueues": [QUEUE]})
+    monkeypatch.setattr(main, "STREAM_MAX_TOPICS", 1)
+
+    async def run():
+        connection = StreamConnection(FakeWebSocket())
+        try:
+            await connection.subscribe("cohorts")
+            # Subscribing again replaces the subscription rather than adding one
+            await connection.subscribe("cohorts", interval="60")
+            assert connection.endpoints == {"cohorts": "/ws/cohorts?interval=60"}
+            with pytest.raises(ValueError):
+                await connection.subscribe("cluster-queues")
+        finally:
+            connection.close()
+        assert main.manager.publishers == {}
+    asyncio.run(run())
+
+
+def test_events_topic_is_pushed_from_the_event_feed(use_fixture):
+    event = {"metadata": {"namespace": "ns", "name": "e1"}, "reason": "Admitted", "message": "ok", "type": "Normal",
+             "involvedObject": {"namespace": "ns", "name": "w"}}
+    source = use_fixture({"events": [event]})
+
+    async def run():
+        connection = StreamConnection(FakeWebSocket())
+        try:
+            await connection.subscribe("workload:ns/w/events")
+            assert connection.endpoints == {}
+            await asyncio.sleep(0.1)
+            source.store("events").upsert({**event, "metadata": {"namespace": "ns", "name": "e2"}})
+            await asyncio.sleep(0.1)
+        finally:
+            connection.close()
+        first, update = connection.websocket.sent
+        assert first["topic"] == update["topic"] == "workload:ns/w/events"
+        assert [item["name"] for item in first["data"]] == ["e1"]
+        assert [item["name"] for item in update["data"]["upserted"]] == ["e2"]
+    asyncio.run(run())
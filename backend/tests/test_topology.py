@@ -0,0 +1,99 @@
+from topology import CohortTopology
+
+
+def cluster_queue(name, cohort=None, flavors=None, pending=0, admitted=0, usage=None):
+    """
+    `flavors` maps a flavor name to its `{resource: nominalQuota}`, `usage` to its `{resource: total}`.
+    """
+    return {
+        "metadata": {"name": name},
+        "spec": {
+            "cohort": cohort,
+            "resourceGroups": [{
+                "flavors": [
+                    {"name": flavor, "resources": [{"name": resource, "nominalQuota": quota}
+                                                   for resource, quota in quotas.items()]}
+                    for flavor, quotas in (flavors or {}).items()
+                ],
+            }],
+        },
+        "status": {
+            "pendingWorkloads": pending,
+            "admittedWorkloads": admitted,
+            "flavorsUsage": [
+                {"name": flavor, "resources": [{"name": resource, "total": total, "borrowed": "0"}
+                                               for resource, total in totals.items()]}
+                for flavor, totals in (usage or {}).items()
+            ],
+        },
+    }
+
+
+def make_topology():
+    topology = CohortTopology()
+    topology.replace([
+        cluster_queue("a", "c1", {"f1": {"cpu": "4"}, "f2": {"cpu": "2"}}, pending=3, admitted=1, usage={"f1": {"cpu": "1"}}),
+        cluster_queue("b", "c1", {"f1": {"cpu": "500m"}}, pending=2, admitted=5),
+        cluster_queue("c", "c2", {"f2": {"cpu": "1"}}),
+    ])
+    return topology
+
+
+def test_cohort_aggregates():
+    cohort = make_topology().cohort("c1")
+    assert cohort["clusterQueues"] == ["a", "b"]
+    assert (cohort["pendingWorkloads"], cohort["admittedWorkloads"]) == (5, 6)
+    f1 = next(entry for entry in cohort["resources"] if entry["flavor"] == "f1")
+    assert f1 == {"flavor": "f1", "resource": "cpu", "nominalQuota": 4.5, "usage": 1, "borrowed": 0}
+
+
+def test_flavor_reports_workload_counts_per_queue():
+    topology = make_topology()
+    f1, f2 = topology.flavor("f1"), topology.flavor("f2")
+    assert [(queue["queueName"], queue["pendingWorkloads"], queue["admittedWorkloads"]) for queue in f1["queues"]] == [
+        ("a", 3, 1), ("b", 2, 5)]
+    assert f1["queues"][0]["quota"] == [{"resource": "cpu", "nominalQuota": "4"}]
+    assert [queue["queueName"] for queue in f2["queues"]] == ["a", "c"]
+    assert "pendingWorkloads" not in f1
+    assert f2["resources"] == [{"flavor": "f2", "resource": "cpu", "nominalQuota": 3, "usage": 0, "borrowed": 0}]
+
+
+def test_status_update_keeps_the_order_and_refreshes_views():
+    topology = make_topology()
+    topology.upsert(cluster_queue("a", "c1", {"f1": {"cpu": "4"}, "f2": {"cpu": "2"}}, pending=0, admitted=4))
+    assert [cohort["name"] for cohort in topology.cohorts()] == ["c1", "c2"]
+    assert topology.cohort("c1")["clusterQueues"] == ["a", "b"]
+    assert topology.cohort("c1")["pendingWorkloads"] == 2
+    assert [queue["queueName"] for queue in topology.flavor("f1")["queues"]] == ["a", "b"]
+    assert topology.flavor("f2")["queues"][0]["admittedWorkloads"] == 4
+
+
+def test_moving_a_queue_to_another_cohort_and_flavor():
+    topology = make_topology()
+    topology.upsert(cluster_queue("c", "c1", {"f3": {"cpu": "1"}}))
+    assert [cohort["name"] for cohort in topology.cohorts()] == ["c1"]
+    assert topology.cohort("c2") is None
+    assert topology.cohort("c1")["clusterQueues"] == ["a", "b", "c"]
+    assert [queue["queueName"] for queue in topology.flavor("f2")["queues"]] == ["a"]
+    assert [queue["queueName"] for queue in topology.flavor("f3")["queues"]] == ["c"]
+
+
+def test_delete_drops_empty_cohorts_and_flavors():
+    topology = make_topology()
+    topology.delete(cluster_queue("c"))
+    topology.delete(cluster_queue("a"))
+    assert topology.cohort("c2") is None
+    assert topology.flavor("f2") is None
+    assert topology.cohort("c1")["clusterQueues"] == ["b"]
+    assert topology.cohort("c1")["pendingWorkloads"] == 2
+    # Deleting an unknown queue is a no-op
+    topology.delete(cluster_queue("missing"))
+    assert [cohort["name"] for cohort in topology.cohorts()] == ["c1"]
+
+
+def test_new_queue_is_linked():
+    topology = make_topology()
+    topology.upsert(cluster_queue("d", "c2", {"f1": {"cpu": "1"}}, pending=7))
+    assert topology.cohort("c2")["clusterQueues"] == ["c", "d"]
+    assert topology.cohort("c2")["pendingWorkloads"] == 7
+    assert [queue["queueName"] for queue in topology.flavor("f1")["queues"]] == ["a", "b", "d"]
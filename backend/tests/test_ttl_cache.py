@@ -0,0 +1,122 @@
+import threading
+import time
+
+import pytest
+
+from ttl_cache import TTLCache
+
+
+def test_concurrent_callers_share_one_computation():
+    cache = TTLCache(ttl=60, max_entries=10)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "value"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(cache.get_or_compute("key", compute)))
+    leader.start()
+    assert started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(cache.get_or_compute("key", compute)))
+                 for _ in range(4)]
+    for follower in followers:
+        follower.start()
+    # Let the followers reach the in-flight future before the computation completes
+    while cache.stats()["coalesced"] < len(followers):
+        time.sleep(0.001)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert results == ["value"] * 5
+    assert len(calls) == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.get_or_compute("key", compute) == "value"
+    assert cache.stats()["hits"] == 1
+
+
+def test_failures_are_shared_and_not_cached():
+    cache = TTLCache(ttl=60, max_entries=10)
+    started, release = threading.Event(), threading.Event()
+
+    def fail():
+        started.set()
+        release.wait(5)
+        raise RuntimeError("boom")
+
+    errors = []
+
+    def call():
+        try:
+            cache.get_or_compute("key", fail)
+        except RuntimeError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    assert started.wait(5)
+    follower = threading.Thread(target=call)
+    follower.start()
+    while cache.stats()["coalesced"] < 1:
+        time.sleep(0.001)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert len(errors) == 2 and errors[0] is errors[1]
+    assert cache.get_or_compute("key", lambda: "retried") == "retried"
+
+
+def test_entries_expire_and_are_purged(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = TTLCache(ttl=10, max_entries=10)
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("b", lambda: 2)
+    now[0] += 11
+    assert cache.get_or_compute("a", lambda: 3) == 3
+    stats = cache.stats()
+    # `b` was dropped along with the expired `a` although nobody asked for it again
+    assert stats["entries"] == 1
+    assert stats["expirations"] == 2
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = TTLCache(ttl=60, max_entries=2)
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("b", lambda: 2)
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("c", lambda: 3)
+    assert cache.get_or_compute("a", lambda: "recomputed") == 1
+    assert cache.get_or_compute("b", lambda: "recomputed") == "recomputed"
+    assert cache.stats()["evictions"] == 2
+
+
+def test_memoize_keys_by_arguments():
+    cache = TTLCache(ttl=60, max_entries=10)
+    calls = []
+
+    @cache.memoize
+    def double(value, factor=2):
+        calls.append(value)
+        return value * factor
+
+    assert double(2) == 4
+    assert double(2) == 4
+    assert double(2, factor=3) == 6
+    assert calls == [2, 2]
+    assert double.uncached(5) == 10
+
+
+@pytest.mark.parametrize("ttl", [0, -1])
+def test_memoize_is_disabled_without_ttl(ttl):
+    cache = TTLCache(ttl=ttl, max_entries=10)
+
+    def identity(value):
+        return value
+
+    assert cache.memoize(identity) is identity
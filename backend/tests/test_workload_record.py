@@ -0,0 +1,129 @@
+from collections import OrderedDict
+
+import orjson
+import pytest
+from kubernetes import client
+
+import k8s_client
+from k8s_client import get_workload_by_name
+from workload_record import WorkloadRecord, compact_workload, record_default
+
+
+def workload(name="w", resource_version="1", conditions=(), **status):
+    return {
+        "metadata": {
+            "namespace": "ns", "name": name, "uid": f"uid-{name}", "resourceVersion": resource_version,
+            "creationTimestamp": "2024-01-01T00:00:00Z",
+            "labels": {"kueue.x-k8s.io/job-uid": "job", "team": "a"},
+            "ownerReferences": [{"apiVersion": "batch/v1", "kind": "Job", "name": "job", "uid": "job"}],
+            "managedFields": [{"manager": "kueue"}],
+        },
+        "spec": {"queueName": "lq", "priority": 10, "podSets": [{"name": "main", "count": 2, "template": {}}]},
+        "status": {"conditions": [{"type": type_, "status": value, "reason": "r", "message": "m",
+                                   "lastTransitionTime": "t"} for type_, value in conditions], **status},
+    }
+
+
+def test_round_trip():
+    record = compact_workload(workload(conditions=[("Admitted", "True")], admission={"clusterQueue": "cq"},
+                                       preempted=False))
+    as_dict = record.to_dict()
+    assert as_dict["metadata"]["labels"] == {"kueue.x-k8s.io/job-uid": "job", "team": "a"}
+    assert "managedFields" not in as_dict["metadata"]
+    assert as_dict["spec"] == {"podSets": [{"name": "main", "count": 2}], "queueName": "lq", "priority": 10}
+    assert as_dict["status"]["admission"] == {"clusterQueue": "cq"}
+    assert as_dict["status"]["preempted"] is False
+    assert WorkloadRecord(as_dict).to_dict() == as_dict
+    assert orjson.loads(orjson.dumps([record], default=record_default)) == [as_dict]
+
+
+def test_missing_fields():
+    record = WorkloadRecord({"metadata": {"name": "w"}})
+    assert record.key == "w"
+    assert record.to_dict() == {
+        "metadata": {"name": "w", "namespace": None, "uid": None, "resourceVersion": None, "creationTimestamp": None},
+        "spec": {"podSets": []},
+        "status": {"conditions": []},
+    }
+
+
+@pytest.mark.parametrize("conditions, state", [
+    ((), "pending"),
+    ((("QuotaReserved", "True"),), "pending"),
+    ((("Admitted", "True"),), "admitted"),
+    ((("Admitted", "False"),), "pending"),
+    ((("Admitted", "True"), ("Finished", "True")), "finished"),
+])
+def test_state(conditions, state):
+    assert compact_workload(workload(conditions=conditions)).state == state
+
+
+def test_repeated_strings_are_shared():
+    first, second = compact_workload(workload("a")), compact_workload(workload("b"))
+    assert first.queue_name is second.queue_name
+    assert next(iter(first.labels)) is next(iter(second.labels))
+    assert first.job_uid == "job" and first.key == "ns/a"
+
+
+def test_record_default_rejects_other_types():
+    with pytest.raises(TypeError):
+        record_default(object())
+
+
+@pytest.fixture
+def counted_fetches(use_fixture, monkeypatch):
+    """
+    Serves one workload and its LocalQueue, and returns the list of the full workload fetches.
+    """
+    source = use_fixture({
+        "workloads": [workload()],
+        "localqueues": [{"metadata": {"namespace": "ns", "name": "lq"}, "spec": {"clusterQueue": "cq"}}],
+    })
+    monkeypatch.setattr(k8s_client, "_full_workloads", OrderedDict())
+    fetches = []
+
+    def fetch_workload(namespace, name):
+        fetches.append((namespace, name))
+        full = workload(resource_version=source.store("workloads").get(f"{namespace}/{name}").resource_version)
+        full["spec"]["podSets"][0]["template"] = {"spec": {"containers": [{"name": "main"}]}}
+        return full
+    monkeypatch.setattr(source, "fetch_workload", fetch_workload)
+    return source, fetches
+
+
+def test_detail_fetches_the_full_object_once_per_resource_version(counted_fetches):
+    source, fetches = counted_fetches
+    detail = get_workload_by_name.uncached("ns", "w")
+    assert detail["spec"]["podSets"][0]["template"] == {"spec": {"containers": [{"name": "main"}]}}
+    assert detail["clusterQueueName"] == "cq"
+    assert detail["preemption"] == {"preempted": False, "reason": "None"}
+    get_workload_by_name.uncached("ns", "w")
+    assert fetches == [("ns", "w")]
+    # The cached object is not modified by the detail view
+    assert "clusterQueueName" not in k8s_client._full_workloads[("ns/w", "1")]
+
+    source.store("workloads").upsert(compact_workload(workload(resource_version="2")))
+    assert get_workload_by_name.uncached("ns", "w")["metadata"]["resourceVersion"] == "2"
+    assert fetches == [("ns", "w")] * 2
+
+
+def test_detail_falls_back_to_the_record_when_the_api_server_fails(counted_fetches, monkeypatch):
+    source, _ = counted_fetches
+
+    def fail(namespace, name):
+        raise client.ApiException(status=503)
+    monkeypatch.setattr(source, "fetch_workload", fail)
+    detail = get_workload_by_name.uncached("ns", "w")
+    assert detail["spec"]["podSets"] == [{"name": "main", "count": 2}]
+    assert get_workload_by_name.uncached("ns", "missing") is None
+
+
+def test_full_workload_cache_is_bounded(counted_fetches, monkeypatch):
+    source, fetches = counted_fetches
+    monkeypatch.setattr(k8s_client, "FULL_WORKLOAD_CACHE_SIZE", 1)
+    get_workload_by_name.uncached("ns", "w")
+    source.store("workloads").upsert(compact_workload(workload("other")))
+    get_workload_by_name.uncached("ns", "other")
+    assert list(k8s_client._full_workloads) == [("ns/other", "1")]
+    get_workload_by_name.uncached("ns", "w")
+    assert fetches == [("ns", "w"), ("ns", "other"), ("ns", "w")]
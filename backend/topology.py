@@ -0,0 +1,234 @@
+import logging
+import threading
+from decimal import Decimal
+
+from kubernetes.utils import parse_quantity
+
+__all__ = ["CohortTopology"]
+
+
+def _quantity(value) -> Decimal:
+    try:
+        return parse_quantity(value)
+    except ValueError:
+        logging.warning(f"Ignoring invalid resource quantity {value!r}")
+        return Decimal(0)
+
+
+def _number(quantity: Decimal):
+    # Whole quantities (CPUs, bytes, GPUs) are returned as ints, milli-quantities as floats
+    return int(quantity) if quantity == quantity.to_integral_value() else float(quantity)
+
+
+def _add(totals: dict, flavor: str, resource: str, field: str, value):
+    entry = totals.setdefault((flavor, resource), {})
+    entry[field] = entry.get(field, Decimal(0)) + _quantity(value)
+
+
+def _summarize(cluster_queue: dict) -> dict:
+    """
+    Extracts what the cohort and flavor views need from a ClusterQueue: its cohort,
+    its quotas and usage by `(flavor, resource)` and its workload counts.
+    """
+    spec = cluster_queue.get("spec", {})
+    status = cluster_queue.get("status", {})
+    totals = {}
+    flavor_quotas = {}
+    for resource_group in spec.get("resourceGroups", []):
+        for flavor in resource_group.get("flavors", []):
+            flavor_name = flavor.get("name")
+            # Same shape as the `queues` entries of the resource flavor details
+            flavor_quotas.setdefault(flavor_name, [
+                {
+                    "resource": resource.get("name", "Unknown Resource"),
+                    "nominalQuota": resource.get("nominalQuota", "N/A")
+                }
+                for resource in flavor.get("resources", [])
+            ])
+            for resource in flavor.get("resources", []):
+                if "nominalQuota" in resource:
+                    _add(totals, flavor_name, resource.get("name"), "nominalQuota", resource["nominalQuota"])
+    for flavor in status.get("flavorsUsage", []):
+        for resource in flavor.get("resources", []):
+            _add(totals, flavor.get("name"), resource.get("name"), "usage", resource.get("total", 0))
+            _add(totals, flavor.get("name"), resource.get("name"), "borrowed", resource.get("borrowed", 0))
+    return {
+        "name": cluster_queue["metadata"]["name"],
+        "cohort": spec.get("cohort"),
+        "flavors": flavor_quotas,
+        "totals": totals,
+        "pendingWorkloads": status.get("pendingWorkloads", 0),
+        "admittedWorkloads": status.get("admittedWorkloads", 0),
+    }
+
+
+def _aggregate(summaries) -> dict:
+    """
+    Sums the quotas, usage and workload counts of a group of ClusterQueue summaries.
+    """
+    totals = {}
+    pending = admitted = 0
+    for summary in summaries:
+        pending += summary["pendingWorkloads"]
+        admitted += summary["admittedWorkloads"]
+        for key, fields in summary["totals"].items():
+            entry = totals.setdefault(key, {})
+            for field, value in fields.items():
+                entry[field] = entry.get(field, Decimal(0)) + value
+    return {
+        "pendingWorkloads": pending,
+        "admittedWorkloads": admitted,
+        "resources": [
+            {
+                "flavor": flavor,
+                "resource": resource,
+                **{field: _number(fields.get(field, Decimal(0))) for field in ("nominalQuota", "usage", "borrowed")},
+            }
+            for (flavor, resource), fields in totals.items()
+        ],
+    }
+
+
+class CohortTopology:
+    """
+    In-memory cohort → ClusterQueue → flavor model kept up to date from the ClusterQueue
+    store: each change only re-aggregates the cohort and flavors of the queue it touches,
+    so the cohort and flavor views are lookups instead of scans of every ClusterQueue.
+    Plugged into a Store with `Store.add_aggregator`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queues = {}  # ClusterQueue name -> summary
+        self._cohorts = {}  # cohort -> {ClusterQueue name: None}, dicts keep insertion order
+        self._flavors = {}  # flavor -> {ClusterQueue name: None}
+        self._cohort_views = {}
+        self._flavor_views = {}
+
+    def replace(self, objs):
+        with self._lock:
+            self._queues, self._cohorts, self._flavors = {}, {}, {}
+            for obj in objs:
+                self._link(_summarize(obj))
+            self._cohort_views = {cohort: self._cohort_view(cohort) for cohort in self._cohorts}
+            self._flavor_views = {flavor: self._flavor_view(flavor) for flavor in self._flavors}
+
+    def upsert(self, obj: dict):
+        summary = _summarize(obj)
+        with self._lock:
+            previous = self._queues.get(summary["name"])
+            if previous is None:
+                self._link(summary)
+            else:
+                self._relink(previous, summary)
+            self._refresh(previous, summary)
+
+    def delete(self, obj: dict):
+        with self._lock:
+            self._refresh(self._unlink(obj["metadata"]["name"]), None)
+
+    def cohorts(self):
+        """
+        Returns the cohorts with the names of their ClusterQueues.
+        """
+        with self._lock:
+            return [
+                {"name": cohort, "clusterQueues": [{"name": name} for name in members]}
+                for cohort, members in self._cohorts.items()
+            ]
+
+    def cohort(self, cohort: str):
+        """
+        Returns the ClusterQueue names and aggregated quotas, usage and workload counts of a cohort.
+        """
+        with self._lock:
+            return self._cohort_views.get(cohort)
+
+    def flavor(self, flavor: str):
+        """
+        Returns the ClusterQueues using a flavor with their quotas for it and workload counts, and the
+        flavor's aggregated quotas and usage.
+        """
+        with self._lock:
+            return self._flavor_views.get(flavor)
+
+    def _link(self, summary):
+        self._queues[summary["name"]] = summary
+        if summary["cohort"]:
+            self._cohorts.setdefault(summary["cohort"], {})[summary["name"]] = None
+        for flavor in summary["flavors"]:
+            self._flavors.setdefault(flavor, {})[summary["name"]] = None
+
+    def _relink(self, previous, summary):
+        # Only memberships that changed are moved, so a queue keeps its position in its cohort and flavors
+        name = summary["name"]
+        self._queues[name] = summary
+        if previous["cohort"] != summary["cohort"]:
+            self._leave(self._cohorts, previous["cohort"], name)
+            if summary["cohort"]:
+                self._cohorts.setdefault(summary["cohort"], {})[name] = None
+        for flavor in previous["flavors"]:
+            if flavor not in summary["flavors"]:
+                self._leave(self._flavors, flavor, name)
+        for flavor in summary["flavors"]:
+            if flavor not in previous["flavors"]:
+                self._flavors.setdefault(flavor, {})[name] = None
+
+    @staticmethod
+    def _leave(group, key, name):
+        members = group.get(key)
+        if members is not None:
+            members.pop(name, None)
+            if not members:
+                del group[key]
+
+    def _unlink(self, name):
+        summary = self._queues.pop(name, None)
+        if summary is None:
+            return None
+        for group, key in [(self._cohorts, summary["cohort"])] + [(self._flavors, flavor) for flavor in summary["flavors"]]:
+            self._leave(group, key, name)
+        return summary
+
+    def _refresh(self, *summaries):
+        cohorts, flavors = set(), set()
+        for summary in summaries:
+            if summary is not None:
+                cohorts.add(summary["cohort"])
+                flavors.update(summary["flavors"])
+        for cohort in cohorts - {None}:
+            self._update(self._cohort_views, cohort, self._cohorts, self._cohort_view)
+        for flavor in flavors:
+            self._update(self._flavor_views, flavor, self._flavors, self._flavor_view)
+
+    @staticmethod
+    def _update(views, key, groups, build):
+        if key in groups:
+            views[key] = build(key)
+        else:
+            views.pop(key, None)
+
+    def _cohort_view(self, cohort):
+        members = [self._queues[name] for name in self._cohorts[cohort]]
+        return {
+            "name": cohort,
+            "clusterQueues": [summary["name"] for summary in members],
+            **_aggregate(members),
+        }
+
+    def _flavor_view(self, flavor):
+        members = [self._queues[name] for name in self._flavors[flavor]]
+        return {
+            # ClusterQueues do not count their workloads by flavor: the counts are the queue's, not the flavor's
+            # share of them, so they are reported per queue rather than summed into flavor totals
+            "queues": [
+                {
+                    "queueName": summary["name"],
+                    "quota": summary["flavors"][flavor],
+                    "pendingWorkloads": summary["pendingWorkloads"],
+                    "admittedWorkloads": summary["admittedWorkloads"],
+                }
+                for summary in members
+            ],
+            "resources": [entry for entry in _aggregate(members)["resources"] if entry["flavor"] == flavor],
+        }
@@ -0,0 +1,88 @@
+from workload_record import compact_workload
+
+__all__ = [
+    "slim_metadata",
+    "slim_down_pod_status",
+    "slim_pod",
+    "slim_node",
+    "slim_event",
+    "TRANSFORMS",
+]
+
+# Annotations that can be as large as the object itself and that no view displays
+BULKY_ANNOTATIONS = (
+    "kubectl.kubernetes.io/last-applied-configuration",
+)
+
+
+def slim_metadata(obj: dict) -> dict:
+    """
+    Drops managedFields and bulky annotations from an object's metadata, in place.
+    """
+    metadata = obj.get("metadata")
+    if metadata:
+        metadata.pop("managedFields", None)
+        annotations = metadata.get("annotations")
+        if annotations:
+            for annotation in BULKY_ANNOTATIONS:
+                annotations.pop(annotation, None)
+            if not annotations:
+                del metadata["annotations"]
+    return obj
+
+
+def _pick(obj: dict, keys) -> dict:
+    return {key: obj[key] for key in keys if key in obj}
+
+
+def slim_down_pod_status(pod_status: dict) -> dict:
+    return {
+        "phase": pod_status.get("phase"),
+        "conditions": pod_status.get("conditions"),
+        "containerStatuses": [
+            {
+                "name": c.get("name"),
+                "state": c.get("state"),
+                "ready": c.get("ready")
+            }
+            for c in pod_status.get("containerStatuses") or []
+        ]
+    }
+
+
+def slim_pod(pod: dict) -> dict:
+    """
+    Keeps the pod identity, labels (for the controller-uid index) and the slim status the views show.
+    """
+    return {
+        "metadata": _pick(pod.get("metadata", {}), ("name", "namespace", "uid", "resourceVersion", "labels")),
+        "status": slim_down_pod_status(pod.get("status") or {}),
+    }
+
+
+def slim_node(node: dict) -> dict:
+    """
+    Keeps what flavor matching needs: the node labels and taints. The node status (images, addresses, ...) is dropped.
+    """
+    spec = node.get("spec") or {}
+    slim = {"metadata": _pick(node.get("metadata", {}), ("name", "uid", "resourceVersion", "labels"))}
+    if spec.get("taints"):
+        slim["spec"] = {"taints": spec["taints"]}
+    return slim
+
+
+def slim_event(event: dict) -> dict:
+    slim = _pick(event, ("involvedObject", "reason", "message", "type", "count",
+                         "firstTimestamp", "lastTimestamp", "eventTime"))
+    slim["metadata"] = _pick(event.get("metadata", {}), ("name", "namespace", "uid", "resourceVersion"))
+    return slim
+
+
+# Transforms applied by the informers to every object before it is stored, by resource
+TRANSFORMS = {
+    "pods": slim_pod,
+    "nodes": slim_node,
+    "events": slim_event,
+    # Workloads are stored as compact records; the detail view fetches the full object
+    "workloads": compact_workload,
+}
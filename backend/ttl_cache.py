@@ -0,0 +1,113 @@
+import functools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+__all__ = ["TTLCache"]
+
+
+class TTLCache:
+    """
+    Thread-safe memoization cache with a time-to-live, bounded LRU eviction and
+    single-flight coalescing: concurrent callers asking for the same missing key
+    wait for one computation instead of each issuing their own request.
+    Expired entries are dropped on every insert and at least once per `ttl` on lookups, so large
+    results nobody asks for anymore are not held until they are evicted.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, value), least recently used first
+        self._in_flight = {}  # key -> Future shared by coalesced callers
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._next_purge = 0.0
+
+    def _purge_expired(self, now: float):
+        # Called with the lock held; entries are in LRU order, not expiry order, so all are checked
+        expired = [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+        self.expirations += len(expired)
+        self._next_purge = now + self.ttl
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            now = time.monotonic()
+            if now >= self._next_purge:
+                self._purge_expired(now)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                future = self._in_flight[key] = Future()
+                self.misses += 1
+                leader = True
+
+        if not leader:
+            return future.result()
+
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            now = time.monotonic()
+            self._purge_expired(now)
+            self._entries[key] = (now + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            del self._in_flight[key]
+        future.set_result(value)
+        return value
+
+    def memoize(self, func):
+        """
+        Decorator caching `func` results keyed by its name and arguments.
+        The undecorated function stays available as `uncached`.
+        """
+        if self.ttl <= 0:
+            func.uncached = func
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (func.__name__, args, tuple(sorted(kwargs.items())))
+            return self.get_or_compute(key, lambda: func(*args, **kwargs))
+        wrapper.uncached = func
+        return wrapper
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "maxEntries": self.max_entries,
+                "ttlSeconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
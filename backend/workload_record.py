@@ -0,0 +1,147 @@
+import sys
+
+__all__ = ["WorkloadRecord", "Condition", "compact_workload", "record_default"]
+
+# Label keys, namespaces, queue names, condition types/statuses/reasons and most condition messages repeat
+# across thousands of workloads: interned, every record refers to one copy of each
+_intern = sys.intern
+
+
+def _intern_optional(value):
+    return _intern(value) if isinstance(value, str) else value
+
+
+class Condition:
+    """
+    A status condition of a workload.
+    """
+
+    __slots__ = ("type", "status", "reason", "message", "last_transition_time")
+
+    def __init__(self, condition: dict):
+        self.type = _intern_optional(condition.get("type"))
+        self.status = _intern_optional(condition.get("status"))
+        self.reason = _intern_optional(condition.get("reason"))
+        self.message = _intern_optional(condition.get("message"))
+        self.last_transition_time = condition.get("lastTransitionTime")
+
+    def to_dict(self) -> dict:
+        return {
+            "type": self.type,
+            "status": self.status,
+            "reason": self.reason,
+            "message": self.message,
+            "lastTransitionTime": self.last_transition_time,
+        }
+
+
+class WorkloadRecord:
+    """
+    The fields of a Workload the views, filters and indexes use, in slotted attributes instead of the
+    nested dicts of the API object (pod templates, admission assignments, managed fields, ...).
+    `to_dict()` gives them back in the shape of the API object; the full object is fetched when needed.
+    """
+
+    __slots__ = ("name", "namespace", "uid", "resource_version", "creation_timestamp", "labels",
+                 "owner_references", "queue_name", "priority", "priority_class_name", "pod_sets",
+                 "conditions", "cluster_queue", "preempted", "preemption_reason")
+
+    def __init__(self, workload: dict):
+        metadata = workload.get("metadata") or {}
+        spec = workload.get("spec") or {}
+        status = workload.get("status") or {}
+        self.name = metadata.get("name")
+        self.namespace = _intern_optional(metadata.get("namespace"))
+        self.uid = metadata.get("uid")
+        self.resource_version = metadata.get("resourceVersion")
+        self.creation_timestamp = metadata.get("creationTimestamp")
+        self.labels = {_intern(key): _intern_optional(value) for key, value in (metadata.get("labels") or {}).items()}
+        # (apiVersion, kind, name, uid) of each owner
+        self.owner_references = tuple(
+            (_intern_optional(owner.get("apiVersion")), _intern_optional(owner.get("kind")),
+             owner.get("name"), owner.get("uid"))
+            for owner in metadata.get("ownerReferences") or ()
+        )
+        self.queue_name = _intern_optional(spec.get("queueName"))
+        self.priority = spec.get("priority")
+        self.priority_class_name = _intern_optional(spec.get("priorityClassName"))
+        # (name, count) of each pod set
+        self.pod_sets = tuple(
+            (_intern_optional(pod_set.get("name")), pod_set.get("count"))
+            for pod_set in spec.get("podSets") or ()
+        )
+        self.conditions = tuple(Condition(condition) for condition in status.get("conditions") or ())
+        self.cluster_queue = _intern_optional((status.get("admission") or {}).get("clusterQueue"))
+        self.preempted = status.get("preempted")
+        self.preemption_reason = _intern_optional(status.get("preemptionReason"))
+
+    @property
+    def key(self) -> str:
+        return f"{self.namespace}/{self.name}" if self.namespace else self.name
+
+    @property
+    def job_uid(self):
+        return self.labels.get("kueue.x-k8s.io/job-uid")
+
+    @property
+    def state(self) -> str:
+        """
+        Classifies the workload as `finished`, `admitted` or `pending` from its status conditions.
+        """
+        statuses = {condition.type: condition.status for condition in self.conditions}
+        if statuses.get("Finished") == "True":
+            return "finished"
+        if statuses.get("Admitted") == "True":
+            return "admitted"
+        return "pending"
+
+    def metadata_dict(self) -> dict:
+        metadata = {"name": self.name, "namespace": self.namespace, "uid": self.uid,
+                    "resourceVersion": self.resource_version, "creationTimestamp": self.creation_timestamp}
+        if self.labels:
+            metadata["labels"] = dict(self.labels)
+        if self.owner_references:
+            metadata["ownerReferences"] = [
+                {"apiVersion": api_version, "kind": kind, "name": name, "uid": uid}
+                for api_version, kind, name, uid in self.owner_references
+            ]
+        return metadata
+
+    def spec_dict(self) -> dict:
+        spec = {"podSets": [{"name": name, "count": count} for name, count in self.pod_sets]}
+        if self.queue_name is not None:
+            spec["queueName"] = self.queue_name
+        if self.priority is not None:
+            spec["priority"] = self.priority
+        if self.priority_class_name is not None:
+            spec["priorityClassName"] = self.priority_class_name
+        return spec
+
+    def status_dict(self) -> dict:
+        status = {"conditions": [condition.to_dict() for condition in self.conditions]}
+        if self.cluster_queue is not None:
+            status["admission"] = {"clusterQueue": self.cluster_queue}
+        if self.preempted is not None:
+            status["preempted"] = self.preempted
+        if self.preemption_reason is not None:
+            status["preemptionReason"] = self.preemption_reason
+        return status
+
+    def to_dict(self) -> dict:
+        """
+        Returns the recorded fields as a Workload object; building the record from it gives the same record.
+        """
+        return {"metadata": self.metadata_dict(), "spec": self.spec_dict(), "status": self.status_dict()}
+
+
+def compact_workload(workload: dict) -> WorkloadRecord:
+    return WorkloadRecord(workload)
+
+
+def record_default(obj):
+    """
+    orjson `default` serializing stored records as the objects they were built from.
+    """
+    if isinstance(obj, WorkloadRecord):
+        return obj.to_dict()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
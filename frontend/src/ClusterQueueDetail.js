@@ -1,14 +1,14 @@
 import { CircularProgress, Grid, Paper, Table, TableBody, TableCell, TableContainer, TableHead, TableRow, Tooltip, Typography } from '@mui/material';
 import React, { useEffect, useState } from 'react';
 import { useParams, Link } from 'react-router-dom'; 
-import useWebSocket from './useWebSocket';
+import useTopic from './useTopic';
 import './App.css';
 import FlavorTable from './FlavorTable';
 
 const ClusterQueueDetail = () => {
   const { clusterQueueName } = useParams();
-  const url = `/ws/cluster-queue/${clusterQueueName}`;
-  const { data: clusterQueueData, error } = useWebSocket(url);
+  const topic = `cluster-queue:${clusterQueueName}`;
+  const { data: clusterQueueData, error } = useTopic(topic);
 
   const [clusterQueue, setClusterQueue] = useState(null);
 
@@ -1,11 +1,11 @@
 import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
-import useWebSocket from './useWebSocket';
+import useTopic from './useTopic';
 import { Typography, Paper, Table, TableBody, TableCell, TableContainer, TableHead, TableRow, CircularProgress } from '@mui/material';
 import './App.css';
 
 const ClusterQueues = () => {
-  const { data: clusterQueues, error } = useWebSocket('/ws/cluster-queues');
+  const { data: clusterQueues, error } = useTopic('cluster-queues');
   const [queues, setQueues] = useState([]);
 
   useEffect(() => {
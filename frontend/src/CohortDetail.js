@@ -1,13 +1,13 @@
 import React, { useState, useEffect } from 'react';
 import { useParams,Link } from 'react-router-dom';
 import { Typography, Paper, Table, TableBody, TableCell, TableContainer, TableHead, TableRow, CircularProgress } from '@mui/material';
-import useWebSocket from './useWebSocket';
+import useTopic from './useTopic';
 import './App.css';
 
 const CohortDetail = () => {
   const { cohortName } = useParams();
-  const url = `/ws/cohort/${cohortName}`;
-  const { data: cohortData, error } = useWebSocket(url);
+  const topic = `cohort:${cohortName}`;
+  const { data: cohortData, error } = useTopic(topic);
 
   const [cohortDetails, setCohortDetails] = useState(null);
 
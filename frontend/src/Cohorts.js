@@ -1,11 +1,11 @@
 import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import { Typography, Paper, Table, TableBody, TableCell, TableContainer, TableHead, TableRow, CircularProgress } from '@mui/material';
-import useWebSocket from './useWebSocket';
+import useTopic from './useTopic';
 import './App.css';
 
 const Cohorts = () => {
-  const { data: cohorts, error } = useWebSocket('/ws/cohorts');
+  const { data: cohorts, error } = useTopic('cohorts');
   const [cohortList, setCohortList] = useState([]);
 
   useEffect(() => {
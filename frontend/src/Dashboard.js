@@ -4,7 +4,7 @@ import { Link } from 'react-router-dom';
 import { toast, ToastContainer } from 'react-toastify';
 import KeyboardArrowDownIcon from '@mui/icons-material/KeyboardArrowDown';
 import KeyboardArrowUpIcon from '@mui/icons-material/KeyboardArrowUp';
-import useWebSocket from './useWebSocket';
+import useTopic from './useTopic';
 import './App.css';
 import { AccessTime, Check, CheckBox, CheckCircle } from '@mui/icons-material';
 
@@ -17,7 +17,7 @@ const Dashboard = () => {
   const [error, setError] = useState(null);
   const [workloadsByUid, setWorkloadsByUid] = useState({});
 
-  const { data: kueueData, error: kueueError } = useWebSocket('/ws/workloads/dashboard');
+  const { data: kueueData, error: kueueError } = useTopic('dashboard');
 
   useEffect(() => {
     if (kueueData) {
@@ -1,18 +1,18 @@
 import React, { useState, useEffect } from 'react';
 import { useParams } from 'react-router-dom';
 import { Typography, Paper, Grid, CircularProgress, Table, TableBody, TableCell, TableContainer, TableHead, TableRow } from '@mui/material';
-import useWebSocket from './useWebSocket';
+import useTopic from './useTopic';
 import FlavorTable from './FlavorTable';
 import './App.css';
 import { Link } from 'react-router-dom';
 
 const LocalQueueDetail = () => {
   const { namespace, queueName } = useParams();
-  const queueUrl = `/ws/local-queue/${namespace}/${queueName}`;
-  const workloadsUrl = `/ws/local-queue/${namespace}/${queueName}/workloads`;
+  const queueTopic = `local-queue:${namespace}/${queueName}`;
+  const workloadsTopic = `local-queue:${namespace}/${queueName}/workloads`;
 
-  const { data: queueData, error: queueError } = useWebSocket(queueUrl);
-  const { data: workloadsData, error: workloadsError } = useWebSocket(workloadsUrl);
+  const { data: queueData, error: queueError } = useTopic(queueTopic);
+  const { data: workloadsData, error: workloadsError } = useTopic(workloadsTopic);
 
   const [queue, setQueue] = useState(null);
   const [workloads, setWorkloads] = useState([]);
@@ -1,11 +1,11 @@
 import { CircularProgress, Paper, Table, TableBody, TableCell, TableContainer, TableHead, TableRow, Typography } from '@mui/material';
 import React, { useEffect, useState } from 'react';
 import { Link } from 'react-router-dom';
-import useWebSocket from './useWebSocket';
+import useTopic from './useTopic';
 import './App.css';
 
 const LocalQueues = () => {
-  const { data: localQueues, error } = useWebSocket('/ws/local-queues');
+  const { data: localQueues, error } = useTopic('local-queues');
   const [queues, setQueues] = useState([]);
 
   useEffect(() => {
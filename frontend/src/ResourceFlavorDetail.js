@@ -1,13 +1,13 @@
 import React, { useState, useEffect } from 'react';
 import { useParams } from 'react-router-dom';
 import { Typography, Paper, Table, TableBody, TableCell, TableContainer, TableHead, TableRow, CircularProgress, Box } from '@mui/material';
-import useWebSocket from './useWebSocket';
+import useTopic from './useTopic';
 import './App.css';
 
 const ResourceFlavorDetail = () => {
   const { flavorName } = useParams();
-  const url = `/ws/resource-flavor/${flavorName}`;
-  const { data: flavorData, error } = useWebSocket(url);
+  const topic = `resource-flavor:${flavorName}`;
+  const { data: flavorData, error } = useTopic(topic);
 
   const [flavor, setFlavor] = useState(null);
 
@@ -87,6 +87,8 @@ const ResourceFlavorDetail = () => {
               <TableHead>
                 <TableRow>
                   <TableCell>Cluster Queue Name</TableCell>
+                  <TableCell>Pending Workloads</TableCell>
+                  <TableCell>Admitted Workloads</TableCell>
                   <TableCell>Resource</TableCell>
                   <TableCell>Nominal Quota</TableCell>
                 </TableRow>
@@ -96,6 +98,8 @@ const ResourceFlavorDetail = () => {
                   <React.Fragment key={queue.queueName}>
                     <TableRow>
                       <TableCell rowSpan={queue.quota.length}>{queue.queueName}</TableCell>
+                      <TableCell rowSpan={queue.quota.length}>{queue.pendingWorkloads}</TableCell>
+                      <TableCell rowSpan={queue.quota.length}>{queue.admittedWorkloads}</TableCell>
                       <TableCell>{queue.quota[0].resource}</TableCell>
                       <TableCell>{queue.quota[0].nominalQuota}</TableCell>
                     </TableRow>
@@ -1,11 +1,11 @@
 import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import { Typography, Paper, Table, TableBody, TableCell, TableContainer, TableHead, TableRow, CircularProgress } from '@mui/material';
-import useWebSocket from './useWebSocket';
+import useTopic from './useTopic';
 import './App.css';
 
 const ResourceFlavors = () => {
-  const { data: flavors, error } = useWebSocket('/ws/resource-flavors');
+  const { data: flavors, error } = useTopic('resource-flavors');
   const [resourceFlavors, setResourceFlavors] = useState([]);
 
   useEffect(() => {
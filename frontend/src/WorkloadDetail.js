@@ -1,23 +1,32 @@
 import React, { useEffect, useState } from 'react';
 import { useParams, Link } from 'react-router-dom'; 
 import { Typography,  Paper, CircularProgress, Grid, Table, TableBody, TableCell, TableContainer, TableHead, TableRow } from '@mui/material';
-import useWebSocket from './useWebSocket';
+import useTopic from './useTopic';
 import './App.css';
 
 const WorkloadDetail = () => {
   const { namespace, workloadName } = useParams();
-  const workloadUrl = `/ws/workload/${namespace}/${workloadName}`;
-  const eventsUrl = `/ws/workload/${namespace}/${workloadName}/events`;
+  const workloadTopic = `workload:${namespace}/${workloadName}`;
+  const eventsTopic = `workload:${namespace}/${workloadName}/events`;
 
-  const { data: workload, error: workloadError } = useWebSocket(workloadUrl);
-  const { data: eventData, error: eventError } = useWebSocket(eventsUrl);
+  const { data: workload, error: workloadError } = useTopic(workloadTopic);
+  const { data: eventData, error: eventError } = useTopic(eventsTopic);
 
   const [events, setEvents] = useState([]);
 
   useEffect(() => {
+    const byNewest = (a, b) => new Date(b.timestamp) - new Date(a.timestamp);
     if (eventData && Array.isArray(eventData)) {
-      const sortedEvents = eventData.sort((a, b) => new Date(b.timestamp) - new Date(a.timestamp));
+      const sortedEvents = eventData.sort(byNewest);
       setEvents(sortedEvents);
+    } else if (eventData && eventData.type === 'events') {
+      // Incremental update carrying only the new, changed and deleted events
+      setEvents((currentEvents) => {
+        const eventsByName = new Map(currentEvents.map((event) => [event.name, event]));
+        eventData.deleted.forEach((name) => eventsByName.delete(name));
+        eventData.upserted.forEach((event) => eventsByName.set(event.name, event));
+        return [...eventsByName.values()].sort(byNewest);
+      });
     }
   }, [eventData]);
 
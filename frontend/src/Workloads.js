@@ -2,11 +2,11 @@ import { CircularProgress, Paper, Table, TableBody, TableCell, TableContainer, T
 import React, { useEffect, useState } from 'react';
 import { Link } from 'react-router-dom';
 import 'react-toastify/dist/ReactToastify.css';
-import useWebSocket from './useWebSocket';
+import useTopic from './useTopic';
 import './App.css';
 
 const Workloads = () => {
-  const { data: data, error } = useWebSocket('/ws/workloads');
+  const { data: data, error } = useTopic('workloads');
   const [workloads, setWorkloads] = useState([]);
   useEffect(() => {
     setWorkloads(data?.workloads?.items || []);
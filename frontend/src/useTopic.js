@@ -0,0 +1,174 @@
+import { useEffect, useState } from 'react';
+import { env } from './env'
+
+const streamURL = `${env.REACT_APP_WEBSOCKET_URL}/ws/stream`;
+
+// Components of the next page subscribe right after the previous page unsubscribed: the connection
+// outlives its last listener by this delay, so navigating does not close and reopen it
+const CLOSE_DELAY_MS = 2000;
+// Delays between reconnection attempts after the connection was lost, doubling from the first to the last
+const RECONNECT_MIN_DELAY_MS = 1000;
+const RECONNECT_MAX_DELAY_MS = 30000;
+
+// One /ws/stream WebSocket shared by every component, multiplexing their topics
+let socket = null;
+let closeTimer = null;
+let reconnectTimer = null;
+let reconnectAttempts = 0;
+const listeners = new Map(); // topic -> Set of callbacks receiving the tagged messages
+const latest = new Map(); // topic -> last message, replayed to components subscribing to a topic already held
+
+const remember = (message) => {
+  if (message.data && message.data.type === 'events') {
+    // Incremental event updates are folded into the cached list, so late listeners get every event
+    const previous = latest.get(message.topic);
+    if (previous && Array.isArray(previous.data)) {
+      const eventsByName = new Map(previous.data.map((event) => [event.name, event]));
+      message.data.deleted.forEach((name) => eventsByName.delete(name));
+      message.data.upserted.forEach((event) => eventsByName.set(event.name, event));
+      latest.set(message.topic, { ...message, data: [...eventsByName.values()] });
+    }
+    return;
+  }
+  latest.set(message.topic, message);
+};
+
+const send = (request) => {
+  if (socket && socket.readyState === WebSocket.OPEN) {
+    socket.send(JSON.stringify(request));
+  }
+};
+
+const openSocket = () => {
+  const ws = new WebSocket(streamURL);
+  socket = ws;
+
+  ws.onopen = () => {
+    console.log(`Connected to WebSocket: ${streamURL}`);
+    reconnectAttempts = 0;
+    // Topics subscribed while connecting, or held before the connection was lost
+    listeners.forEach((_, topic) => send({ action: 'subscribe', topic }));
+  };
+
+  ws.onmessage = (event) => {
+    const message = JSON.parse(event.data);
+    const callbacks = listeners.get(message.topic);
+    if (callbacks) {
+      if (!message.error) {
+        remember(message);
+      }
+      callbacks.forEach((callback) => callback(message));
+    } else if (message.error) {
+      console.error("WebSocket stream error:", message.error);
+    }
+  };
+
+  ws.onerror = (err) => {
+    // Followed by onclose, which reconnects
+    console.error("WebSocket error:", err);
+  };
+
+  ws.onclose = () => {
+    console.log("WebSocket connection closed");
+    if (socket !== ws) {
+      // Closed on purpose after the last listener left
+      return;
+    }
+    socket = null;
+    latest.clear();
+    if (listeners.size > 0) {
+      listeners.forEach((callbacks, topic) =>
+        callbacks.forEach((callback) => callback({ topic, error: "WebSocket connection lost, reconnecting" })));
+      scheduleReconnect();
+    }
+  };
+};
+
+const scheduleReconnect = () => {
+  const delay = Math.min(RECONNECT_MIN_DELAY_MS * 2 ** reconnectAttempts, RECONNECT_MAX_DELAY_MS);
+  reconnectAttempts += 1;
+  reconnectTimer = setTimeout(() => {
+    reconnectTimer = null;
+    if (listeners.size > 0 && !socket) {
+      openSocket();
+    }
+  }, delay);
+};
+
+const closeSocket = () => {
+  closeTimer = null;
+  if (listeners.size === 0 && socket) {
+    // Cleared first so that onclose does not reconnect
+    const ws = socket;
+    socket = null;
+    latest.clear();
+    ws.close();
+  }
+};
+
+const subscribe = (topic, callback) => {
+  if (closeTimer) {
+    clearTimeout(closeTimer);
+    closeTimer = null;
+  }
+  if (!listeners.has(topic)) {
+    listeners.set(topic, new Set());
+    if (socket) {
+      send({ action: 'subscribe', topic });
+    }
+  }
+  listeners.get(topic).add(callback);
+  if (!socket) {
+    // While a reconnection is pending, the topic is subscribed once connected
+    if (!reconnectTimer) {
+      openSocket();
+    }
+  } else if (latest.has(topic)) {
+    // No new subscription is sent for a topic already held: the next message may be a tick away
+    callback(latest.get(topic));
+  }
+};
+
+const unsubscribe = (topic, callback) => {
+  const callbacks = listeners.get(topic);
+  if (!callbacks) return;
+  callbacks.delete(callback);
+  if (callbacks.size === 0) {
+    listeners.delete(topic);
+    latest.delete(topic);
+    send({ action: 'unsubscribe', topic });
+  }
+  if (listeners.size === 0) {
+    if (reconnectTimer) {
+      clearTimeout(reconnectTimer);
+      reconnectTimer = null;
+      reconnectAttempts = 0;
+    }
+    if (socket && !closeTimer) {
+      // Last component unmounted; closed unless another one subscribes in the meantime
+      closeTimer = setTimeout(closeSocket, CLOSE_DELAY_MS);
+    }
+  }
+};
+
+// Data and error of a topic of the shared /ws/stream connection (see resolve_topic in the backend)
+const useTopic = (topic) => {
+  const [data, setData] = useState(null);
+  const [error, setError] = useState(null);
+  useEffect(() => {
+    const callback = (message) => {
+      if (message.error) {
+        setError(message.error);
+      } else {
+        setError(null);
+        setData(message.data);
+      }
+    };
+    subscribe(topic, callback);
+    return () => unsubscribe(topic, callback);
+  }, [topic]);
+
+  return { data, error };
+};
+
+export default useTopic;